@@ -8,10 +8,17 @@ from homeassistant.core import HomeAssistant
 
 from .const import (
     CONF_HOST,
+    DATA_DIAGNOSTICS_LOCALIZATIONS,
     DOMAIN,
     LOGGER,
 )
 from .coordinator import SMADataCoordinator
+from .storage import (
+    SMAChannelNameStore,
+    SMASessionStore,
+    SMATopologyStore,
+    async_remove_localization_cache,
+)
 
 PLATFORMS: list[Platform] = [
     Platform.SENSOR,
@@ -33,19 +40,15 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     )
 
     # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
+    # the first refresh uses the measurements fetched during coordinator setup,
+    # entities take their initial state from it when they are added.
     await coordinator.async_config_entry_first_refresh()
 
     # setup platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
-    # listen for updates to the config entry to re-setup it
-    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
-
-    # FIXME for some reason, following the example for a coordinated single API poll, the
-    # sensors created in sensor.py don't display the data until the next refresh interval.
-    # causing a refresh manually after they are set up works around this issue.
-    # see https://developers.home-assistant.io/docs/integration_fetching_data/#coordinated-single-api-poll-for-data-for-all-entities
-    await coordinator.async_refresh()
+    # listen for updates to the config entry to apply them, re-setting it up if needed
+    entry.async_on_unload(entry.add_update_listener(async_update_entry))
     return True
 
 
@@ -54,12 +57,38 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     LOGGER.info("unloading SMA ennexOS integration")
     if unloaded := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        hass.data.get(DATA_DIAGNOSTICS_LOCALIZATIONS, {}).pop(entry.entry_id, None)
         if coordinator is not None and isinstance(coordinator, SMADataCoordinator):
             await coordinator._async_unload()
 
     return unloaded
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Handle removal of integration entry, cleaning up persistent data."""
+    await SMATopologyStore(hass, entry.entry_id).async_remove()
+    session_store = SMASessionStore(hass, entry.entry_id)
+    session_state = await session_store.async_load()
+    await session_store.async_remove()
+    if session_state is not None:
+        # a persisted session is kept alive on unload, so end it on the device too
+        await SMADataCoordinator.async_logout_session(hass, entry, session_state)
+    await SMAChannelNameStore(hass, entry.entry_id).async_remove()
+    await async_remove_localization_cache(hass, entry.entry_id)
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload integration entry."""
     await hass.config_entries.async_reload(entry.entry_id)
+
+
+async def async_update_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply updates to the integration entry, reloading it only if required."""
+    coordinator = hass.data[DOMAIN].get(entry.entry_id)
+    if isinstance(
+        coordinator, SMADataCoordinator
+    ) and await coordinator.async_apply_options(entry.options):
+        LOGGER.info("applied options without reloading")
+        return
+
+    await async_reload_entry(hass, entry)
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import uuid
 
+from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
@@ -17,6 +18,35 @@ from .coordinator import SMADataCoordinator
 from .sma.model import ComponentInfo
 
 
+def component_device_info(
+    config_entry: ConfigEntry, component_info: ComponentInfo
+) -> DeviceInfo:
+    """Create the device info of a component, shared by all entities of that component."""
+    # generate component (=device) id
+    device_id = str(
+        uuid.uuid5(
+            uuid.NAMESPACE_X500,
+            f"{config_entry.entry_id}{component_info.component_id}",
+        )
+    )
+
+    conf_url = (
+        f"{'https' if config_entry.data[CONF_USE_SSL] else 'http'}://{component_info.ip_address}/"
+        if component_info.ip_address
+        else None
+    )
+
+    return DeviceInfo(
+        identifiers={(DOMAIN, device_id)},
+        name=component_info.name,
+        manufacturer=component_info.vendor or DEVICE_MANUFACTURER,
+        model=component_info.product_name,
+        serial_number=component_info.serial_number,
+        sw_version=component_info.firmware_version,
+        configuration_url=conf_url,
+    )
+
+
 class SMAEntity(CoordinatorEntity[SMADataCoordinator]):
     """base SMA entity class."""
 
@@ -25,43 +55,27 @@ class SMAEntity(CoordinatorEntity[SMADataCoordinator]):
         coordinator: SMADataCoordinator,
         channel_id: str,
         component_info: ComponentInfo,
+        device_info: DeviceInfo | None = None,
     ) -> None:
         """
         Initialize common entity attributes.
 
         base entity handles device and entity id generation and device info.
+        :param device_info: precomputed device info of the component, see component_device_info()
         """
         super().__init__(coordinator, context=(component_info.component_id, channel_id))
 
-        # generate component (=device) id
-        device_id = str(
-            uuid.uuid5(
-                uuid.NAMESPACE_X500,
-                f"{coordinator.config_entry.entry_id}{component_info.component_id}",
-            )
-        )
-
         # set device info for the entity
-        conf_url = (
-            f"{'https' if coordinator.config_entry.data[CONF_USE_SSL] else 'http'}://{component_info.ip_address}/"
-            if component_info.ip_address
-            else None
-        )
-
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, device_id)},
-            name=component_info.name,
-            manufacturer=component_info.vendor or DEVICE_MANUFACTURER,
-            model=component_info.product_name,
-            serial_number=component_info.serial_number,
-            sw_version=component_info.firmware_version,
-            configuration_url=conf_url,
+        self._attr_device_info = (
+            device_info
+            if device_info is not None
+            else component_device_info(coordinator.config_entry, component_info)
         )
 
         LOGGER.debug(
-            "created entity '%s' for channel '%s' of device '%s' (%s)",
+            "created entity '%s' for channel '%s' of component '%s' (%s)",
             self.entity_id,
             channel_id,
-            device_id,
+            component_info.component_id,
             component_info.name,
         )
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Any
 from urllib.parse import urlparse
 
@@ -12,7 +13,9 @@ from homeassistant.config_entries import (
     ConfigFlowResult,
     OptionsFlow,
 )
+from homeassistant.core import callback
 from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.selector import (
     BooleanSelector,
     NumberSelector,
@@ -29,17 +32,42 @@ from .const import (
     CONF_USE_SSL,
     CONF_USERNAME,
     CONF_VERIFY_SSL,
+    DATA_PROBED_TOPOLOGY,
+    DEFAULT_DEADBAND,
+    DEFAULT_DIAGNOSTICS_LOCALIZATIONS,
+    DEFAULT_EXECUTOR_PARSE_SIZE,
+    DEFAULT_HISTORY_DEPTH,
+    DEFAULT_MAX_SILENCE_INTERVAL,
+    DEFAULT_PERFORMANCE_SENSORS,
+    DEFAULT_PERSIST_SESSION,
+    DEFAULT_REDISCOVERY_INTERVAL,
     DEFAULT_REQUEST_RETIRES,
     DEFAULT_REQUEST_TIMEOUT,
+    DEFAULT_ROLLING_STATISTICS,
+    DEFAULT_SAMPLE_INTERVAL,
     DEFAULT_UPDATE_INTERVAL,
+    DEFAULT_UPDATE_TRACING,
     DOMAIN,
     LOGGER,
+    OPT_DEADBAND,
+    OPT_DIAGNOSTICS_LOCALIZATIONS,
+    OPT_EXECUTOR_PARSE_SIZE,
+    OPT_HISTORY_DEPTH,
+    OPT_MAX_SILENCE_INTERVAL,
+    OPT_PERFORMANCE_SENSORS,
+    OPT_PERSIST_SESSION,
+    OPT_REDISCOVERY_INTERVAL,
     OPT_REQUEST_RETIRES,
     OPT_REQUEST_TIMEOUT,
+    OPT_ROLLING_STATISTICS,
+    OPT_SAMPLE_INTERVAL,
     OPT_UPDATE_INTERVAL,
+    OPT_UPDATE_TRACING,
+    PROBED_TOPOLOGY_TIMEOUT,
 )
 from .sma.client import SMAApiClient
 from .sma.model import (
+    ComponentInfo,
     SMAApiAuthenticationError,
     SMAApiClientError,
     SMAApiCommunicationError,
@@ -67,7 +95,7 @@ class SMAConfigFlow(ConfigFlow, domain=DOMAIN):
 
             try:
                 # try to log in using the provided credentials
-                plant_name = await self.__fetch_plant_name(
+                plant_name, navigation = await self.__probe_plant(
                     host=user_input[CONF_HOST],
                     username=user_input[CONF_USERNAME],
                     password=user_input[CONF_PASSWORD],
@@ -93,6 +121,9 @@ class SMAConfigFlow(ConfigFlow, domain=DOMAIN):
             else:
                 # logged in successfully, create config entry
                 LOGGER.info("setup successful for plant '%s'", plant_name)
+
+                # hand off the probed components to the entry setup
+                self.__hand_off_topology(user_input[CONF_HOST], navigation)
                 return self.async_create_entry(
                     title=plant_name,
                     description=f"SMA plant on {user_input[CONF_HOST]}",
@@ -138,15 +169,38 @@ class SMAConfigFlow(ConfigFlow, domain=DOMAIN):
             errors=_errors,
         )
 
+    def __hand_off_topology(self, host: str, navigation: list[ComponentInfo]) -> None:
+        """
+        Hand off the probed components to the setup of the created config entry.
+
+        the setup consumes them. if it never does, e.g. because the entry is not set up,
+        they are dropped after PROBED_TOPOLOGY_TIMEOUT.
+        """
+        probed = self.hass.data.setdefault(DATA_PROBED_TOPOLOGY, {})
+        probed[host] = navigation
+
+        @callback
+        def __drop(_now: datetime) -> None:
+            # a later flow for the same host may have replaced them, keep those
+            if probed.get(host) is navigation:
+                del probed[host]
+
+        async_call_later(self.hass, PROBED_TOPOLOGY_TIMEOUT, __drop)
+
     @staticmethod
     def async_get_options_flow(config_entry: ConfigEntry):
         """Get options flow handler."""
         return SMAOptionsFlow()
 
-    async def __fetch_plant_name(
+    async def __probe_plant(
         self, host: str, username: str, password: str, use_ssl: bool, verify_ssl: bool
-    ) -> str:
-        """Login to SMA and get plant name."""
+    ) -> tuple[str, list[ComponentInfo]]:
+        """
+        Login to SMA and get plant name.
+
+        only the navigation is fetched, skipping the per-device info.
+        :returns: tuple of (plant name, components of the navigation)
+        """
         LOGGER.debug(
             "attempting to get plant name for host=%s and user=%s (use_ssl=%s; verify_ssl=%s)",
             host,
@@ -169,14 +223,14 @@ class SMAConfigFlow(ConfigFlow, domain=DOMAIN):
         )
 
         await sma.login()
-        all_components = await sma.get_all_components()
+        navigation = await sma.get_navigation()
         await sma.logout()
 
         # plant name is stored in the first component of type "Plant"
         plant_component = next(
             (
                 component
-                for component in all_components
+                for component in navigation
                 if component.component_type == "Plant"
             ),
             None,
@@ -184,7 +238,7 @@ class SMAConfigFlow(ConfigFlow, domain=DOMAIN):
         if plant_component is None:
             raise NoPlantComponentFoundError("No plant component found")
 
-        return plant_component.name
+        return (plant_component.name, navigation)
 
     def __extract_host(self, url_or_host: str) -> str:
         """Extract the host from a input string which is either a url or just a host."""
@@ -262,6 +316,122 @@ class SMAOptionsFlow(OptionsFlow):
                             mode=NumberSelectorMode.BOX,
                         )
                     ),
+                    # sample history depth
+                    vol.Required(
+                        OPT_HISTORY_DEPTH,
+                        default=self.config_entry.options.get(
+                            OPT_HISTORY_DEPTH, DEFAULT_HISTORY_DEPTH
+                        ),
+                    ): NumberSelector(
+                        NumberSelectorConfig(
+                            min=0,
+                            max=10000,
+                            step=1,
+                            unit_of_measurement="",
+                            mode=NumberSelectorMode.BOX,
+                        )
+                    ),
+                    # rolling statistics attributes
+                    vol.Required(
+                        OPT_ROLLING_STATISTICS,
+                        default=self.config_entry.options.get(
+                            OPT_ROLLING_STATISTICS, DEFAULT_ROLLING_STATISTICS
+                        ),
+                    ): BooleanSelector(),
+                    # deadband filtering
+                    vol.Required(
+                        OPT_DEADBAND,
+                        default=self.config_entry.options.get(
+                            OPT_DEADBAND, DEFAULT_DEADBAND
+                        ),
+                    ): BooleanSelector(),
+                    # max. interval between state writes with deadband
+                    vol.Required(
+                        OPT_MAX_SILENCE_INTERVAL,
+                        default=self.config_entry.options.get(
+                            OPT_MAX_SILENCE_INTERVAL, DEFAULT_MAX_SILENCE_INTERVAL
+                        ),
+                    ): NumberSelector(
+                        NumberSelectorConfig(
+                            min=1,
+                            step=1,
+                            unit_of_measurement="min",
+                            mode=NumberSelectorMode.BOX,
+                        )
+                    ),
+                    # sampling interval in between updates
+                    vol.Required(
+                        OPT_SAMPLE_INTERVAL,
+                        default=self.config_entry.options.get(
+                            OPT_SAMPLE_INTERVAL, DEFAULT_SAMPLE_INTERVAL
+                        ),
+                    ): NumberSelector(
+                        NumberSelectorConfig(
+                            min=0,
+                            step=1,
+                            unit_of_measurement="s",
+                            mode=NumberSelectorMode.BOX,
+                        )
+                    ),
+                    # persist api session across restarts
+                    vol.Required(
+                        OPT_PERSIST_SESSION,
+                        default=self.config_entry.options.get(
+                            OPT_PERSIST_SESSION, DEFAULT_PERSIST_SESSION
+                        ),
+                    ): BooleanSelector(),
+                    # interval to look for new components and channels at
+                    vol.Required(
+                        OPT_REDISCOVERY_INTERVAL,
+                        default=self.config_entry.options.get(
+                            OPT_REDISCOVERY_INTERVAL, DEFAULT_REDISCOVERY_INTERVAL
+                        ),
+                    ): NumberSelector(
+                        NumberSelectorConfig(
+                            min=0,
+                            step=1,
+                            unit_of_measurement="min",
+                            mode=NumberSelectorMode.BOX,
+                        )
+                    ),
+                    # include the localizations of the device in diagnostics
+                    vol.Required(
+                        OPT_DIAGNOSTICS_LOCALIZATIONS,
+                        default=self.config_entry.options.get(
+                            OPT_DIAGNOSTICS_LOCALIZATIONS,
+                            DEFAULT_DIAGNOSTICS_LOCALIZATIONS,
+                        ),
+                    ): BooleanSelector(),
+                    # trace the stages of every update, for diagnostics and debug logs
+                    vol.Required(
+                        OPT_UPDATE_TRACING,
+                        default=self.config_entry.options.get(
+                            OPT_UPDATE_TRACING,
+                            DEFAULT_UPDATE_TRACING,
+                        ),
+                    ): BooleanSelector(),
+                    # diagnostic sensors for the performance of the integration
+                    vol.Required(
+                        OPT_PERFORMANCE_SENSORS,
+                        default=self.config_entry.options.get(
+                            OPT_PERFORMANCE_SENSORS,
+                            DEFAULT_PERFORMANCE_SENSORS,
+                        ),
+                    ): BooleanSelector(),
+                    # size of responses to parse in a executor thread at
+                    vol.Required(
+                        OPT_EXECUTOR_PARSE_SIZE,
+                        default=self.config_entry.options.get(
+                            OPT_EXECUTOR_PARSE_SIZE, DEFAULT_EXECUTOR_PARSE_SIZE
+                        ),
+                    ): NumberSelector(
+                        NumberSelectorConfig(
+                            min=0,
+                            step=1,
+                            unit_of_measurement="KiB",
+                            mode=NumberSelectorMode.BOX,
+                        )
+                    ),
                 }
             ),
         )
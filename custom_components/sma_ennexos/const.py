@@ -1,15 +1,28 @@
 """SMA integration constants."""
 
+from datetime import timedelta
 from logging import Logger, getLogger
 
 import homeassistant.const as hass_const
 
+from .sma.known_channels import SMAChannelCategory, SMAUnit
+
 LOGGER: Logger = getLogger(__package__)
 
 DOMAIN = "sma_ennexos"
 
 DEVICE_MANUFACTURER = "SMA"
 
+# hass.data key for components probed by the config flow, by host.
+# consumed by the first setup of the created config entry, or dropped after PROBED_TOPOLOGY_TIMEOUT
+DATA_PROBED_TOPOLOGY = f"{DOMAIN}_probed_topology"
+
+# time the components probed by the config flow are kept for the entry setup
+PROBED_TOPOLOGY_TIMEOUT = timedelta(minutes=5)
+
+# hass.data key for localizations cached by diagnostics, by entry id
+DATA_DIAGNOSTICS_LOCALIZATIONS = f"{DOMAIN}_diagnostics_localizations"
+
 # configuration keys (config_entry)
 CONF_HOST = hass_const.CONF_HOST
 CONF_USERNAME = hass_const.CONF_USERNAME
@@ -21,8 +34,86 @@ CONF_VERIFY_SSL = hass_const.CONF_VERIFY_SSL
 OPT_REQUEST_TIMEOUT = "request_timeout"
 OPT_UPDATE_INTERVAL = "update_interval"
 OPT_REQUEST_RETIRES = "request_retries"
+OPT_HISTORY_DEPTH = "history_depth"
+OPT_ROLLING_STATISTICS = "rolling_statistics"
+OPT_DEADBAND = "deadband"
+OPT_MAX_SILENCE_INTERVAL = "max_silence_interval"
+OPT_SAMPLE_INTERVAL = "sample_interval"
+OPT_PERSIST_SESSION = "persist_session"
+OPT_REDISCOVERY_INTERVAL = "rediscovery_interval"
+OPT_DIAGNOSTICS_LOCALIZATIONS = "diagnostics_localizations"
+OPT_UPDATE_TRACING = "update_tracing"
+OPT_PERFORMANCE_SENSORS = "performance_sensors"
+OPT_EXECUTOR_PARSE_SIZE = "executor_parse_size"
 
 # configuration defaults
 DEFAULT_REQUEST_TIMEOUT = 10
 DEFAULT_UPDATE_INTERVAL = 60
 DEFAULT_REQUEST_RETIRES = 3
+DEFAULT_HISTORY_DEPTH = 0  # disabled
+DEFAULT_ROLLING_STATISTICS = False
+DEFAULT_DEADBAND = False
+DEFAULT_MAX_SILENCE_INTERVAL = 15  # minutes
+DEFAULT_SAMPLE_INTERVAL = 0  # disabled
+DEFAULT_PERSIST_SESSION = False
+DEFAULT_REDISCOVERY_INTERVAL = 0  # disabled, new devices are found on reload
+DEFAULT_DIAGNOSTICS_LOCALIZATIONS = True
+DEFAULT_UPDATE_TRACING = False
+DEFAULT_PERFORMANCE_SENSORS = False
+DEFAULT_EXECUTOR_PARSE_SIZE = 256  # KiB
+
+# defaults of all options, for options not (yet) set in the config entry
+DEFAULT_OPTIONS = {
+    OPT_REQUEST_TIMEOUT: DEFAULT_REQUEST_TIMEOUT,
+    OPT_UPDATE_INTERVAL: DEFAULT_UPDATE_INTERVAL,
+    OPT_REQUEST_RETIRES: DEFAULT_REQUEST_RETIRES,
+    OPT_HISTORY_DEPTH: DEFAULT_HISTORY_DEPTH,
+    OPT_ROLLING_STATISTICS: DEFAULT_ROLLING_STATISTICS,
+    OPT_DEADBAND: DEFAULT_DEADBAND,
+    OPT_MAX_SILENCE_INTERVAL: DEFAULT_MAX_SILENCE_INTERVAL,
+    OPT_SAMPLE_INTERVAL: DEFAULT_SAMPLE_INTERVAL,
+    OPT_PERSIST_SESSION: DEFAULT_PERSIST_SESSION,
+    OPT_REDISCOVERY_INTERVAL: DEFAULT_REDISCOVERY_INTERVAL,
+    OPT_DIAGNOSTICS_LOCALIZATIONS: DEFAULT_DIAGNOSTICS_LOCALIZATIONS,
+    OPT_UPDATE_TRACING: DEFAULT_UPDATE_TRACING,
+    OPT_PERFORMANCE_SENSORS: DEFAULT_PERFORMANCE_SENSORS,
+    OPT_EXECUTOR_PARSE_SIZE: DEFAULT_EXECUTOR_PARSE_SIZE,
+}
+
+# options that can be applied to a running coordinator without reloading the config entry
+HOT_APPLY_OPTIONS = frozenset(
+    {
+        OPT_REQUEST_TIMEOUT,
+        OPT_UPDATE_INTERVAL,
+        OPT_REQUEST_RETIRES,
+        OPT_DIAGNOSTICS_LOCALIZATIONS,
+        OPT_UPDATE_TRACING,
+        OPT_EXECUTOR_PARSE_SIZE,
+    }
+)
+
+# rolling statistics windows exposed as sensor attributes, by channel category.
+# only applies to numeric measurement channels when OPT_ROLLING_STATISTICS is enabled
+ROLLING_STATISTICS_WINDOWS: dict[SMAChannelCategory, tuple[timedelta, ...]] = {
+    SMAChannelCategory.OPERATIONAL: (
+        timedelta(minutes=1),
+        timedelta(minutes=5),
+        timedelta(minutes=15),
+    ),
+    SMAChannelCategory.DIAGNOSTIC: (),
+}
+
+# deadbands for state writes, by unit.
+# when OPT_DEADBAND is enabled, changes of numeric measurements smaller than the
+# deadband are not written, unless OPT_MAX_SILENCE_INTERVAL has passed since the last write.
+# units not listed here (e.g. counters and enums) are always written.
+DEADBANDS: dict[SMAUnit, float] = {
+    SMAUnit.VOLT: 0.5,
+    SMAUnit.AMPERE: 0.05,
+    SMAUnit.WATT: 1.0,
+    SMAUnit.HERTZ: 0.02,
+    SMAUnit.CELSIUS: 0.2,
+    SMAUnit.VOLT_AMPERE_REACTIVE: 1.0,
+    SMAUnit.PERCENT: 0.1,
+    SMAUnit.POWER_FACTOR: 0.005,
+}
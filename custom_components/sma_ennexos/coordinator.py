@@ -2,12 +2,20 @@
 
 from __future__ import annotations
 
-from datetime import timedelta
+import asyncio
+import contextlib
+import time
+from collections.abc import Callable, Mapping
+from datetime import datetime, timedelta
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
@@ -19,16 +27,40 @@ from .const import (
     CONF_USE_SSL,
     CONF_USERNAME,
     CONF_VERIFY_SSL,
+    DATA_PROBED_TOPOLOGY,
+    DEFAULT_EXECUTOR_PARSE_SIZE,
+    DEFAULT_HISTORY_DEPTH,
+    DEFAULT_OPTIONS,
+    DEFAULT_PERSIST_SESSION,
+    DEFAULT_REDISCOVERY_INTERVAL,
     DEFAULT_REQUEST_RETIRES,
     DEFAULT_REQUEST_TIMEOUT,
+    DEFAULT_SAMPLE_INTERVAL,
     DEFAULT_UPDATE_INTERVAL,
+    DEFAULT_UPDATE_TRACING,
     DOMAIN,
+    HOT_APPLY_OPTIONS,
     LOGGER,
+    OPT_EXECUTOR_PARSE_SIZE,
+    OPT_HISTORY_DEPTH,
+    OPT_PERSIST_SESSION,
+    OPT_REDISCOVERY_INTERVAL,
     OPT_REQUEST_RETIRES,
     OPT_REQUEST_TIMEOUT,
+    OPT_SAMPLE_INTERVAL,
     OPT_UPDATE_INTERVAL,
+    OPT_UPDATE_TRACING,
 )
-from .sma.client import SMAApiClient
+from .history import (
+    ChannelHistory,
+    SampleAggregator,
+    sample_time_to_timestamp,
+    value_to_float,
+)
+from .sma.client import LoginResult, SMAApiClient
+from .sma.known_channels import get_channel_aggregation, get_known_channel
+from .sma.log import LazyFormat
+from .sma.metrics import DurationStats
 from .sma.model import (
     ChannelValues,
     ComponentInfo,
@@ -38,6 +70,22 @@ from .sma.model import (
     SMAApiCommunicationError,
     SMAApiParsingError,
 )
+from .sma.tracing import (
+    LogSummarySink,
+    OpenTelemetrySink,
+    RingBufferSink,
+    Span,
+    SpanSink,
+    add_sink,
+    span,
+)
+from .sma.watchdog import LoopBlockWatchdog
+from .storage import (
+    SMAChannelNameStore,
+    SMASessionStore,
+    SMATopologyStore,
+    localization_cache_dir,
+)
 
 
 # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
@@ -49,6 +97,35 @@ class SMADataCoordinator(DataUpdateCoordinator[list[ChannelValues]]):
     __client: SMAApiClient
     __all_components: list[ComponentInfo]
     __all_measurements: list[ChannelValues]
+    __component_index: dict[str, ComponentInfo]
+    __component_index_source: list[ComponentInfo] | None
+    __data_index: dict[tuple[str, str], ChannelValues]
+    __data_index_source: list[ChannelValues] | None
+    __history_depth: int
+    __history: dict[tuple[str, str], ChannelHistory]
+
+    __sample_interval: timedelta | None
+    __aggregator: SampleAggregator | None
+    __cancel_sampling: Callable[[], None] | None
+    __rediscovery_interval: timedelta | None
+    __cancel_rediscovery: Callable[[], None] | None
+    __fetch_lock: asyncio.Lock
+    __update_durations: DurationStats
+    __update_overruns: int
+    __polled_channels: int | None
+    __watchdog: LoopBlockWatchdog
+    __trace_buffer: RingBufferSink | None
+    __trace_sinks: list[SpanSink]
+    __remove_trace_sink: Callable[[], None] | None
+
+    __topology_store: SMATopologyStore | None
+    __session_store: SMASessionStore | None
+    __channel_name_store: SMAChannelNameStore | None
+    __channel_names: dict[str, str]
+    __setup_snapshot: list[ChannelValues] | None
+    __revalidate_on_refresh: bool
+    __applied_options: dict[str, Any]
+    __applied_data: dict[str, Any]
 
     @classmethod
     def for_config_entry(
@@ -57,7 +134,58 @@ class SMADataCoordinator(DataUpdateCoordinator[list[ChannelValues]]):
         config_entry: ConfigEntry,
     ) -> SMADataCoordinator:
         """Create a new instance of the coordinator given a config entry."""
-        client = SMAApiClient(
+        client = cls.__client_for_config_entry(hass, config_entry)
+
+        return SMADataCoordinator(
+            hass=hass,
+            config_entry=config_entry,
+            client=client,
+            update_interval_seconds=config_entry.options.get(
+                OPT_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL
+            ),
+            history_depth=int(
+                config_entry.options.get(OPT_HISTORY_DEPTH, DEFAULT_HISTORY_DEPTH)
+            ),
+            sample_interval_seconds=config_entry.options.get(
+                OPT_SAMPLE_INTERVAL, DEFAULT_SAMPLE_INTERVAL
+            ),
+            rediscovery_interval_seconds=int(
+                config_entry.options.get(
+                    OPT_REDISCOVERY_INTERVAL, DEFAULT_REDISCOVERY_INTERVAL
+                )
+            )
+            * 60,
+            topology_store=SMATopologyStore(hass, config_entry.entry_id),
+            session_store=SMASessionStore(hass, config_entry.entry_id)
+            if config_entry.options.get(OPT_PERSIST_SESSION, DEFAULT_PERSIST_SESSION)
+            else None,
+            channel_name_store=SMAChannelNameStore(hass, config_entry.entry_id),
+        )
+
+    @classmethod
+    async def async_logout_session(
+        cls, hass: HomeAssistant, config_entry: ConfigEntry, state: dict
+    ) -> None:
+        """
+        End a persisted api session of a config entry that is no longer used, e.g. after removing it.
+
+        :param state: the persisted session state
+        """
+        client = cls.__client_for_config_entry(hass, config_entry)
+        try:
+            client.restore_session(state)
+        except SMAApiParsingError as exception:
+            LOGGER.debug("not logging out invalid persisted session: %s", exception)
+            return
+
+        await client.logout()
+
+    @classmethod
+    def __client_for_config_entry(
+        cls, hass: HomeAssistant, config_entry: ConfigEntry
+    ) -> SMAApiClient:
+        """Create a api client given a config entry."""
+        return SMAApiClient(
             host=config_entry.data[CONF_HOST],
             username=config_entry.data[CONF_USERNAME],
             password=config_entry.data[CONF_PASSWORD],
@@ -72,15 +200,7 @@ class SMADataCoordinator(DataUpdateCoordinator[list[ChannelValues]]):
                 config_entry.options.get(OPT_REQUEST_RETIRES, DEFAULT_REQUEST_RETIRES)
             ),
             logger=LOGGER.getChild("sma_api"),
-        )
-
-        return SMADataCoordinator(
-            hass=hass,
-            config_entry=config_entry,
-            client=client,
-            update_interval_seconds=config_entry.options.get(
-                OPT_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL
-            ),
+            executor_parse_size=cls.__executor_parse_size(config_entry.options),
         )
 
     def __init__(
@@ -89,10 +209,68 @@ class SMADataCoordinator(DataUpdateCoordinator[list[ChannelValues]]):
         config_entry: ConfigEntry,
         client: SMAApiClient,
         update_interval_seconds: int = 60,
+        history_depth: int = 0,
+        sample_interval_seconds: int = 0,
+        rediscovery_interval_seconds: int = 0,
+        topology_store: SMATopologyStore | None = None,
+        session_store: SMASessionStore | None = None,
+        channel_name_store: SMAChannelNameStore | None = None,
     ) -> None:
-        """Init."""
+        """
+        Init.
+
+        :param history_depth: number of samples to keep per channel, 0 to disable
+        :param sample_interval_seconds: interval to sample values at in between updates.
+        values are aggregated per channel and published on every update.
+        0 (or a value not less than the update interval) disables sampling.
+        :param rediscovery_interval_seconds: interval to look for new components and channels at, 0 to disable
+        :param topology_store: cache for discovered components and channels, None to always discover on setup
+        :param session_store: storage to persist the api session in after login, on stop and on unload, None to logout on unload
+        :param channel_name_store: storage for the index of localized channel names, None to not name channels
+        """
         self.__client = client
         self.__all_components = []
+        self.__component_index = {}
+        self.__component_index_source = None
+        self.__data_index = {}
+        self.__data_index_source = None
+        self.__history_depth = history_depth
+        self.__history = {}
+        self.__fetch_lock = asyncio.Lock()
+        self.__update_durations = DurationStats()
+        self.__update_overruns = 0
+        self.__polled_channels = None
+        self.__watchdog = LoopBlockWatchdog(LOGGER)
+        client.watchdog = self.__watchdog
+        self.__trace_buffer = None
+        self.__trace_sinks = []
+        self.__remove_trace_sink = None
+        self.__cancel_sampling = None
+        self.__rediscovery_interval = (
+            timedelta(seconds=rediscovery_interval_seconds)
+            if rediscovery_interval_seconds > 0
+            else None
+        )
+        self.__cancel_rediscovery = None
+        self.__topology_store = topology_store
+        self.__session_store = session_store
+        if session_store is not None:
+            # persist every new session, as a restart does not always unload the entry
+            client.login_listener = self.__on_login
+        self.__channel_name_store = channel_name_store
+        self.__channel_names = {}
+        self.__setup_snapshot = None
+        self.__revalidate_on_refresh = False
+        self.__applied_options = dict(config_entry.options)
+        self.__applied_data = dict(config_entry.data)
+
+        # sampling is only useful if faster than updates
+        if 0 < sample_interval_seconds < update_interval_seconds:
+            self.__sample_interval = timedelta(seconds=sample_interval_seconds)
+            self.__aggregator = SampleAggregator(get_channel_aggregation)
+        else:
+            self.__sample_interval = None
+            self.__aggregator = None
 
         super().__init__(
             hass=hass,
@@ -102,23 +280,280 @@ class SMADataCoordinator(DataUpdateCoordinator[list[ChannelValues]]):
             update_interval=timedelta(seconds=update_interval_seconds),
         )
 
+    async def async_apply_options(self, options: Mapping[str, Any]) -> bool:
+        """
+        Apply changed options of the config entry without reloading, if possible.
+
+        saving unchanged options applies nothing, changed connection data always reloads.
+        :param options: the new options of the config entry
+        :returns: True if all changes were applied, False if the config entry has to be reloaded
+        """
+        if dict(self.config_entry.data) != self.__applied_data:
+            return False
+
+        changed = {
+            key
+            for key in {*self.__applied_options, *options}
+            if self.__applied_options.get(key, DEFAULT_OPTIONS.get(key))
+            != options.get(key, DEFAULT_OPTIONS.get(key))
+        }
+        if len(changed) == 0:
+            LOGGER.debug("options are unchanged, nothing to apply")
+            return True
+        if not changed <= HOT_APPLY_OPTIONS:
+            return False
+
+        # sampling is set up based on the update interval
+        if OPT_UPDATE_INTERVAL in changed and options.get(
+            OPT_SAMPLE_INTERVAL, DEFAULT_SAMPLE_INTERVAL
+        ):
+            return False
+
+        LOGGER.debug("applying changed options %s", changed)
+        self.__applied_options = dict(options)
+        self.__client.request_timeout = options.get(
+            OPT_REQUEST_TIMEOUT, DEFAULT_REQUEST_TIMEOUT
+        )
+        self.__client.request_retries = int(
+            options.get(OPT_REQUEST_RETIRES, DEFAULT_REQUEST_RETIRES)
+        )
+        self.__client.executor_parse_size = self.__executor_parse_size(options)
+
+        self.__set_tracing(
+            bool(options.get(OPT_UPDATE_TRACING, DEFAULT_UPDATE_TRACING))
+        )
+
+        if OPT_UPDATE_INTERVAL in changed:
+            self.update_interval = timedelta(
+                seconds=options.get(OPT_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)
+            )
+
+            # refresh re-schedules the next update using the new interval
+            await self.async_request_refresh()
+
+        return True
+
+    @staticmethod
+    def __executor_parse_size(options: Mapping[str, Any]) -> int | None:
+        """Size of responses to parse in a executor thread at, in bytes. None if disabled."""
+        size_kib = int(
+            options.get(OPT_EXECUTOR_PARSE_SIZE, DEFAULT_EXECUTOR_PARSE_SIZE)
+        )
+        return size_kib * 1024 if size_kib > 0 else None
+
     async def _async_setup(self) -> None:
-        """Set up the coordinator initially."""
-        await self.__client.login()
-        self.__all_components = await self.__client.get_all_components()
-        self.__all_measurements = await self.__client.get_all_live_measurements(
-            [c.component_id for c in self.__all_components]
+        """
+        Set up the coordinator initially.
+
+        with a cached topology, setup makes no requests, so entities can be created right away.
+        the first refresh then fetches all cached channels, and re-validates the topology with them.
+        otherwise the measurements fetched by discovery are used as data of the first refresh,
+        so setup only fetches measurements once.
+        """
+        self.__set_tracing(
+            bool(
+                self.config_entry.options.get(
+                    OPT_UPDATE_TRACING, DEFAULT_UPDATE_TRACING
+                )
+            )
+        )
+        cached_topology = (
+            await self.__topology_store.async_load()
+            if self.__topology_store is not None
+            else None
+        )
+        await self.__async_restore_session()
+        if self.__session_store is not None:
+            # config entries are not unloaded on shutdown, so persist the session on stop too
+            self.config_entry.async_on_unload(
+                self.hass.bus.async_listen(
+                    EVENT_HOMEASSISTANT_STOP, self.__async_handle_stop
+                )
+            )
+        if cached_topology is not None:
+            # use cached topology, so entities can be created right away.
+            # the first refresh fetches the values, and re-validates the components
+            LOGGER.debug("using cached topology for %s", self.__client.host)
+            self.__all_components, channels = cached_topology
+            self.__all_measurements = [
+                ChannelValues(
+                    component_id=component_id, channel_id=channel_id, values=[]
+                )
+                for component_id, channel_id in channels
+            ]
+            self.__setup_snapshot = None
+            self.__revalidate_on_refresh = True
+        else:
+            await self.__client.login()
+            (
+                self.__all_components,
+                self.__all_measurements,
+            ) = await self.__async_discover()
+            self.__setup_snapshot = self.__all_measurements
+            await self.__async_save_topology()
+
+        await self.__async_load_channel_names()
+
+        if self.__sample_interval is not None and self.__cancel_sampling is None:
+            LOGGER.debug("sampling values every %s", self.__sample_interval)
+            self.__cancel_sampling = async_track_time_interval(
+                self.hass,
+                self.__async_sample,
+                self.__sample_interval,
+                name=f"{DOMAIN} sampling",
+                cancel_on_shutdown=True,
+            )
+
+        if (
+            self.__rediscovery_interval is not None
+            and self.__cancel_rediscovery is None
+        ):
+            LOGGER.debug("rediscovering topology every %s", self.__rediscovery_interval)
+            self.__cancel_rediscovery = async_track_time_interval(
+                self.hass,
+                self.__async_rediscover,
+                self.__rediscovery_interval,
+                name=f"{DOMAIN} rediscovery",
+                cancel_on_shutdown=True,
+            )
+
+    async def __async_load_channel_names(self) -> None:
+        """
+        Load the index of localized channel names, and update it in the background.
+
+        the index only names channels that are not known, so without any the web ui is not requested.
+        """
+        if self.__channel_name_store is None:
+            return
+
+        if all(
+            get_known_channel(m.channel_id) is not None for m in self.__all_measurements
+        ):
+            return
+
+        fingerprint = None
+        stored = await self.__channel_name_store.async_load()
+        if stored is not None:
+            fingerprint, self.__channel_names = stored
+
+        self.config_entry.async_create_background_task(
+            self.hass,
+            self.__async_update_channel_names(fingerprint),
+            name=f"{DOMAIN} channel name index update",
         )
 
+    async def __async_update_channel_names(self, fingerprint: str | None) -> None:
+        """
+        Rebuild the index of localized channel names, if the localizations of the device changed.
+
+        only the fingerprint of the localizations is fetched if they did not change.
+        a rebuilt index is used by entities created after it, e.g. on the next reload.
+        :param fingerprint: fingerprint of the stored index, None if there is none
+        """
+        if self.__channel_name_store is None:
+            return
+
+        from .sma.localization import build_channel_name_index
+
+        # the index depends on the language, so a language change rebuilds it too
+        language = self.hass.config.language
+        try:
+            current_fingerprint = (
+                f"{language}:{await self.__client.get_localization_fingerprint()}"
+            )
+            if current_fingerprint == fingerprint:
+                return
+
+            LOGGER.debug("building channel name index for %s", self.__client.host)
+            localizations = await self.__client.get_localizations(
+                cache_dir=localization_cache_dir(self.hass, self.config_entry.entry_id)
+            )
+        except SMAApiClientError as exception:
+            LOGGER.debug("failed to update channel name index: %s", exception)
+            return
+
+        self.__channel_names = await self.hass.async_add_executor_job(
+            build_channel_name_index, localizations, language
+        )
+        await self.__channel_name_store.async_save(
+            current_fingerprint, self.__channel_names
+        )
+
+    async def __async_restore_session(self) -> None:
+        """Restore the persisted api session, if any. login() refreshes it if needed."""
+        if self.__session_store is None:
+            return
+
+        state = await self.__session_store.async_load()
+        if state is None:
+            return
+
+        # the persisted session is kept until a login replaces it,
+        # e.g. with a new session if the restored token is rejected
+        try:
+            self.__client.restore_session(state)
+        except SMAApiParsingError as exception:
+            LOGGER.warning("ignoring invalid persisted session: %s", exception)
+            await self.__session_store.async_remove()
+
+    @callback
+    def __on_login(self, result: LoginResult) -> None:
+        """Persist the session after a new login or token refresh."""
+        LOGGER.debug("persisting api session after login (%s)", result.value)
+        self.config_entry.async_create_background_task(
+            self.hass,
+            self.__async_save_session(),
+            name=f"{DOMAIN} session save",
+        )
+
+    async def __async_handle_stop(self, _event: Event) -> None:
+        """Persist the session on shutdown, config entries are not unloaded then."""
+        await self.__async_save_session()
+
+    async def __async_save_session(self) -> None:
+        """Persist the current api session, if sessions are persisted and logged in."""
+        if self.__session_store is None:
+            return
+
+        state = self.__client.session_state
+        if state is not None:
+            await self.__session_store.async_save(state)
+
     async def _async_update_data(self) -> list[ChannelValues]:
         """Update data."""
         try:
+            # first refresh uses the measurements fetched during setup
+            if self.__setup_snapshot is not None:
+                measurements = self.__setup_snapshot
+                self.__setup_snapshot = None
+                self.__record_history(measurements)
+                return measurements
+
+            # first refresh after setup from a cached topology.
+            # no entity listens yet, so the query of the listeners would be empty
+            if self.__revalidate_on_refresh:
+                return await self.__async_fetch_cached_channels()
+
             LOGGER.debug("updating data for %s", self.__client.host)
 
-            await self.__client.login()
-            measurements = await self.__client.get_live_measurements(query=self.__query)
+            with span(
+                "update",
+                entry_id=self.config_entry.entry_id,
+                host=self.__client.host,
+            ) as update_span:
+                start = time.monotonic()
+                try:
+                    measurements = await self.__async_fetch()
+                finally:
+                    self.__record_update_duration(time.monotonic() - start)
+
+                # publish values aggregated since the last update
+                if self.__aggregator is not None:
+                    self.__aggregator.add(measurements)
+                    measurements = self.__aggregator.flush()
 
-            return measurements
+                update_span.set_attribute("channels", len(measurements))
+                return measurements
         except SMAApiAuthenticationError as exception:
             raise ConfigEntryAuthFailed(exception) from exception
         except SMAApiCommunicationError as exception:
@@ -128,20 +563,370 @@ class SMADataCoordinator(DataUpdateCoordinator[list[ChannelValues]]):
         except SMAApiClientError as exception:
             raise UpdateFailed(exception) from exception
 
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners."""
+        listeners = len(self._listeners)
+        with (
+            span("dispatch", entry_id=self.config_entry.entry_id, listeners=listeners),
+            self.__watchdog.measure("dispatch", listeners=listeners),
+        ):
+            super().async_update_listeners()
+
+        # parsing and dispatching block the event loop, warn if that took too long
+        self.__watchdog.finish_cycle(f"update of {self.__client.host}")
+
+    def __record_update_duration(self, seconds: float) -> None:
+        """Record the duration of a update, and if it took longer than the update interval."""
+        self.__update_durations.record(seconds)
+        if (
+            self.update_interval is not None
+            and seconds > self.update_interval.total_seconds()
+        ):
+            self.__update_overruns += 1
+            LOGGER.debug(
+                "update took %.3fs, longer than the update interval of %s",
+                seconds,
+                self.update_interval,
+            )
+
+    async def __async_discover(
+        self,
+    ) -> tuple[list[ComponentInfo], list[ChannelValues]]:
+        """Discover all components and their channels, requires login."""
+        # re-use the navigation probed by the config flow, if any
+        navigation = self.hass.data.get(DATA_PROBED_TOPOLOGY, {}).pop(
+            self.__client.host, None
+        )
+        components = await self.__client.get_all_components(navigation)
+        measurements = await self.__client.get_all_live_measurements(
+            [c.component_id for c in components]
+        )
+        return (components, measurements)
+
+    async def __async_save_topology(
+        self,
+        components: list[ComponentInfo] | None = None,
+        measurements: list[ChannelValues] | None = None,
+    ) -> None:
+        """Save a topology to the cache, defaults to the current topology."""
+        if self.__topology_store is None:
+            return
+
+        await self.__topology_store.async_save(
+            components if components is not None else self.__all_components,
+            [
+                (m.component_id, m.channel_id)
+                for m in (
+                    measurements
+                    if measurements is not None
+                    else self.__all_measurements
+                )
+            ],
+        )
+
+    async def __async_add_discovered(
+        self, components: list[ComponentInfo], measurements: list[ChannelValues]
+    ) -> None:
+        """Add components and channels not known yet, and notify listeners about new channels."""
+        known_components = {c.component_id for c in self.__all_components}
+        new_components = [
+            c for c in components if c.component_id not in known_components
+        ]
+
+        known_channels = {
+            (m.component_id, m.channel_id) for m in self.__all_measurements
+        }
+        new_measurements = [
+            m
+            for m in measurements
+            if (m.component_id, m.channel_id) not in known_channels
+        ]
+
+        if len(new_components) == 0 and len(new_measurements) == 0:
+            return
+
+        LOGGER.info(
+            "discovered %s new components and %s new channels on %s",
+            len(new_components),
+            len(new_measurements),
+            self.__client.host,
+        )
+        self.__all_components = [*self.__all_components, *new_components]
+        self.__all_measurements = [*self.__all_measurements, *new_measurements]
+        await self.__async_save_topology()
+
+        if len(new_measurements) > 0:
+            async_dispatcher_send(self.hass, self.signal_new_channels, new_measurements)
+
+    async def __async_rediscover(self, _now: datetime) -> None:
+        """
+        Look for components and channels added since setup.
+
+        only the navigation and the channel inventory are fetched, extra info is only
+        fetched for new components.
+        the fetch lock is held until the discovered channels are added, so updates
+        and sampling never see the topology while it is swapped.
+        """
+        # skip if a update is currently running, rediscovery is not time critical
+        if self.__fetch_lock.locked():
+            return
+
+        try:
+            with span("rediscover", entry_id=self.config_entry.entry_id):
+                async with self.__fetch_lock:
+                    await self.__client.login()
+
+                    navigation = await self.__client.get_navigation()
+                    known_components = {c.component_id for c in self.__all_components}
+                    new_components = [
+                        c
+                        for c in navigation[1:]
+                        if c.component_id not in known_components
+                    ]
+
+                    components = self.__all_components
+                    if len(new_components) > 0:
+                        # extra info is only fetched for the new components, the root component is skipped
+                        new_components = await self.__client.get_all_components(
+                            [navigation[0], *new_components]
+                        )
+                        components = [*components, *new_components[1:]]
+
+                    measurements = await self.__client.get_all_live_measurements(
+                        [c.component_id for c in components]
+                    )
+                    await self.__async_add_discovered(components, measurements)
+        except SMAApiClientError as exception:
+            LOGGER.debug("failed to rediscover topology: %s", exception)
+
+    async def __async_fetch_cached_channels(self) -> list[ChannelValues]:
+        """
+        Fetch all channels of the cached components, and re-validate the topology in the background.
+
+        the measurements also contain channels missing from the cache, so they are re-used
+        by the re-validation.
+        """
+        component_ids = [c.component_id for c in self.__all_components]
+        async with self.__fetch_lock:
+            await self.__client.login()
+            measurements = await self.__client.get_all_live_measurements(component_ids)
+
+        self.__revalidate_on_refresh = False
+        self.__record_history(measurements)
+        self.config_entry.async_create_background_task(
+            self.hass,
+            self.__async_revalidate_topology(measurements),
+            name=f"{DOMAIN} topology re-validation",
+        )
+        return measurements
+
+    async def __async_revalidate_topology(
+        self, measurements: list[ChannelValues]
+    ) -> None:
+        """
+        Discover the topology, and add channels that are not in the cached one.
+
+        :param measurements: measurements of all cached components, fetched by the first refresh.
+        only fetched again if the components changed.
+        """
+        async with self.__fetch_lock:
+            try:
+                components = await self.__client.get_all_components()
+                if {c.component_id for c in components} != {
+                    c.component_id for c in self.__all_components
+                }:
+                    measurements = await self.__client.get_all_live_measurements(
+                        [c.component_id for c in components]
+                    )
+            except SMAApiClientError as exception:
+                LOGGER.warning("failed to re-validate cached topology: %s", exception)
+                return
+
+            await self.__async_add_discovered(components, measurements)
+
+        # cache the discovered topology as-is, so removed components and channels
+        # are dropped on the next setup
+        await self.__async_save_topology(components, measurements)
+
+    async def __async_fetch(self) -> list[ChannelValues]:
+        """Fetch the current values of all active channels."""
+        async with self.__fetch_lock:
+            await self.__client.login()
+            query = self.__query
+            self.__polled_channels = len(query)
+            measurements = await self.__client.get_live_measurements(query=query)
+
+        self.__record_history(measurements)
+        return measurements
+
+    async def __async_sample(self, _now: datetime) -> None:
+        """Fetch a sample in between updates."""
+        # skip if a update is currently running
+        if self.__aggregator is None or self.__fetch_lock.locked():
+            return
+
+        try:
+            with span("sample", entry_id=self.config_entry.entry_id):
+                self.__aggregator.add(await self.__async_fetch())
+        except SMAApiClientError as exception:
+            # errors are reported by the next update
+            LOGGER.debug("failed to fetch sample: %s", exception)
+
     async def _async_unload(self) -> None:
         """Unload the coordinator."""
-        await self.__client.logout()
+        if self.__cancel_sampling is not None:
+            self.__cancel_sampling()
+            self.__cancel_sampling = None
+        if self.__cancel_rediscovery is not None:
+            self.__cancel_rediscovery()
+            self.__cancel_rediscovery = None
+        self.__setup_snapshot = None
+        self.__set_tracing(False)
+
+        if self.__session_store is None:
+            await self.__client.logout()
+            return
+
+        # keep the session alive if it is persisted, so it can be resumed on the next setup.
+        # it is logged out once the entry is removed
+        state = self.__client.session_state
+        if state is not None:
+            await self.__session_store.async_save(state)
+
+    def __set_tracing(self, enabled: bool) -> None:
+        """Enable or disable tracing of updates, spans are kept in memory and logged."""
+        if enabled == (self.__remove_trace_sink is not None):
+            return
+
+        if not enabled:
+            if self.__remove_trace_sink is not None:
+                self.__remove_trace_sink()
+            self.__remove_trace_sink = None
+            self.__trace_buffer = None
+            self.__trace_sinks = []
+            return
+
+        self.__trace_buffer = RingBufferSink()
+        self.__trace_sinks = [self.__trace_buffer, LogSummarySink(LOGGER)]
+
+        # spans are exported to OpenTelemetry only if it is installed
+        with contextlib.suppress(ImportError):
+            self.__trace_sinks.append(OpenTelemetrySink(DOMAIN))
+
+        self.__remove_trace_sink = add_sink(self.__record_trace)
+
+    def __record_trace(self, root_span: Span) -> None:
+        """Pass a finished root span of this config entry to the trace sinks."""
+        # sinks are global, so spans of other config entries are received too
+        if root_span.attributes.get("entry_id") != self.config_entry.entry_id:
+            return
+
+        for sink in self.__trace_sinks:
+            sink(root_span)
+
+    def __record_history(self, measurements: list[ChannelValues]) -> None:
+        """Append all numeric values to the history of their channel, if enabled."""
+        if self.__history_depth <= 0:
+            return
+
+        for channel_values in measurements:
+            key = (channel_values.component_id, channel_values.channel_id)
+            history = self.__history.get(key)
+            for tvp in channel_values.values:
+                value = value_to_float(tvp.value)
+                if value is None:
+                    continue
+
+                if history is None:
+                    history = self.__history[key] = ChannelHistory(self.__history_depth)
+                history.append(sample_time_to_timestamp(tvp.time), value)
+
+    def get_history(self, component_id: str, channel_id: str) -> ChannelHistory | None:
+        """
+        Get the recent sample history of a channel.
+
+        :returns: the history, or None if history is disabled or no numeric value was received yet
+        """
+        return self.__history.get((component_id, channel_id))
 
     @property
     def all_components(self) -> list[ComponentInfo]:
         """Get all components available."""
         return self.__all_components
 
+    @property
+    def component_index(self) -> dict[str, ComponentInfo]:
+        """Get all components available, by component id."""
+        # all_components is only ever replaced, never modified in place
+        if self.__component_index_source is not self.__all_components:
+            self.__component_index = {c.component_id: c for c in self.__all_components}
+            self.__component_index_source = self.__all_components
+        return self.__component_index
+
+    @property
+    def data_index(self) -> dict[tuple[str, str], ChannelValues]:
+        """Get the current data, by (component id, channel id)."""
+        # data is only ever replaced by a update, never modified in place.
+        # built once per update, instead of every sensor scanning the data.
+        # reversed, so the first of duplicate channels wins
+        if self.__data_index_source is not self.data:
+            self.__data_index = {
+                (cv.component_id, cv.channel_id): cv for cv in reversed(self.data or [])
+            }
+            self.__data_index_source = self.data
+        return self.__data_index
+
+    @property
+    def channel_names(self) -> Mapping[str, str]:
+        """Names of channels localized by the device, by channel id without array index."""
+        return self.__channel_names
+
     @property
     def all_measurements(self) -> list[ChannelValues]:
         """Get all measurements available."""
         return self.__all_measurements
 
+    @property
+    def update_durations(self) -> DurationStats:
+        """Durations of updates fetching data from the device."""
+        return self.__update_durations
+
+    @property
+    def update_overruns(self) -> int:
+        """Number of updates that took longer than the update interval."""
+        return self.__update_overruns
+
+    @property
+    def polled_channels(self) -> int | None:
+        """Number of channels polled by the most recent fetch, None before the first fetch."""
+        return self.__polled_channels
+
+    @property
+    def performance_metrics(self) -> dict:
+        """Snapshot of the performance metrics of the coordinator and its client."""
+        metrics = {
+            "updates": {
+                **self.__update_durations.as_dict(),
+                "overruns": self.__update_overruns,
+                "blocked": self.__watchdog.blocked_cycles,
+            },
+            **self.__client.metrics.as_dict(),
+        }
+
+        # recent update traces, if tracing is enabled
+        if self.__trace_buffer is not None:
+            metrics["update_traces"] = [
+                root_span.as_dict() for root_span in self.__trace_buffer.spans
+            ]
+
+        return metrics
+
+    @property
+    def signal_new_channels(self) -> str:
+        """Dispatcher signal sent with a list of ChannelValues when new channels are discovered."""
+        return f"{DOMAIN}_new_channels_{self.config_entry.entry_id}"
+
     @property
     def __query(self) -> list[LiveMeasurementQueryItem]:
         """Generate measurements query for currently active listeners."""
@@ -151,6 +936,10 @@ class SMADataCoordinator(DataUpdateCoordinator[list[ChannelValues]]):
         # entities that are disabled are thus not part of the query.
         channels: list[tuple[str, str]] = []
         for _, ctx in self._listeners.values():
+            # entities not backed by a channel, e.g. performance sensors
+            if ctx is None:
+                continue
+
             if (
                 isinstance(ctx, tuple)
                 and len(ctx) == 2
@@ -169,7 +958,10 @@ class SMADataCoordinator(DataUpdateCoordinator[list[ChannelValues]]):
         LOGGER.debug(
             "generated measurements query for %s listeners: %s",
             len(self._listeners),
-            ("; ".join([f"{qi.component_id}@{qi.channel_id}" for qi in query])),
+            # joining every channel is only worth it if the message is logged
+            LazyFormat(
+                lambda: "; ".join(f"{qi.component_id}@{qi.channel_id}" for qi in query)
+            ),
         )
 
         return query
@@ -2,16 +2,28 @@
 
 from __future__ import annotations
 
+import time
 from dataclasses import asdict
+from itertools import islice
+from typing import TYPE_CHECKING
 
-from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.components.diagnostics import REDACTED, async_redact_data
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import entity_registry
 
-from custom_components.sma_ennexos.coordinator import SMADataCoordinator
+from .const import (
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    DATA_DIAGNOSTICS_LOCALIZATIONS,
+    DEFAULT_DIAGNOSTICS_LOCALIZATIONS,
+    OPT_DIAGNOSTICS_LOCALIZATIONS,
+)
+from .sma.model import ChannelValues, ComponentInfo
+from .storage import localization_cache_dir
 
-from .const import CONF_PASSWORD, CONF_USERNAME
+if TYPE_CHECKING:
+    from .coordinator import SMADataCoordinator
 
 TO_REDACT = {
     # config entry
@@ -21,6 +33,17 @@ TO_REDACT = {
     "serial_number",
 }
 
+# time localizations are re-used for, in seconds.
+# localizations only change with the firmware, but fetching them is expensive
+LOCALIZATIONS_TTL = 3600
+
+# maximum number of entities, components and measurements included, longer lists are truncated.
+# a item count, not a size budget: a array channel or a component counts as a single item
+MAX_LIST_ITEMS = 2000
+
+# maximum number of messages included per localization
+MAX_MESSAGES_PER_LOCALIZATION = 5000
+
 
 async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry):
     """Return diagnostics for the config entry."""
@@ -35,40 +58,141 @@ async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigE
         entity.entity_id
         for entity in entity_registry.async_entries_for_config_entry(er, entry.entry_id)
     ]
-    entity_states = {entity: hass.states.get(entity) for entity in entity_ids}
+    truncated: dict[str, int] = {}
+    entity_states = {
+        entity: hass.states.get(entity)
+        for entity in __truncate(entity_ids, "entities", truncated)
+    }
+
+    # diagnostics are rarely requested, so the coordinator is only imported here.
+    # it is already loaded at this point if the config entry is set up.
+    from .coordinator import SMADataCoordinator
 
     # get all components and measurements info
     api_raw_data: dict = {}
+    performance: dict = {}
     coordinator = hass.data["sma_ennexos"][entry.entry_id]
     if isinstance(coordinator, SMADataCoordinator):
-        components = [
-            async_redact_data(asdict(component), TO_REDACT)
-            for component in coordinator.all_components
-        ]
-        measurements = [
-            async_redact_data(asdict(measurement), TO_REDACT)
-            for measurement in coordinator.all_measurements
-        ]
-
-        localizations = []
-        try:
-            locs = await coordinator.client.get_localizations()
-            for filename, lang_data in locs:
-                redacted_lang_data = async_redact_data(lang_data, TO_REDACT)
-                localizations.append(
-                    {"filename": filename, "lang_data": redacted_lang_data}
-                )
-        except Exception as e:
-            localizations.append({"error": f"Failed to get localizations: {e}"})
-
-        api_raw_data = {
-            "components": components,
-            "measurements": measurements,
-            "localizations": localizations,
-        }
+        localizations = None
+        if entry.options.get(
+            OPT_DIAGNOSTICS_LOCALIZATIONS, DEFAULT_DIAGNOSTICS_LOCALIZATIONS
+        ):
+            localizations = await __async_get_localizations(hass, entry, coordinator)
 
-    return {
+        # redaction of large plants is expensive, so it runs in the executor,
+        # using __redact as async_redact_data must run in the event loop.
+        # components and measurements are only ever replaced, never modified in place
+        api_raw_data = await hass.async_add_executor_job(
+            __build_raw_data,
+            coordinator.all_components,
+            coordinator.all_measurements,
+            localizations,
+            truncated,
+        )
+        performance = coordinator.performance_metrics
+
+    diagnostics = {
         "config_entry": config_entry,
         "entities": entity_states,
         "raw_data": api_raw_data,
+        "performance": performance,
     }
+    if len(truncated) > 0:
+        # original size of all truncated lists
+        diagnostics["truncated"] = truncated
+
+    return diagnostics
+
+
+async def __async_get_localizations(
+    hass: HomeAssistant, entry: ConfigEntry, coordinator: SMADataCoordinator
+) -> list[dict]:
+    """
+    Get the redacted localizations of the device, re-using them for LOCALIZATIONS_TTL.
+
+    failures are included as error entry, and not cached.
+    """
+    cache = hass.data.setdefault(DATA_DIAGNOSTICS_LOCALIZATIONS, {})
+    cached = cache.get(entry.entry_id)
+    if cached is not None and time.monotonic() - cached[0] < LOCALIZATIONS_TTL:
+        return cached[1]
+
+    try:
+        locs = await coordinator.client.get_localizations(
+            cache_dir=localization_cache_dir(hass, entry.entry_id)
+        )
+    except Exception as e:
+        return [{"error": f"Failed to get localizations: {e}"}]
+
+    localizations = await hass.async_add_executor_job(__redact_localizations, locs)
+    cache[entry.entry_id] = (time.monotonic(), localizations)
+    return localizations
+
+
+def __redact_localizations(locs: list[tuple[str, dict]]) -> list[dict]:
+    """Redact localizations, truncating each to MAX_MESSAGES_PER_LOCALIZATION messages."""
+    return [
+        {
+            "filename": filename,
+            "lang_data": __redact(
+                dict(islice(lang_data.items(), MAX_MESSAGES_PER_LOCALIZATION))
+            ),
+        }
+        for filename, lang_data in locs
+    ]
+
+
+def __build_raw_data(
+    components: list[ComponentInfo],
+    measurements: list[ChannelValues],
+    localizations: list[dict] | None,
+    truncated: dict[str, int],
+) -> dict:
+    """
+    Build the redacted raw data of the api.
+
+    :param localizations: redacted localizations, None if not included
+    :param truncated: original size of lists that are truncated, by name
+    """
+    raw_data = {
+        "components": [
+            __redact(asdict(component))
+            for component in __truncate(components, "components", truncated)
+        ],
+        "measurements": [
+            __redact(measurement.to_dict())
+            for measurement in __truncate(measurements, "measurements", truncated)
+        ],
+    }
+    if localizations is not None:
+        raw_data["localizations"] = localizations
+
+    return raw_data
+
+
+def __redact(data: object) -> object:
+    """
+    Redact the TO_REDACT keys of nested dicts and lists.
+
+    same as async_redact_data, which is a callback and must not run in the executor.
+    None and empty values are kept, as there is nothing to redact.
+    """
+    if isinstance(data, dict):
+        return {
+            key: REDACTED
+            if key in TO_REDACT and value is not None and value != ""
+            else __redact(value)
+            for key, value in data.items()
+        }
+    if isinstance(data, list):
+        return [__redact(item) for item in data]
+    return data
+
+
+def __truncate(items: list, name: str, truncated: dict[str, int]) -> list:
+    """Truncate a list to MAX_LIST_ITEMS items, recording its original length if truncated."""
+    if len(items) <= MAX_LIST_ITEMS:
+        return items
+
+    truncated[name] = len(items)
+    return items[:MAX_LIST_ITEMS]
@@ -0,0 +1,427 @@
+"""In-memory history of recent channel values."""
+
+from __future__ import annotations
+
+import math
+from array import array
+from collections import deque
+from collections.abc import Callable
+from datetime import datetime
+from time import monotonic, time
+
+from .sma.known_channels import SMAAggregation
+from .sma.model import ChannelValues, SMAValue, TimeValuePair
+
+# number of samples added to a rolling window before its running sum is recomputed,
+# so rounding errors of adding and subtracting do not accumulate
+ROLLING_WINDOW_RESUM_INTERVAL = 1000
+
+
+def sample_time_to_timestamp(sample_time: str) -> float:
+    """
+    Convert the time of a SMA sample to a unix timestamp.
+
+    falls back to the current time if the sample time cannot be parsed.
+    """
+    try:
+        return datetime.fromisoformat(sample_time).timestamp()
+    except ValueError:
+        return time()
+
+
+def value_to_float(value: SMAValue | None) -> float | None:
+    """Convert a SMA value to float, if it is numeric."""
+    # note: type() is used instead of isinstance() to exclude bool
+    if type(value) is int or type(value) is float:
+        return float(value)
+    return None
+
+
+class ChannelHistory:
+    """
+    fixed-size ring buffer of recent numeric samples of a single channel.
+
+    samples are stored as contiguous float arrays of timestamps and values.
+    appending is O(1). window statistics search and read the ring in place,
+    so they only touch the samples within the window.
+    """
+
+    __slots__ = ("__depth", "__head", "__size", "__timestamps", "__values")
+
+    __depth: int
+    __head: int
+    __size: int
+    __timestamps: array
+    __values: array
+
+    def __init__(self, depth: int) -> None:
+        """Initialize history with a fixed depth."""
+        if depth < 1:
+            raise ValueError("depth must be at least 1")
+
+        self.__depth = depth
+        self.__head = 0
+        self.__size = 0
+        self.__timestamps = array("d", bytes(8 * depth))
+        self.__values = array("d", bytes(8 * depth))
+
+    @property
+    def depth(self) -> int:
+        """Maximum number of samples kept."""
+        return self.__depth
+
+    def __len__(self) -> int:
+        """Return the number of samples currently kept."""
+        return self.__size
+
+    @property
+    def latest(self) -> tuple[float, float] | None:
+        """Latest sample as (timestamp, value), or None if empty."""
+        if self.__size == 0:
+            return None
+
+        i = (self.__head - 1) % self.__depth
+        return (self.__timestamps[i], self.__values[i])
+
+    def append(self, timestamp: float, value: float) -> bool:
+        """
+        Append a sample, overwriting the oldest sample once full.
+
+        samples that are not newer than the latest sample are ignored.
+        :returns: True if the sample was appended
+        """
+        latest = self.latest
+        if latest is not None and timestamp <= latest[0]:
+            return False
+
+        self.__timestamps[self.__head] = timestamp
+        self.__values[self.__head] = value
+        self.__head = (self.__head + 1) % self.__depth
+        self.__size = min(self.__size + 1, self.__depth)
+        return True
+
+    def clear(self) -> None:
+        """Remove all samples."""
+        self.__head = 0
+        self.__size = 0
+
+    def samples(self) -> tuple[array, array]:
+        """Get a copy of all samples as (timestamps, values), ordered oldest to newest."""
+        if self.__size < self.__depth:
+            return (self.__timestamps[: self.__size], self.__values[: self.__size])
+
+        h = self.__head
+        return (
+            self.__timestamps[h:] + self.__timestamps[:h],
+            self.__values[h:] + self.__values[:h],
+        )
+
+    def window(self, seconds: float, now: float | None = None) -> array:
+        """
+        Get a copy of the values of all samples within the last n seconds.
+
+        :param seconds: size of the window
+        :param now: end of the window, defaults to the latest sample
+        """
+        values = array("d")
+        for segment in self.__window_segments(seconds, now):
+            values.extend(segment)
+        return values
+
+    def count(self, seconds: float, now: float | None = None) -> int:
+        """Count the samples within the last n seconds."""
+        return sum(len(s) for s in self.__window_segments(seconds, now))
+
+    def mean(self, seconds: float, now: float | None = None) -> float | None:
+        """Mean of the values within the last n seconds."""
+        segments = self.__window_segments(seconds, now)
+        count = sum(len(s) for s in segments)
+        return math.fsum(math.fsum(s) for s in segments) / count if count else None
+
+    def minimum(self, seconds: float, now: float | None = None) -> float | None:
+        """Minimum of the values within the last n seconds."""
+        segments = self.__window_segments(seconds, now)
+        return min(min(s) for s in segments) if segments else None
+
+    def maximum(self, seconds: float, now: float | None = None) -> float | None:
+        """Maximum of the values within the last n seconds."""
+        segments = self.__window_segments(seconds, now)
+        return max(max(s) for s in segments) if segments else None
+
+    def __index(self, i: int) -> int:
+        """Position in the ring of the i-th oldest sample."""
+        return (self.__head - self.__size + i) % self.__depth
+
+    def __window_segments(self, seconds: float, now: float | None) -> list[memoryview]:
+        """
+        Get the values within the last n seconds as views into the ring, without copying.
+
+        :returns: up to two non-empty views, ordered oldest to newest
+        """
+        if self.__size == 0:
+            return []
+
+        end = self.latest[0] if now is None else now  # type: ignore[index]
+        start = end - seconds
+
+        # binary search for the oldest sample in the window, like bisect_left
+        lo, hi = 0, self.__size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.__timestamps[self.__index(mid)] < start:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        count = self.__size - lo
+        if count == 0:
+            return []
+
+        first = self.__index(lo)
+        values = memoryview(self.__values)
+        if first + count <= self.__depth:
+            return [values[first : first + count]]
+        return [values[first:], values[: first + count - self.__depth]]
+
+
+class RollingWindow:
+    """
+    mean, minimum and maximum over a sliding time window, updated incrementally.
+
+    the mean is kept as a running sum, minimum and maximum use monotonic queues.
+    adding a sample and reading statistics are amortized O(1).
+    the window ends at the latest sample plus the time passed since it was added,
+    so samples leave the window even while no new samples arrive, without being
+    affected by the clock of the device.
+    """
+
+    __slots__ = (
+        "__added_at",
+        "__adds_since_resum",
+        "__clock",
+        "__latest",
+        "__max",
+        "__min",
+        "__samples",
+        "__seconds",
+        "__sum",
+    )
+
+    __seconds: float
+    __clock: Callable[[], float]
+    __samples: deque[tuple[float, float]]
+    __sum: float
+    __adds_since_resum: int
+    __min: deque[tuple[float, float]]
+    __max: deque[tuple[float, float]]
+    __latest: float | None
+    __added_at: float
+
+    def __init__(self, seconds: float, clock: Callable[[], float] = monotonic) -> None:
+        """
+        Initialize window covering the last n seconds.
+
+        :param clock: clock measuring the time passed since the latest sample, in seconds
+        """
+        if seconds <= 0:
+            raise ValueError("seconds must be positive")
+
+        self.__seconds = seconds
+        self.__clock = clock
+        self.__samples = deque()
+        self.__sum = 0.0
+        self.__adds_since_resum = 0
+        self.__min = deque()
+        self.__max = deque()
+        self.__latest = None
+        self.__added_at = 0.0
+
+    @property
+    def seconds(self) -> float:
+        """Size of the window in seconds."""
+        return self.__seconds
+
+    def __len__(self) -> int:
+        """Return the number of samples currently in the window."""
+        self.__evict_expired()
+        return len(self.__samples)
+
+    def add(self, timestamp: float, value: float) -> bool:
+        """
+        Add a sample and evict all samples that left the window.
+
+        samples that are not newer than the latest sample are ignored.
+        :returns: True if the sample was added
+        """
+        if self.__latest is not None and timestamp <= self.__latest:
+            return False
+
+        self.__latest = timestamp
+        self.__added_at = self.__clock()
+
+        sample = (timestamp, value)
+        self.__samples.append(sample)
+        self.__sum += value
+
+        while len(self.__min) > 0 and self.__min[-1][1] >= value:
+            self.__min.pop()
+        self.__min.append(sample)
+
+        while len(self.__max) > 0 and self.__max[-1][1] <= value:
+            self.__max.pop()
+        self.__max.append(sample)
+
+        self.__evict(timestamp)
+
+        self.__adds_since_resum += 1
+        if self.__adds_since_resum >= ROLLING_WINDOW_RESUM_INTERVAL:
+            self.__sum = math.fsum(v for _, v in self.__samples)
+            self.__adds_since_resum = 0
+
+        return True
+
+    @property
+    def mean(self) -> float | None:
+        """Mean of the samples in the window."""
+        self.__evict_expired()
+        if len(self.__samples) == 0:
+            return None
+        return self.__sum / len(self.__samples)
+
+    @property
+    def minimum(self) -> float | None:
+        """Minimum of the samples in the window."""
+        self.__evict_expired()
+        return self.__min[0][1] if len(self.__min) > 0 else None
+
+    @property
+    def maximum(self) -> float | None:
+        """Maximum of the samples in the window."""
+        self.__evict_expired()
+        return self.__max[0][1] if len(self.__max) > 0 else None
+
+    def __evict_expired(self) -> None:
+        """Evict all samples that left the window by now."""
+        if self.__latest is not None:
+            self.__evict(self.__latest + max(0.0, self.__clock() - self.__added_at))
+
+    def __evict(self, end: float) -> None:
+        """Evict all samples that are older than a window ending at a time."""
+        start = end - self.__seconds
+        while len(self.__samples) > 0 and self.__samples[0][0] < start:
+            old = self.__samples.popleft()
+            self.__sum -= old[1]
+            if self.__min[0] is old:
+                self.__min.popleft()
+            if self.__max[0] is old:
+                self.__max.popleft()
+
+        if len(self.__samples) == 0:
+            # nothing left to round
+            self.__sum = 0.0
+
+
+class _AggregatedChannel:
+    """aggregation state of a single channel."""
+
+    __slots__ = (
+        "count",
+        "latest_time",
+        "latest_value",
+        "maximum",
+        "minimum",
+        "sum",
+    )
+
+    def __init__(self) -> None:
+        """Initialize empty aggregation."""
+        self.latest_time: str | None = None
+        self.latest_value: SMAValue | None = None
+        self.count = 0
+        self.sum = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, sample: TimeValuePair) -> None:
+        """Add a sample, ignoring samples seen before."""
+        if sample.time == self.latest_time:
+            return
+
+        self.latest_time = sample.time
+        self.latest_value = sample.value
+
+        value = value_to_float(sample.value)
+        if value is not None:
+            self.count += 1
+            self.sum += value
+            self.minimum = min(self.minimum, value)
+            self.maximum = max(self.maximum, value)
+
+    def value(self, aggregation: SMAAggregation) -> SMAValue | None:
+        """Get the aggregated value."""
+        if aggregation == SMAAggregation.LATEST or self.count == 0:
+            return self.latest_value
+        if aggregation == SMAAggregation.MINIMUM:
+            return self.minimum
+        if aggregation == SMAAggregation.MAXIMUM:
+            return self.maximum
+
+        # SMAAggregation.MEAN
+        return self.sum / self.count
+
+
+class SampleAggregator:
+    """
+    aggregates the channel values of multiple samples into one value per channel.
+
+    used when sampling the device faster than publishing values to home assistant.
+    memory use is constant per channel, regardless of the number of samples.
+    """
+
+    __aggregation_for: Callable[[str], SMAAggregation]
+    __channels: dict[tuple[str, str], _AggregatedChannel]
+
+    def __init__(self, aggregation_for: Callable[[str], SMAAggregation]) -> None:
+        """
+        Initialize aggregator.
+
+        :param aggregation_for: function to get the aggregation of a channel id
+        """
+        self.__aggregation_for = aggregation_for
+        self.__channels = {}
+
+    def __len__(self) -> int:
+        """Return the number of channels with samples."""
+        return len(self.__channels)
+
+    def add(self, measurements: list[ChannelValues]) -> None:
+        """Add all values of a sample."""
+        for channel_values in measurements:
+            key = (channel_values.component_id, channel_values.channel_id)
+            channel = self.__channels.get(key)
+            if channel is None:
+                channel = self.__channels[key] = _AggregatedChannel()
+
+            for tvp in channel_values.values:
+                channel.add(tvp)
+
+    def flush(self) -> list[ChannelValues]:
+        """Get the aggregated values of all channels, and reset the aggregation."""
+        aggregated = [
+            ChannelValues(
+                component_id=component_id,
+                channel_id=channel_id,
+                values=[
+                    TimeValuePair(
+                        time=channel.latest_time,
+                        value=channel.value(self.__aggregation_for(channel_id)),
+                    )
+                ]
+                if channel.latest_time is not None
+                else [],
+            )
+            for (component_id, channel_id), channel in self.__channels.items()
+        ]
+
+        self.__channels = {}
+        return aggregated
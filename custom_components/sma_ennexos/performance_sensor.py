@@ -0,0 +1,168 @@
+"""Diagnostic sensors for the performance of the SMA ennexOS integration itself."""
+
+from __future__ import annotations
+
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.typing import StateType
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .base_entity import component_device_info
+from .const import LOGGER
+from .coordinator import SMADataCoordinator
+from .sma.metrics import SMAClientMetrics
+
+# endpoint the live measurements are polled from
+MEASUREMENTS_ENDPOINT = SMAClientMetrics.endpoint_key("POST", "measurements/live")
+
+
+@dataclass(frozen=True, kw_only=True)
+class SMAPerformanceSensorEntityDescription(SensorEntityDescription):
+    """description of a performance sensor."""
+
+    # reads the value from the metrics the coordinator and client collect anyway,
+    # so performance sensors never cause extra requests to the device
+    value_fn: Callable[[SMADataCoordinator], StateType]
+
+
+def __ms(seconds: float | None) -> float | None:
+    """Convert seconds to milliseconds."""
+    return round(seconds * 1000, 1) if seconds is not None else None
+
+
+def __measurements_payload_size(coordinator: SMADataCoordinator) -> int | None:
+    """Size of the most recent live measurements response, as reported by the device."""
+    trace = coordinator.client.metrics.latest_trace(MEASUREMENTS_ENDPOINT)
+    return trace.response_bytes if trace is not None else None
+
+
+PERFORMANCE_SENSORS: tuple[SMAPerformanceSensorEntityDescription, ...] = (
+    SMAPerformanceSensorEntityDescription(
+        key="update_duration",
+        translation_key="performance_update_duration",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        value_fn=lambda coordinator: __ms(coordinator.update_durations.latest),
+    ),
+    SMAPerformanceSensorEntityDescription(
+        key="request_latency",
+        translation_key="performance_request_latency",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        # median of the recent requests, so single slow requests don't dominate
+        value_fn=lambda coordinator: __ms(
+            coordinator.client.metrics.request_durations.percentile(50)
+        ),
+    ),
+    SMAPerformanceSensorEntityDescription(
+        key="payload_size",
+        translation_key="performance_payload_size",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        value_fn=__measurements_payload_size,
+    ),
+    SMAPerformanceSensorEntityDescription(
+        key="polled_channels",
+        translation_key="performance_polled_channels",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: coordinator.polled_channels,
+    ),
+    SMAPerformanceSensorEntityDescription(
+        key="failed_requests",
+        translation_key="performance_failed_requests",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.client.metrics.error_count,
+    ),
+    SMAPerformanceSensorEntityDescription(
+        key="request_retries",
+        translation_key="performance_request_retries",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.client.metrics.retries,
+    ),
+    SMAPerformanceSensorEntityDescription(
+        key="reauths",
+        translation_key="performance_reauths",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.client.metrics.reauths,
+    ),
+    SMAPerformanceSensorEntityDescription(
+        key="token_expires_in",
+        translation_key="performance_token_expires_in",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        value_fn=lambda coordinator: coordinator.client.token_seconds_until_expiration,
+    ),
+)
+
+
+def create_performance_sensor_entities(
+    coordinator: SMADataCoordinator,
+) -> list[SMAPerformanceSensor]:
+    """Create the performance sensors of a config entry, on the device of the plant."""
+    plant = next(
+        (c for c in coordinator.all_components if c.component_type == "Plant"),
+        None,
+    )
+    if plant is None:
+        LOGGER.warning(
+            "cannot create performance sensors for %s: no plant component found",
+            coordinator.client.host,
+        )
+        return []
+
+    device_info = component_device_info(coordinator.config_entry, plant)
+    return [
+        SMAPerformanceSensor(coordinator, description, device_info)
+        for description in PERFORMANCE_SENSORS
+    ]
+
+
+class SMAPerformanceSensor(CoordinatorEntity[SMADataCoordinator], SensorEntity):
+    """sensor for a performance metric of the integration, updated with every poll."""
+
+    entity_description: SMAPerformanceSensorEntityDescription
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+        self,
+        coordinator: SMADataCoordinator,
+        description: SMAPerformanceSensorEntityDescription,
+        device_info: DeviceInfo,
+    ) -> None:
+        """Initialize performance sensor."""
+        # no coordinator context, so the sensor is not part of the measurements query
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_device_info = device_info
+        self._attr_unique_id = str(
+            uuid.uuid5(
+                uuid.NAMESPACE_X500,
+                f"{coordinator.config_entry.entry_id}performance.{description.key}",
+            )
+        )
+
+    @property
+    def available(self) -> bool:  # pyright: ignore[reportIncompatibleVariableOverride] -- FIXME Entity.available and CoordinatorEntity.available are defined incompatible
+        """Performance sensors are available even if updates fail, e.g. to count failed requests."""
+        return True
+
+    @property
+    def native_value(self) -> StateType:
+        """Current value of the metric."""
+        return self.entity_description.value_fn(self.coordinator)
@@ -3,6 +3,11 @@
 from __future__ import annotations
 
 import uuid
+from collections.abc import Mapping
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from types import MappingProxyType
+from typing import Any
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -24,24 +29,51 @@ from homeassistant.const import (
     UnitOfTime,
 )
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-
-from .base_entity import SMAEntity
-from .const import DOMAIN, LOGGER
+from homeassistant.util import dt as dt_util
+
+from .base_entity import SMAEntity, component_device_info
+from .const import (
+    DEADBANDS,
+    DEFAULT_DEADBAND,
+    DEFAULT_MAX_SILENCE_INTERVAL,
+    DEFAULT_PERFORMANCE_SENSORS,
+    DEFAULT_ROLLING_STATISTICS,
+    DOMAIN,
+    LOGGER,
+    OPT_DEADBAND,
+    OPT_MAX_SILENCE_INTERVAL,
+    OPT_PERFORMANCE_SENSORS,
+    OPT_ROLLING_STATISTICS,
+    ROLLING_STATISTICS_WINDOWS,
+)
 from .coordinator import SMADataCoordinator
+from .history import RollingWindow, sample_time_to_timestamp, value_to_float
+from .performance_sensor import create_performance_sensor_entities
 from .sma.known_channels import (
+    KNOWN_CHANNELS,
+    KnownChannelEntry,
     SMAChannelCategory,
     SMACumulativeMode,
     SMADeviceKind,
     SMAUnit,
     get_known_channel,
+    known_channel_key,
 )
-from .sma.model import ComponentInfo
+from .sma.log import SampledLogger
+from .sma.model import ChannelValues, ComponentInfo, SMAValue
 from .util import (
     channel_parts_to_entity_id,
     channel_to_translation_key,
 )
 
+# only one of every n entity updates is logged, as large plants update
+# thousands of entities on every poll
+UPDATE_LOG_SAMPLE_RATE = 100
+_UPDATE_LOGGER = SampledLogger(LOGGER, UPDATE_LOG_SAMPLE_RATE)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -57,57 +89,131 @@ async def async_setup_entry(
         )
         return
 
-    all_components = coordinator.all_components
-    all_measurements = coordinator.all_measurements
+    # channels that already have a entity, as (component_id, channel_id)
+    known_channels: set[tuple[str, str]] = set()
 
-    # create entities based on ChannelValues in coordinator.data
-    LOGGER.info(
-        "creating %s sensor entities, referencing %s components",
-        len(all_measurements),
-        len(all_components),
-    )
-    entities = []
-    for channel_value in all_measurements:
-        component_info = next(
-            (
-                comp
-                for comp in all_components
-                if comp.component_id == channel_value.component_id
-            ),
-            None,
+    @callback
+    def add_entities_for(measurements: list[ChannelValues]) -> None:
+        """Create entities for all channels that don't have one yet."""
+        entities = create_sensor_entities(
+            coordinator,
+            [
+                m
+                for m in measurements
+                if (m.component_id, m.channel_id) not in known_channels
+            ],
+        )
+        known_channels.update((e.component_id, e.channel_id) for e in entities)
+
+        LOGGER.info(
+            "creating %s sensor entities, referencing %s components",
+            len(entities),
+            len(coordinator.all_components),
+        )
+        async_add_entities(entities)
+
+    add_entities_for(coordinator.all_measurements)
+
+    if config_entry.options.get(OPT_PERFORMANCE_SENSORS, DEFAULT_PERFORMANCE_SENSORS):
+        async_add_entities(create_performance_sensor_entities(coordinator))
+
+    # channels discovered later are added without reloading
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, coordinator.signal_new_channels, add_entities_for
         )
+    )
+
+
+def create_sensor_entities(
+    coordinator: SMADataCoordinator, measurements: list[ChannelValues]
+) -> list[SMASensor]:
+    """
+    Create sensor entities for channels.
+
+    device info is computed once per component, and descriptors once per channel id.
+    """
+    components = coordinator.component_index
+    options = coordinator.config_entry.options
+    descriptors: dict[str, SMASensorDescriptor] = {}
+    device_infos: dict[str, DeviceInfo] = {}
+
+    entities: list[SMASensor] = []
+    for channel_value in measurements:
+        component_info = components.get(channel_value.component_id)
         if component_info is None:
             LOGGER.warning(
                 "no component info found for channel %s", channel_value.channel_id
             )
             continue
 
+        descriptor = descriptors.get(channel_value.channel_id)
+        if descriptor is None:
+            descriptor = descriptors[channel_value.channel_id] = describe_channel(
+                channel_value.channel_id, options, coordinator.channel_names
+            )
+
+        device_info = device_infos.get(component_info.component_id)
+        if device_info is None:
+            device_info = device_infos[component_info.component_id] = (
+                component_device_info(coordinator.config_entry, component_info)
+            )
+
         entities.append(
             SMASensor(
                 coordinator=coordinator,
                 channel_id=channel_value.channel_id,
                 component_info=component_info,
+                descriptor=descriptor,
+                device_info=device_info,
             )
         )
-    async_add_entities(entities)
+
+    return entities
+
+
+def rolling_statistics_attribute(statistic: str, window: timedelta) -> str:
+    """Get the state attribute name of a rolling statistic, e.g. 'mean_5min'."""
+    return f"{statistic}_{int(window.total_seconds() // 60)}min"
 
 
 class SMASensor(SMAEntity, SensorEntity):
     """SMA Sensor class."""
 
+    # rolling statistics change on every update, keep them out of the recorder
+    _unrecorded_attributes = frozenset(
+        rolling_statistics_attribute(statistic, window)
+        for windows in ROLLING_STATISTICS_WINDOWS.values()
+        for window in windows
+        for statistic in ("mean", "min", "max")
+    )
+
     coordinator: SMADataCoordinator
     component_id: str
     channel_id: str
 
+    known_channel: KnownChannelEntry | None = None
     enum_values: dict[int, str] | None = None
+    rolling_windows: list[tuple[timedelta, RollingWindow]] | None = None
+
+    deadband: float | None = None
+    max_silence_interval: timedelta = timedelta(minutes=DEFAULT_MAX_SILENCE_INTERVAL)
+    __last_write: tuple[SMAValue | None, bool, datetime] | None = None
 
     def __init__(
         self,
         coordinator: SMADataCoordinator,
         channel_id: str,
         component_info: ComponentInfo,
+        descriptor: SMASensorDescriptor | None = None,
+        device_info: DeviceInfo | None = None,
     ) -> None:
-        """Initialize SMA sensor."""
+        """
+        Initialize SMA sensor.
+
+        :param descriptor: description of the channel, created if not given
+        :param device_info: device info of the component, created if not given
+        """
         self.component_id = component_info.component_id
         self.channel_id = channel_id
 
@@ -142,28 +248,42 @@ class SMASensor(SMAEntity, SensorEntity):
             coordinator=coordinator,
             channel_id=channel_id,
             component_info=component_info,
+            device_info=device_info,
+        )
+        self.__set_description(
+            descriptor
+            if descriptor is not None
+            else describe_channel(
+                channel_id, coordinator.config_entry.options, coordinator.channel_names
+            )
         )
-        self.__set_description()
 
     @property
     def available(self) -> bool:  # pyright: ignore[reportIncompatibleVariableOverride] -- FIXME Entity.available and CoordinatorEntity.available are defined incompatible
         """Return if entity is available."""
         return SMAEntity.available.__get__(self)
 
+    async def async_added_to_hass(self) -> None:
+        """Take the initial state from the data already present in the coordinator."""
+        await super().async_added_to_hass()
+        if self.coordinator.data is not None:
+            self.__apply_coordinator_data()
+
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        data = self.coordinator.data
+        if self.__apply_coordinator_data():
+            super()._handle_coordinator_update()
+
+    def __apply_coordinator_data(self) -> bool:
+        """
+        Apply the current data of the coordinator to this sensor.
 
+        :returns: False if the update was skipped and should not be written.
+        """
         # find the ChannelValues of this sensor
-        channel_values = next(
-            (
-                ch_val
-                for ch_val in data
-                if ch_val.component_id == self.component_id
-                and ch_val.channel_id == self.channel_id
-            ),
-            None,
+        channel_values = self.coordinator.data_index.get(
+            (self.component_id, self.channel_id)
         )
 
         # get latest value
@@ -172,10 +292,15 @@ class SMASensor(SMAEntity, SensorEntity):
         )
 
         # check for fallback value in known_channels for None
-        if value is None:
-            known_channel = get_known_channel(self.channel_id)
-            if known_channel is not None:
-                value = known_channel.value_when_none
+        if value is None and self.known_channel is not None:
+            value = self.known_channel.value_when_none
+
+        # update rolling statistics
+        rolling_statistics = (
+            self.__update_rolling_statistics(channel_values)
+            if self.rolling_windows is not None
+            else None
+        )
 
         # handle enum value
         if self.enum_values is not None:
@@ -194,94 +319,277 @@ class SMASensor(SMAEntity, SensorEntity):
                 )
                 value = None
 
+        # skip writing changes that are within the deadband
+        if self.__is_within_deadband(value):
+            _UPDATE_LOGGER.debug(
+                "skipped update of %s = %s, within deadband of %s",
+                self.entity_id,
+                value,
+                self.deadband,
+            )
+            return False
+
         # apply new value
-        LOGGER.debug("updated %s = %s (%s)", self.entity_id, value, type(value))
+        _UPDATE_LOGGER.debug("updated %s = %s (%s)", self.entity_id, value, type(value))
         self._attr_native_value = value
-
-        super()._handle_coordinator_update()
-
-    def __set_description(self) -> None:
-        """Set entity description using known channels."""
-        # get entry for known channel
-        known_channel = get_known_channel(self.channel_id)
-
-        # values set by known channel unit
-        icon = None
-        device_class = None
-        unit_of_measurement = None
-        state_class = SensorStateClass.MEASUREMENT
-        entity_category = None
-        suggested_display_precision = None
-        if known_channel is not None:
-            icon = self.__device_kind_to_icon(known_channel.device_kind)
-
-            (device_class, unit_of_measurement) = (
-                self.__channel_to_device_class_and_unit(
-                    self.channel_id, known_channel.unit
-                )
+        if rolling_statistics is not None:
+            self._attr_extra_state_attributes = rolling_statistics
+
+        self.__last_write = (value, self.available, dt_util.utcnow())
+        return True
+
+    def __is_within_deadband(self, value: SMAValue | None) -> bool:
+        """Check if a new value differs less than the deadband from the last written value."""
+        if self.deadband is None or self.__last_write is None:
+            return False
+
+        last_value, last_available, last_write_at = self.__last_write
+
+        # always write availability changes
+        if last_available != self.available:
+            return False
+
+        # write at least every max_silence_interval
+        if dt_util.utcnow() - last_write_at >= self.max_silence_interval:
+            return False
+
+        new_value = value_to_float(value)
+        last_value = value_to_float(last_value)
+        if new_value is None or last_value is None:
+            return False
+
+        return abs(new_value - last_value) < self.deadband
+
+    def __update_rolling_statistics(
+        self, channel_values: ChannelValues | None
+    ) -> dict[str, float | None]:
+        """Add the values of this update to the rolling windows, and get the statistics attributes."""
+        if self.rolling_windows is None:
+            return {}
+
+        attributes: dict[str, float | None] = {}
+        for window_size, window in self.rolling_windows:
+            if channel_values is not None:
+                for tvp in channel_values.values:
+                    value = value_to_float(tvp.value)
+                    if value is not None:
+                        window.add(sample_time_to_timestamp(tvp.time), value)
+
+            attributes[rolling_statistics_attribute("mean", window_size)] = window.mean
+            attributes[rolling_statistics_attribute("min", window_size)] = (
+                window.minimum
             )
-
-            state_class = self.__cumulative_mode_to_state_class(
-                known_channel.cumulative_mode
+            attributes[rolling_statistics_attribute("max", window_size)] = (
+                window.maximum
             )
 
-            suggested_display_precision = self.__unit_to_display_precision(
-                known_channel.unit
-            )
+        return attributes
 
-            entity_category = (
-                EntityCategory.DIAGNOSTIC
-                if known_channel.category == SMAChannelCategory.DIAGNOSTIC
-                else None
-            )
+    def __set_description(self, descriptor: SMASensorDescriptor) -> None:
+        """Set entity description from the descriptor of the channel."""
+        self.known_channel = descriptor.known_channel
+        self.entity_description = descriptor.entity_description
 
-            # set enum_values if known channel is UNIT_ENUM
-            if known_channel.unit == SMAUnit.ENUM:
-                self.enum_values = known_channel.enum_values
-                if self.enum_values is None:
-                    LOGGER.warning(
-                        "unit ENUM set, but enum_values is None: %s", self.channel_id
-                    )
-                    self.enum_values = {}
-
-                # for enum sensors, options attribute should be a list of
-                # all possible values
-                self._attr_options = list(self.enum_values.values())
-
-            # device class ENUM requires state class to be None
-            if device_class == SensorDeviceClass.ENUM:
-                state_class = None
-
-            LOGGER.debug(
-                "configuring %s@%s using known channel:"
-                "icon=%s, device_class=%s, unit_of_measurement=%s, state_class=%s, entity_category=%s, suggested_display_precision=%s",
-                self.component_id,
-                self.channel_id,
-                icon,
-                device_class,
-                unit_of_measurement,
-                state_class,
-                entity_category,
-                suggested_display_precision,
-            )
-        else:
-            LOGGER.debug(
-                "configuring %s@%s as generic sensor",
-                self.component_id,
-                self.channel_id,
-            )
+        # required for using translation_key
+        self._attr_has_entity_name = descriptor.has_entity_name
+
+        if descriptor.enum_values is not None:
+            self.enum_values = descriptor.enum_values
+
+            # for enum sensors, options attribute should be a list of
+            # all possible values
+            self._attr_options = list(self.enum_values.values())
+
+        # rolling windows keep per-entity state
+        if len(descriptor.rolling_windows) > 0:
+            self.rolling_windows = [
+                (window, RollingWindow(window.total_seconds()))
+                for window in descriptor.rolling_windows
+            ]
+
+        if descriptor.deadband is not None:
+            self.deadband = descriptor.deadband
+            self.max_silence_interval = descriptor.max_silence_interval
+
+
+@dataclass(frozen=True, slots=True)
+class SMASensorDescriptor:
+    """
+    description of a channel, shared by all sensors of that channel id.
+
+    descriptors of known channels are compiled at import, see _KNOWN_CHANNEL_DESCRIPTORS.
+    """
+
+    known_channel: KnownChannelEntry | None
+    entity_description: SensorEntityDescription
+    has_entity_name: bool
+    enum_values: dict[int, str] | None = None
+    rolling_windows: tuple[timedelta, ...] = ()
+    deadband: float | None = None
+    max_silence_interval: timedelta = timedelta(minutes=DEFAULT_MAX_SILENCE_INTERVAL)
+
+
+def describe_channel(
+    channel_id: str,
+    options: Mapping[str, Any],
+    channel_names: Mapping[str, str] | None = None,
+) -> SMASensorDescriptor:
+    """
+    Describe a channel using known channels.
+
+    known channels are looked up in the precompiled descriptor table,
+    only unknown channels are described on the fly.
+    :param channel_id: id of the channel
+    :param options: options of the config entry
+    :param channel_names: names localized by the device, by channel id without array index.
+    used to name unknown channels.
+    """
+    # get entry for known channel
+    known_channel = get_known_channel(channel_id)
+
+    descriptor = None
+    if known_channel is not None:
+        descriptor = _KNOWN_CHANNEL_DESCRIPTORS.get(known_channel_key(channel_id))
+
+    if descriptor is None:
+        descriptor = _compile_descriptor(
+            channel_id,
+            known_channel,
+            _localized_channel_name(channel_id, channel_names)
+            if known_channel is None and channel_names
+            else None,
+        )
+        LOGGER.debug(
+            "configuring %s as %s",
+            channel_id,
+            "known channel" if known_channel is not None else "generic sensor",
+        )
+
+    return _apply_options(descriptor, options)
+
+
+def _apply_options(
+    descriptor: SMASensorDescriptor, options: Mapping[str, Any]
+) -> SMASensorDescriptor:
+    """
+    Apply the options of the config entry to a compiled descriptor.
+
+    compiled descriptors contain the rolling windows and deadband the channel
+    supports, these are only kept if enabled in the options.
+    """
+    rolling_windows = (
+        descriptor.rolling_windows
+        if options.get(OPT_ROLLING_STATISTICS, DEFAULT_ROLLING_STATISTICS)
+        else ()
+    )
+
+    deadband = None
+    max_silence_interval = descriptor.max_silence_interval
+    if options.get(OPT_DEADBAND, DEFAULT_DEADBAND):
+        deadband = descriptor.deadband
+        max_silence_interval = timedelta(
+            minutes=options.get(OPT_MAX_SILENCE_INTERVAL, DEFAULT_MAX_SILENCE_INTERVAL)
+        )
+
+    if (
+        rolling_windows == descriptor.rolling_windows
+        and deadband == descriptor.deadband
+        and max_silence_interval == descriptor.max_silence_interval
+    ):
+        return descriptor
+
+    return replace(
+        descriptor,
+        rolling_windows=rolling_windows,
+        deadband=deadband,
+        max_silence_interval=max_silence_interval,
+    )
+
+
+def _localized_channel_name(
+    channel_id: str, channel_names: Mapping[str, str]
+) -> str | None:
+    """Name of a channel localized by the device, with the array index appended."""
+    if not channel_id.endswith("]"):
+        return channel_names.get(channel_id)
+
+    bracket_start = channel_id.rfind("[")
+    name = channel_names.get(channel_id[0:bracket_start])
+    return f"{name} {channel_id[bracket_start:]}" if name is not None else None
+
+
+def _compile_descriptor(
+    channel_id: str,
+    known_channel: KnownChannelEntry | None,
+    localized_name: str | None = None,
+) -> SMASensorDescriptor:
+    """
+    Compile the descriptor of a channel, independent of any options.
+
+    :param channel_id: id of the channel, or key of the known channel
+    :param known_channel: known channel entry, None for unknown channels
+    :param localized_name: name localized by the device, used for unknown channels
+    """
+    # values set by known channel unit
+    icon = None
+    device_class = None
+    unit_of_measurement = None
+    state_class = SensorStateClass.MEASUREMENT
+    entity_category = None
+    suggested_display_precision = None
+    enum_values = None
+    rolling_windows: tuple[timedelta, ...] = ()
+    deadband = None
+    if known_channel is not None:
+        icon = _device_kind_to_icon(known_channel.device_kind)
+
+        (device_class, unit_of_measurement) = _channel_to_device_class_and_unit(
+            channel_id, known_channel.unit
+        )
+
+        state_class = _cumulative_mode_to_state_class(known_channel.cumulative_mode)
+
+        suggested_display_precision = _unit_to_display_precision(known_channel.unit)
 
-        # assume all channels in known_channels have a translation.
-        # if a sensor is setup with a translation key that does not exist, the UI will show 'None'.
-        # this setup makes it so any known channel will show with a nice translation, and any
-        # unknown channel will show the SMA channel id as its name, with the option for the user to rename it.
-        is_known_channel = known_channel is not None
-        translation_key = channel_to_translation_key(self.channel_id)
+        entity_category = (
+            EntityCategory.DIAGNOSTIC
+            if known_channel.category == SMAChannelCategory.DIAGNOSTIC
+            else None
+        )
 
-        self.entity_description = SensorEntityDescription(
+        # set enum_values if known channel is UNIT_ENUM
+        if known_channel.unit == SMAUnit.ENUM:
+            enum_values = known_channel.enum_values
+            if enum_values is None:
+                LOGGER.warning("unit ENUM set, but enum_values is None: %s", channel_id)
+                enum_values = {}
+
+        # device class ENUM requires state class to be None
+        if device_class == SensorDeviceClass.ENUM:
+            state_class = None
+
+        # rolling statistics and deadband only apply to numeric measurements
+        if state_class == SensorStateClass.MEASUREMENT:
+            if known_channel.unit != SMAUnit.ENUM:
+                rolling_windows = ROLLING_STATISTICS_WINDOWS.get(
+                    known_channel.category, ()
+                )
+            deadband = DEADBANDS.get(known_channel.unit)
+
+    # assume all channels in known_channels have a translation.
+    # if a sensor is setup with a translation key that does not exist, the UI will show 'None'.
+    # this setup makes it so any known channel will show with a nice translation, and any
+    # unknown channel will show the name localized by the device, or the SMA channel id if there is none,
+    # with the option for the user to rename it.
+    is_known_channel = known_channel is not None
+    translation_key = channel_to_translation_key(channel_id)
+
+    return SMASensorDescriptor(
+        known_channel=known_channel,
+        entity_description=SensorEntityDescription(
             key=translation_key,
             translation_key=translation_key if is_known_channel else None,
-            name=self.channel_id if not is_known_channel else None,
+            name=None if is_known_channel else (localized_name or channel_id),
             icon=icon,
             device_class=device_class,
             native_unit_of_measurement=unit_of_measurement,
@@ -289,112 +597,129 @@ class SMASensor(SMAEntity, SensorEntity):
             suggested_display_precision=suggested_display_precision,
             entity_registry_enabled_default=is_known_channel,
             entity_category=entity_category,
-        )
+        ),
+        # localized names are prefixed with the device name, like translations
+        has_entity_name=is_known_channel or localized_name is not None,
+        enum_values=enum_values,
+        rolling_windows=rolling_windows,
+        deadband=deadband,
+    )
 
-        # required for using translation_key
-        self._attr_has_entity_name = is_known_channel
-
-    def __device_kind_to_icon(self, device_kind: SMADeviceKind) -> str:
-        """SMADeviceKind to mdi icon."""
-        if device_kind == SMADeviceKind.GRID:
-            return "mdi:transmission-tower"
-        if device_kind == SMADeviceKind.BATTERY:
-            return "mdi:battery"
-        if device_kind == SMADeviceKind.PV:
-            return "mdi:solar-panel"
-
-        # SMADeviceKind.OTHER
-        return "mdi:flash"
-
-    def __channel_to_device_class_and_unit(
-        self, channel_id: str, channel_unit: SMAUnit
-    ) -> tuple[SensorDeviceClass | None, str | None]:
-        """
-        SMAUnit to device_class and unit_of_measurement.
 
-        :return: (device_class, unit_of_measurement):
-            device_class is None for where no device_class is available
-            unit_of_measurement is None for plain numbers without unit
-        """
-        # special handling:
-        if channel_id == "Measurement.Bat.ChaStt":
-            # battery SoC has its own device class
-            return (SensorDeviceClass.BATTERY, PERCENTAGE)
-        if channel_id == "Measurement.Bat.Diag.StatTm":
-            # battery operating time is overwritten to device class DURATION
-            return (SensorDeviceClass.DURATION, UnitOfTime.SECONDS)
-
-        # handle by channel unit
-        if channel_unit == SMAUnit.VOLT:
-            return (SensorDeviceClass.VOLTAGE, UnitOfElectricPotential.VOLT)
-        if channel_unit == SMAUnit.AMPERE:
-            return (SensorDeviceClass.CURRENT, UnitOfElectricCurrent.AMPERE)
-        if channel_unit == SMAUnit.WATT:
-            return (SensorDeviceClass.POWER, UnitOfPower.WATT)
-        if channel_unit == SMAUnit.WATT_HOUR:
-            return (SensorDeviceClass.ENERGY, UnitOfEnergy.WATT_HOUR)
-        if channel_unit == SMAUnit.CELSIUS:
-            return (SensorDeviceClass.TEMPERATURE, UnitOfTemperature.CELSIUS)
-        if channel_unit == SMAUnit.HERTZ:
-            return (SensorDeviceClass.FREQUENCY, UnitOfFrequency.HERTZ)
-        if channel_unit == SMAUnit.VOLT_AMPERE_REACTIVE:
-            return (
-                SensorDeviceClass.REACTIVE_POWER,
-                UnitOfReactivePower.VOLT_AMPERE_REACTIVE,
-            )
-        if channel_unit == SMAUnit.SECONDS:
-            return (None, UnitOfTime.SECONDS)
-        if channel_unit == SMAUnit.PERCENT:
-            return (None, PERCENTAGE)
-        if channel_unit == SMAUnit.POWER_FACTOR:
-            return (SensorDeviceClass.POWER_FACTOR, None)
-        if channel_unit == SMAUnit.ENUM:
-            return (SensorDeviceClass.ENUM, None)
-
-        # fallback to PLAIN_NUMBER
-        return (None, None)
-
-    def __cumulative_mode_to_state_class(
-        self, cumulative_mode: SMACumulativeMode | None
-    ) -> SensorStateClass:
-        """SMACumulativeMode to SensorStateClass."""
-        # counters only ever increase
-        if cumulative_mode == SMACumulativeMode.COUNTER:
-            return SensorStateClass.TOTAL_INCREASING
-
-        # total only ever increases
-        if cumulative_mode == SMACumulativeMode.TOTAL:
-            return SensorStateClass.TOTAL_INCREASING
-
-        # min / max are modeled as TOTAL, since minimum can decrease
-        if cumulative_mode == SMACumulativeMode.MINIMUM:
-            return SensorStateClass.TOTAL
-        if cumulative_mode == SMACumulativeMode.MAXIMUM:
-            return SensorStateClass.TOTAL
-
-        return SensorStateClass.MEASUREMENT
-
-    def __unit_to_display_precision(self, unit: SMAUnit) -> int | None:
-        """SMAUnit to display precision."""
-        if (
-            unit == SMAUnit.VOLT
-            or unit == SMAUnit.AMPERE
-            or unit == SMAUnit.WATT
-            or unit == SMAUnit.WATT_HOUR
-            or unit == SMAUnit.HERTZ
-            or unit == SMAUnit.VOLT_AMPERE_REACTIVE
-            or unit == SMAUnit.SECONDS
-        ):
-            # display no decimal places
-            return 0
-
-        if unit == SMAUnit.CELSIUS:
-            # display one decimal place
-            return 1
-
-        if unit == SMAUnit.PERCENT or unit == SMAUnit.POWER_FACTOR:
-            # display two decimal places
-            return 2
-
-        # PLAIN_NUMBER or ENUM
-        return None
+def _device_kind_to_icon(device_kind: SMADeviceKind) -> str:
+    """SMADeviceKind to mdi icon."""
+    if device_kind == SMADeviceKind.GRID:
+        return "mdi:transmission-tower"
+    if device_kind == SMADeviceKind.BATTERY:
+        return "mdi:battery"
+    if device_kind == SMADeviceKind.PV:
+        return "mdi:solar-panel"
+
+    # SMADeviceKind.OTHER
+    return "mdi:flash"
+
+
+def _channel_to_device_class_and_unit(
+    channel_id: str, channel_unit: SMAUnit
+) -> tuple[SensorDeviceClass | None, str | None]:
+    """
+    SMAUnit to device_class and unit_of_measurement.
+
+    :return: (device_class, unit_of_measurement):
+        device_class is None for where no device_class is available
+        unit_of_measurement is None for plain numbers without unit
+    """
+    # special handling:
+    if channel_id == "Measurement.Bat.ChaStt":
+        # battery SoC has its own device class
+        return (SensorDeviceClass.BATTERY, PERCENTAGE)
+    if channel_id == "Measurement.Bat.Diag.StatTm":
+        # battery operating time is overwritten to device class DURATION
+        return (SensorDeviceClass.DURATION, UnitOfTime.SECONDS)
+
+    # handle by channel unit
+    if channel_unit == SMAUnit.VOLT:
+        return (SensorDeviceClass.VOLTAGE, UnitOfElectricPotential.VOLT)
+    if channel_unit == SMAUnit.AMPERE:
+        return (SensorDeviceClass.CURRENT, UnitOfElectricCurrent.AMPERE)
+    if channel_unit == SMAUnit.WATT:
+        return (SensorDeviceClass.POWER, UnitOfPower.WATT)
+    if channel_unit == SMAUnit.WATT_HOUR:
+        return (SensorDeviceClass.ENERGY, UnitOfEnergy.WATT_HOUR)
+    if channel_unit == SMAUnit.CELSIUS:
+        return (SensorDeviceClass.TEMPERATURE, UnitOfTemperature.CELSIUS)
+    if channel_unit == SMAUnit.HERTZ:
+        return (SensorDeviceClass.FREQUENCY, UnitOfFrequency.HERTZ)
+    if channel_unit == SMAUnit.VOLT_AMPERE_REACTIVE:
+        return (
+            SensorDeviceClass.REACTIVE_POWER,
+            UnitOfReactivePower.VOLT_AMPERE_REACTIVE,
+        )
+    if channel_unit == SMAUnit.SECONDS:
+        return (None, UnitOfTime.SECONDS)
+    if channel_unit == SMAUnit.PERCENT:
+        return (None, PERCENTAGE)
+    if channel_unit == SMAUnit.POWER_FACTOR:
+        return (SensorDeviceClass.POWER_FACTOR, None)
+    if channel_unit == SMAUnit.ENUM:
+        return (SensorDeviceClass.ENUM, None)
+
+    # fallback to PLAIN_NUMBER
+    return (None, None)
+
+
+def _cumulative_mode_to_state_class(
+    cumulative_mode: SMACumulativeMode | None,
+) -> SensorStateClass:
+    """SMACumulativeMode to SensorStateClass."""
+    # counters only ever increase
+    if cumulative_mode == SMACumulativeMode.COUNTER:
+        return SensorStateClass.TOTAL_INCREASING
+
+    # total only ever increases
+    if cumulative_mode == SMACumulativeMode.TOTAL:
+        return SensorStateClass.TOTAL_INCREASING
+
+    # min / max are modeled as TOTAL, since minimum can decrease
+    if cumulative_mode == SMACumulativeMode.MINIMUM:
+        return SensorStateClass.TOTAL
+    if cumulative_mode == SMACumulativeMode.MAXIMUM:
+        return SensorStateClass.TOTAL
+
+    return SensorStateClass.MEASUREMENT
+
+
+def _unit_to_display_precision(unit: SMAUnit) -> int | None:
+    """SMAUnit to display precision."""
+    if (
+        unit == SMAUnit.VOLT
+        or unit == SMAUnit.AMPERE
+        or unit == SMAUnit.WATT
+        or unit == SMAUnit.WATT_HOUR
+        or unit == SMAUnit.HERTZ
+        or unit == SMAUnit.VOLT_AMPERE_REACTIVE
+        or unit == SMAUnit.SECONDS
+    ):
+        # display no decimal places
+        return 0
+
+    if unit == SMAUnit.CELSIUS:
+        # display one decimal place
+        return 1
+
+    if unit == SMAUnit.PERCENT or unit == SMAUnit.POWER_FACTOR:
+        # display two decimal places
+        return 2
+
+    # PLAIN_NUMBER or ENUM
+    return None
+
+
+# descriptors of all known channels, compiled once at import.
+# keyed by known channel key, so array channels share the descriptor of their '[]' entry.
+_KNOWN_CHANNEL_DESCRIPTORS: Mapping[str, SMASensorDescriptor] = MappingProxyType(
+    {
+        key: _compile_descriptor(key, known_channel)
+        for key, known_channel in KNOWN_CHANNELS.items()
+    }
+)
@@ -2,18 +2,25 @@
 
 from __future__ import annotations
 
+import asyncio
 import contextlib
 import json
-import re
+import time
+from collections.abc import Callable
 from datetime import timedelta
 from enum import Enum
 from itertools import chain
 from logging import Logger
+from pathlib import Path
 from urllib.parse import quote
 
 import aiohttp
 
+from custom_components.sma_ennexos.sma.log import LazyLogger
+from custom_components.sma_ennexos.sma.metrics import SMAClientMetrics
 from custom_components.sma_ennexos.sma.session import SMAClientSession
+from custom_components.sma_ennexos.sma.tracing import span
+from custom_components.sma_ennexos.sma.watchdog import LoopBlockWatchdog
 
 from .model import (
     AuthToken,
@@ -21,6 +28,8 @@ from .model import (
     ComponentInfo,
     LiveMeasurementQueryItem,
     SMAApiClientError,
+    SMAApiCommunicationError,
+    SMAApiParsingError,
 )
 
 
@@ -32,12 +41,20 @@ class LoginResult(str, Enum):
     NEW_TOKEN = "new_token"  # noqa: S105
 
 
+# measurements responses of at least this many bytes are parsed in a executor thread
+DEFAULT_EXECUTOR_PARSE_SIZE = 256 * 1024
+
+
 class SMAApiClient:
     """API Client for SMA ennexOS devices."""
 
     __raw_session: aiohttp.ClientSession
     __session: SMAClientSession
-    __logger: Logger | None
+    __logger: LazyLogger
+    __metrics: SMAClientMetrics
+    __executor_parse_size: int | None
+    __watchdog: LoopBlockWatchdog | None
+    __login_listener: Callable[[LoginResult], None] | None
 
     __host_base_url: str
 
@@ -54,10 +71,20 @@ class SMAApiClient:
         request_timeout: float = 10.0,
         request_retries: int = 3,
         logger: Logger | None = None,
+        executor_parse_size: int | None = DEFAULT_EXECUTOR_PARSE_SIZE,
     ) -> None:
-        """SMA ennexOS API Client."""
+        """
+        SMA ennexOS API Client.
+
+        :param executor_parse_size: size of measurements responses to parse in a executor thread at,
+        in bytes. None to always parse on the event loop
+        """
         self.__raw_session = session
+        self.__executor_parse_size = executor_parse_size
+        self.__watchdog = None
+        self.__login_listener = None
         self.__host_base_url = f"{'https' if use_ssl else 'http'}://{host}"
+        self.__metrics = SMAClientMetrics()
 
         self.__session = SMAClientSession(
             session=session,
@@ -66,6 +93,7 @@ class SMAApiClient:
             timeout=request_timeout,
             retries=request_retries,
             logger=logger.getChild("session") if logger else None,
+            metrics=self.__metrics,
         )
 
         async def reauth_hook(endpoint: str) -> None:
@@ -82,24 +110,131 @@ class SMAApiClient:
         self.__username = username
         self.__password = password
 
-        self.__logger = logger
+        self.__logger = LazyLogger(logger)
 
     @property
     def host(self) -> str:
         """Hostname of the device the client is connected to."""
         return self.__session.host
 
+    @property
+    def token_seconds_until_expiration(self) -> int | None:
+        """Seconds until the current access token expires, None if not logged in."""
+        token = self.__session.token
+        return token.seconds_until_expiration if token is not None else None
+
+    @property
+    def metrics(self) -> SMAClientMetrics:
+        """Performance metrics of all requests made by the client."""
+        return self.__metrics
+
+    @property
+    def request_timeout(self) -> float | None:
+        """Timeout of a single request, in seconds."""
+        return self.__session.timeout
+
+    @request_timeout.setter
+    def request_timeout(self, timeout: float | None) -> None:
+        """Set the timeout of a single request, applies to the next request."""
+        self.__session.timeout = timeout
+
+    @property
+    def request_retries(self) -> int:
+        """Number of retries after a failed request."""
+        return self.__session.retries
+
+    @request_retries.setter
+    def request_retries(self, retries: int) -> None:
+        """Set the number of retries, applies to the next request."""
+        self.__session.retries = retries
+
+    @property
+    def executor_parse_size(self) -> int | None:
+        """Size of measurements responses to parse in a executor thread at, in bytes."""
+        return self.__executor_parse_size
+
+    @executor_parse_size.setter
+    def executor_parse_size(self, size: int | None) -> None:
+        """Set the size to parse in a executor thread at, None to always parse on the event loop."""
+        self.__executor_parse_size = size
+
+    @property
+    def watchdog(self) -> LoopBlockWatchdog | None:
+        """Watchdog measuring parsing on the event loop, if any."""
+        return self.__watchdog
+
+    @watchdog.setter
+    def watchdog(self, watchdog: LoopBlockWatchdog | None) -> None:
+        """Set the watchdog measuring parsing on the event loop."""
+        self.__watchdog = watchdog
+
+    @property
+    def login_listener(self) -> Callable[[LoginResult], None] | None:
+        """Listener called after every login that changed the session, if any."""
+        return self.__login_listener
+
+    @login_listener.setter
+    def login_listener(self, listener: Callable[[LoginResult], None] | None) -> None:
+        """Set the listener called after a new login or token refresh, e.g. to persist the session."""
+        self.__login_listener = listener
+
+    @property
+    def session_state(self) -> dict | None:
+        """
+        State of the current session, for persisting it.
+
+        :returns: session state, None if not logged in. can be restored using restore_session()
+        """
+        if self.__session.session_id is None or self.__session.token is None:
+            return None
+
+        return {
+            "session_id": self.__session.session_id,
+            "token": self.__session.token.to_dict(),
+        }
+
+    def restore_session(self, state: dict) -> None:
+        """
+        Restore a session previously persisted using session_state.
+
+        the next login() will re-use the session, refreshing the token if needed.
+        """
+        if not isinstance(state, dict):
+            raise SMAApiParsingError("session state is not a dict")
+        if not isinstance(state.get("session_id"), str):
+            raise SMAApiParsingError(
+                "field 'session_id' in session state is not a string"
+            )
+
+        token = AuthToken.from_dict(state.get("token"))  # type: ignore[arg-type]
+
+        self.__session.session_id = state["session_id"]
+        self.__session.token = token
+        self.__logger.debug("restored session")
+
     async def login(self) -> LoginResult:
         """
         Login to the api.
 
         :returns: login result, one of LOGIN_RESULT_* constants
         """
+        with span("login") as login_span:
+            result = await self.__login()
+            login_span.set_attribute("result", result.value)
+
+        if (
+            result != LoginResult.ALREADY_LOGGED_IN
+            and self.__login_listener is not None
+        ):
+            self.__login_listener(result)
+        return result
+
+    async def __login(self) -> LoginResult:
+        """Login to the api, see login()."""
         # if already logged in and token is still valid for at least 5 minutes, do nothing
         token = self.__session.token
         if token is not None and token.time_until_expiration > timedelta(minutes=5):
-            if self.__logger:
-                self.__logger.debug("already logged in, skipping login")
+            self.__logger.debug("already logged in, skipping login")
             return LoginResult.ALREADY_LOGGED_IN
 
         # if we have a session and refresh token, try refreshing the token
@@ -108,13 +243,11 @@ class SMAApiClient:
                 self.__session.token = await self.__refresh_token(
                     self.__session.token.refresh_token
                 )
-                if self.__logger:
-                    self.__logger.debug("refreshed token successfully")
+                self.__logger.debug("refreshed token successfully")
                 return LoginResult.TOKEN_REFRESHED
             except SMAApiClientError:
                 # refresh failed, try to re-login with username and password
-                if self.__logger:
-                    self.__logger.debug("failed to refresh token, trying to re-login")
+                self.__logger.debug("failed to refresh token, trying to re-login")
 
         # if all else fails, get a new token using username and password
         if self.__username is None or self.__password is None:
@@ -123,8 +256,7 @@ class SMAApiClient:
             self.__username, self.__password
         )
 
-        if self.__logger:
-            self.__logger.debug("got new token successfully")
+        self.__logger.debug("got new token successfully")
         return LoginResult.NEW_TOKEN
 
     async def __get_new_token(self, username: str, password: str) -> AuthToken:
@@ -176,8 +308,7 @@ class SMAApiClient:
 
     async def logout(self) -> None:
         """Logout from the api."""
-        if self.__logger:
-            self.__logger.debug("logging out")
+        self.__logger.debug("logging out")
 
         if self.__session.token is None:
             return
@@ -192,40 +323,72 @@ class SMAApiClient:
         self.__session.session_id = None
         self.__session.token = None
 
-    async def get_all_components(self) -> list[ComponentInfo]:
-        """Get a list of all available components and their ids."""
-
-        async def __get_navigation(
-            parent_id: str | None = None,
-        ) -> list[ComponentInfo]:
-            """Get data from /navigation endpoint."""
-            if self.__logger:
-                self.__logger.debug(f"getting navigation data for parent={parent_id}")
-
-            navigation_response = await self.__session.request(
-                method="GET",
-                endpoint="navigation"
-                + (f"?parentId={quote(parent_id)}" if parent_id else ""),
-                headers={
-                    "Accept": "application/json",
-                },
-                auth="full",
+    async def __get_navigation(
+        self,
+        parent_id: str | None = None,
+    ) -> list[ComponentInfo]:
+        """Get data from /navigation endpoint."""
+        self.__logger.debug("getting navigation data for parent=%s", parent_id)
+
+        navigation_response = await self.__session.request(
+            method="GET",
+            endpoint="navigation"
+            + (f"?parentId={quote(parent_id)}" if parent_id else ""),
+            headers={
+                "Accept": "application/json",
+            },
+            auth="full",
+        )
+
+        # check & validate response
+        navigation = await navigation_response.json()
+        if not isinstance(navigation, list):
+            raise SMAApiClientError("received invalid response: not a list")
+        return [ComponentInfo.from_dict(component) for component in navigation]
+
+    async def get_navigation(self) -> list[ComponentInfo]:
+        """
+        Get the root plant component and its children, without any extra info.
+
+        lightweight alternative to get_all_components(), e.g. to probe a device.
+        :returns: list of components, the root plant component first
+        """
+        # get root component, only consider the first one
+        root_components = await self.__get_navigation()
+        if len(root_components) == 0:
+            raise SMAApiClientError("received invalid response: no root component")
+        root_component = root_components[0]
+
+        # root component should be of type "Plant"
+        if root_component.component_type != "Plant":
+            raise SMAApiClientError(
+                "received invalid response: "
+                f"root componentType is not 'Plant' but '{root_component.component_type}'"
             )
 
-            # check & validate response
-            navigation = await navigation_response.json()
-            if not isinstance(navigation, list):
-                raise SMAApiClientError("received invalid response: not a list")
-            return [ComponentInfo.from_dict(component) for component in navigation]
+        # get all components that are children of the root component
+        child_components = await self.__get_navigation(
+            parent_id=root_component.component_id
+        )
+        return [root_component, *child_components]
+
+    async def get_all_components(
+        self, navigation: list[ComponentInfo] | None = None
+    ) -> list[ComponentInfo]:
+        """
+        Get a list of all available components and their ids.
+
+        :param navigation: result of a previous get_navigation() call to add extra info to,
+        None to get the navigation first
+        """
 
         async def __add_device_info(
             root_component: ComponentInfo, component: ComponentInfo
         ) -> None:
             """Get device info for a component."""
-            if self.__logger:
-                self.__logger.debug(
-                    f"getting device info for component={component.component_id}"
-                )
+            self.__logger.debug(
+                "getting device info for component=%s", component.component_id
+            )
 
             try:
                 device_info_response = await self.__session.request(
@@ -241,17 +404,17 @@ class SMAApiClient:
                 device_info = await device_info_response.json()
                 component.add_extra(device_info)
             except Exception as e:
-                if self.__logger:
-                    self.__logger.debug(
-                        f"error getting device info for component={component.component_id}: {e}"
-                    )
+                self.__logger.debug(
+                    "error getting device info for component=%s: %s",
+                    component.component_id,
+                    e,
+                )
 
         async def __add_widget_info(component: ComponentInfo) -> None:
             """Get extra info for a component."""
-            if self.__logger:
-                self.__logger.debug(
-                    f"getting widget info for component={component.component_id}"
-                )
+            self.__logger.debug(
+                "getting widget info for component=%s", component.component_id
+            )
 
             try:
                 device_info_response = await self.__session.request(
@@ -267,29 +430,16 @@ class SMAApiClient:
                 device_info = await device_info_response.json()
                 component.add_extra(device_info)
             except Exception as e:
-                if self.__logger:
-                    self.__logger.debug(
-                        f"error getting widget info for component={component.component_id}: {e}"
-                    )
-
-        # get root component, only consider the first one
-        root_components = await __get_navigation()
-        if len(root_components) == 0:
-            raise SMAApiClientError("received invalid response: no root component")
-        root_component = root_components[0]
-
-        # root component should be of type "Plant"
-        if root_component.component_type != "Plant":
-            raise SMAApiClientError(
-                "received invalid response: "
-                f"root componentType is not 'Plant' but '{root_component.component_type}'"
-            )
-
-        # get all components that are children of the root component
-        all_components = await __get_navigation(parent_id=root_component.component_id)
+                self.__logger.debug(
+                    "error getting widget info for component=%s: %s",
+                    component.component_id,
+                    e,
+                )
 
-        # build final list
-        all_components = [root_component] + all_components
+        all_components = (
+            navigation if navigation is not None else await self.get_navigation()
+        )
+        root_component = all_components[0]
 
         # add extra info to all components and return
         # (Plant components don't have extra info)
@@ -298,8 +448,7 @@ class SMAApiClient:
                 await __add_device_info(root_component, component)
                 await __add_widget_info(component)
 
-        if self.__logger:
-            self.__logger.debug(f"got {len(all_components)} components")
+        self.__logger.debug("got %s components", len(all_components))
         return all_components
 
     def get_product_icon_url(self, component: ComponentInfo) -> str | None:
@@ -323,8 +472,7 @@ class SMAApiClient:
             auth="full",
         )
 
-        measurements = await measurements_response.json()
-        return self.__parse_measurements(measurements)
+        return await self.__read_measurements(measurements_response)
 
     async def get_live_measurements(
         self, query: list[LiveMeasurementQueryItem]
@@ -341,11 +489,49 @@ class SMAApiClient:
             auth="full",
         )
 
-        measurements = await measurements_response.json()
-        return self.__parse_measurements(measurements)
+        return await self.__read_measurements(measurements_response)
+
+    async def __read_measurements(
+        self, response: aiohttp.ClientResponse
+    ) -> list[ChannelValues]:
+        """
+        Read and parse a measurements response.
+
+        the session already read the body, so it is not read again.
+        large responses are decoded and parsed in a executor thread, as that would
+        block the event loop for too long.
+        """
+        body = await response.read()
+
+        start = time.monotonic()
+        if (
+            self.__executor_parse_size is not None
+            and len(body) >= self.__executor_parse_size
+        ):
+            with span("parse", bytes=len(body), executor=True):
+                parsed = await asyncio.get_running_loop().run_in_executor(
+                    None, self.__parse_measurements, body
+                )
+        else:
+            with (
+                span("parse", bytes=len(body), executor=False),
+                self.__watchdog.measure("parse", bytes=len(body))
+                if self.__watchdog is not None
+                else contextlib.nullcontext(),
+            ):
+                parsed = self.__parse_measurements(body)
+
+        self.__metrics.record_parse("measurements", time.monotonic() - start)
+        return parsed
+
+    @staticmethod
+    def __parse_measurements(body: bytes) -> list[ChannelValues]:
+        """Convert raw measurements response to python model, safe to call from a executor thread."""
+        try:
+            measurements = json.loads(body)
+        except ValueError as e:
+            raise SMAApiParsingError(f"received invalid response: {e}") from e
 
-    def __parse_measurements(self, measurements: list[dict]) -> list[ChannelValues]:
-        """Convert raw measurements response to python model."""
         if not isinstance(measurements, list):
             raise SMAApiClientError("received invalid response: not a list")
 
@@ -358,65 +544,47 @@ class SMAApiClient:
         # flatten list of lists
         return list(chain.from_iterable(cvs))
 
-    async def get_localizations(self) -> list[tuple[str, dict]]:
+    async def get_localizations(
+        self, cache_dir: Path | None = None
+    ) -> list[tuple[str, dict]]:
         """
         Retrieve all available localizations from the device.
 
         Returns a list of localizations dictionaries.
         Each dictionary maps a message id to its localized string.
         A way to identify the language of each mapping is not provided.
+        :param cache_dir: directory to cache parsed localizations in, keyed by chunk hash
         """
-        # get landing page HTML
-        async with self.__raw_session.get(self.__host_base_url) as response:
-            response.raise_for_status()
-            html = await response.text()
-
-        # extract runtime.js script url
-        pattern = r'<script src="(runtime\.[\w]+\.js)"(?: type="module")?></script>'
-        match = re.search(pattern, html)
-        if not match:
-            raise SMAApiClientError("runtime.js module not found")
-
-        runtime_js_url = f"{self.__host_base_url}/webui/{match.group(1)}"
-
-        # get runtime.js
-        async with self.__raw_session.get(runtime_js_url) as response:
-            response.raise_for_status()
-            runtime_js = await response.text()
-
-        # extract mapping table for js files
-        pattern = r'"\."\+{((?:[a-z0-9]+:\"[a-z0-9]+\",?)+)}\[[a-z]\]\+".js"'
-        match = re.search(pattern, runtime_js)
-        if not match:
-            raise SMAApiClientError("JS file mapping table not found")
-
-        mapping_table = match.group(1)
-
-        # convert from js literal object to json
-        pattern = r"([a-z0-9]+):\"([a-z0-9]+)\",?"
-        replace_pattern = r'"\1":"\2",'
-        mapping_table = json.loads(
-            "{" + re.sub(pattern, replace_pattern, mapping_table).rstrip(",") + "}"
-        )
-
-        # load all js files and check them for localization data
-        localizations = []
-        for chunk_id, chunk_hash in mapping_table.items():
-            with contextlib.suppress(Exception):
-                async with self.__raw_session.get(
-                    f"{self.__host_base_url}/webui/{chunk_id}.{chunk_hash}.js"
-                ) as response:
-                    response.raise_for_status()
-                    js_content = await response.text()
-
-                pattern = r"\.exports=JSON\.parse\('(\{\"META\":.+)'\)"
-                match = re.search(pattern, js_content)
-                if not match:
-                    continue
+        # localization scraping is rarely used, so it is only loaded on first use
+        from .localization import LocalizationCache, fetch_localizations
+
+        try:
+            return await fetch_localizations(
+                self.__raw_session,
+                self.__host_base_url,
+                cache=LocalizationCache(cache_dir) if cache_dir is not None else None,
+            )
+        except (aiohttp.ClientError, TimeoutError) as exception:
+            raise SMAApiCommunicationError(
+                f"failed to get localizations: {exception}"
+            ) from exception
 
-                lang_data = match.group(1).encode().decode("unicode_escape")
-                lang_data = json.loads(lang_data)
+    async def get_localization_fingerprint(self) -> str:
+        """
+        Get a fingerprint of the localizations of the device.
 
-                localizations.append((f"{chunk_id}.{chunk_hash}.js", lang_data))
+        the fingerprint only changes if the localizations may have changed, e.g. after a firmware update.
+        only the chunk mapping table is retrieved, not the localizations themselves.
+        """
+        from .localization import chunk_mapping_fingerprint, fetch_chunk_mapping_table
 
-        return localizations
+        try:
+            return chunk_mapping_fingerprint(
+                await fetch_chunk_mapping_table(
+                    self.__raw_session, self.__host_base_url
+                )
+            )
+        except (aiohttp.ClientError, TimeoutError) as exception:
+            raise SMAApiCommunicationError(
+                f"failed to get localization fingerprint: {exception}"
+            ) from exception
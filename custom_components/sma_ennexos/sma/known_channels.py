@@ -1,8 +1,10 @@
 """SMA known channels."""
 
+from collections.abc import Mapping
+from dataclasses import dataclass
 from enum import Enum
-
-from attr import dataclass
+from functools import lru_cache
+from types import MappingProxyType
 
 from custom_components.sma_ennexos.sma.model import SMAValue
 
@@ -52,6 +54,22 @@ class SMACumulativeMode(str, Enum):
     MAXIMUM = "MAXIMUM"
 
 
+class SMAAggregation(str, Enum):
+    """SMA known channel aggregation of multiple samples into one value."""
+
+    # latest sample, e.g. for enums and counters
+    LATEST = "LATEST"
+
+    # mean of all samples, e.g. for power
+    MEAN = "MEAN"
+
+    # minimum of all samples
+    MINIMUM = "MINIMUM"
+
+    # maximum of all samples, e.g. for peak detection
+    MAXIMUM = "MAXIMUM"
+
+
 class SMAChannelCategory(str, Enum):
     """SMA known channel categories."""
 
@@ -113,6 +131,10 @@ class KnownChannelEntry:
     # for enum values, this is the numeric index
     value_when_none: SMAValue | None = None
 
+    # optional aggregation of samples when sampling faster than publishing.
+    # if not set, numeric measurements use MEAN and anything else uses LATEST
+    aggregation: SMAAggregation | None = None
+
 
 __KNOWN_CHANNELS: dict[
     str,
@@ -156,11 +178,13 @@ __KNOWN_CHANNELS: dict[
         device_kind=SMADeviceKind.BATTERY,
         unit=SMAUnit.WATT_HOUR,
         cumulative_mode=SMACumulativeMode.TOTAL,
+        aggregation=SMAAggregation.LATEST,
     ),
     "Measurement.Metering.GridMs.TotWhOut.Bat": KnownChannelEntry(
         device_kind=SMADeviceKind.BATTERY,
         unit=SMAUnit.WATT_HOUR,
         cumulative_mode=SMACumulativeMode.TOTAL,
+        aggregation=SMAAggregation.LATEST,
     ),
     "Measurement.Metering.PCCMs.PlntA.phsA": KnownChannelEntry(
         device_kind=SMADeviceKind.GRID,
@@ -181,6 +205,7 @@ __KNOWN_CHANNELS: dict[
         device_kind=SMADeviceKind.GRID,
         unit=SMAUnit.WATT_HOUR,
         cumulative_mode=SMACumulativeMode.TOTAL,
+        aggregation=SMAAggregation.LATEST,
     ),
     "Measurement.Metering.PCCMs.PlntPF": KnownChannelEntry(
         device_kind=SMADeviceKind.GRID,
@@ -234,11 +259,13 @@ __KNOWN_CHANNELS: dict[
         device_kind=SMADeviceKind.GRID,
         unit=SMAUnit.WATT_HOUR,
         cumulative_mode=SMACumulativeMode.TOTAL,
+        aggregation=SMAAggregation.LATEST,
     ),
     "Measurement.Metering.TotWhOut.Pv": KnownChannelEntry(
         device_kind=SMADeviceKind.PV,
         unit=SMAUnit.WATT_HOUR,
         cumulative_mode=SMACumulativeMode.TOTAL,
+        aggregation=SMAAggregation.LATEST,
     ),
     "Measurement.Operation.CurAvailPlnt": KnownChannelEntry(
         device_kind=SMADeviceKind.OTHER,
@@ -327,11 +354,13 @@ __KNOWN_CHANNELS: dict[
         device_kind=SMADeviceKind.GRID,
         unit=SMAUnit.WATT_HOUR,
         cumulative_mode=SMACumulativeMode.TOTAL,
+        aggregation=SMAAggregation.LATEST,
     ),
     "Measurement.Metering.GridMs.TotWhOut": KnownChannelEntry(
         device_kind=SMADeviceKind.GRID,
         unit=SMAUnit.WATT_HOUR,
         cumulative_mode=SMACumulativeMode.TOTAL,
+        aggregation=SMAAggregation.LATEST,
     ),
     "Measurement.Metering.GridMs.VA.phsA": KnownChannelEntry(
         device_kind=SMADeviceKind.GRID,
@@ -387,64 +416,75 @@ __KNOWN_CHANNELS: dict[
         device_kind=SMADeviceKind.BATTERY,
         unit=SMAUnit.AMPERE,
         category=SMAChannelCategory.DIAGNOSTIC,
+        aggregation=SMAAggregation.MAXIMUM,
     ),
     "Measurement.Bat.Diag.CntErrOvV": KnownChannelEntry(
         device_kind=SMADeviceKind.BATTERY,
         unit=SMAUnit.PLAIN_NUMBER,
         category=SMAChannelCategory.DIAGNOSTIC,
         cumulative_mode=SMACumulativeMode.COUNTER,
+        aggregation=SMAAggregation.LATEST,
     ),
     "Measurement.Bat.Diag.CntWrnOvV": KnownChannelEntry(
         device_kind=SMADeviceKind.BATTERY,
         unit=SMAUnit.PLAIN_NUMBER,
         category=SMAChannelCategory.DIAGNOSTIC,
         cumulative_mode=SMACumulativeMode.COUNTER,
+        aggregation=SMAAggregation.LATEST,
     ),
     "Measurement.Bat.Diag.CntWrnSOCLo": KnownChannelEntry(
         device_kind=SMADeviceKind.BATTERY,
         unit=SMAUnit.PLAIN_NUMBER,
         category=SMAChannelCategory.DIAGNOSTIC,
         cumulative_mode=SMACumulativeMode.COUNTER,
+        aggregation=SMAAggregation.LATEST,
     ),
     "Measurement.Bat.Diag.DschAMax": KnownChannelEntry(
         device_kind=SMADeviceKind.BATTERY,
         unit=SMAUnit.AMPERE,
         category=SMAChannelCategory.DIAGNOSTIC,
+        aggregation=SMAAggregation.MAXIMUM,
     ),
     "Measurement.Bat.Diag.StatTm": KnownChannelEntry(
         device_kind=SMADeviceKind.BATTERY,
         unit=SMAUnit.SECONDS,
         category=SMAChannelCategory.DIAGNOSTIC,
+        aggregation=SMAAggregation.LATEST,
     ),
     "Measurement.Bat.Diag.TmpValMax": KnownChannelEntry(
         device_kind=SMADeviceKind.BATTERY,
         unit=SMAUnit.CELSIUS,
         category=SMAChannelCategory.DIAGNOSTIC,
         cumulative_mode=SMACumulativeMode.MAXIMUM,
+        aggregation=SMAAggregation.MAXIMUM,
     ),
     "Measurement.Bat.Diag.TmpValMin": KnownChannelEntry(
         device_kind=SMADeviceKind.BATTERY,
         unit=SMAUnit.CELSIUS,
         category=SMAChannelCategory.DIAGNOSTIC,
         cumulative_mode=SMACumulativeMode.MINIMUM,
+        aggregation=SMAAggregation.MINIMUM,
     ),
     "Measurement.Bat.Diag.TotAhIn": KnownChannelEntry(
         device_kind=SMADeviceKind.BATTERY,
         unit=SMAUnit.AMPERE,
         category=SMAChannelCategory.DIAGNOSTIC,
         cumulative_mode=SMACumulativeMode.TOTAL,
+        aggregation=SMAAggregation.LATEST,
     ),
     "Measurement.Bat.Diag.TotAhOut": KnownChannelEntry(
         device_kind=SMADeviceKind.BATTERY,
         unit=SMAUnit.AMPERE,
         category=SMAChannelCategory.DIAGNOSTIC,
         cumulative_mode=SMACumulativeMode.TOTAL,
+        aggregation=SMAAggregation.LATEST,
     ),
     "Measurement.Bat.Diag.VolMax": KnownChannelEntry(
         device_kind=SMADeviceKind.BATTERY,
         unit=SMAUnit.VOLT,
         category=SMAChannelCategory.DIAGNOSTIC,
         cumulative_mode=SMACumulativeMode.MAXIMUM,
+        aggregation=SMAAggregation.MAXIMUM,
     ),
     "Measurement.Bat.TmpVal": KnownChannelEntry(
         device_kind=SMADeviceKind.BATTERY,
@@ -489,11 +529,13 @@ __KNOWN_CHANNELS: dict[
         device_kind=SMADeviceKind.GRID,
         unit=SMAUnit.HERTZ,
         cumulative_mode=SMACumulativeMode.MAXIMUM,
+        aggregation=SMAAggregation.MAXIMUM,
     ),
     "Measurement.ExtGridMs.HzMin": KnownChannelEntry(
         device_kind=SMADeviceKind.GRID,
         unit=SMAUnit.HERTZ,
         cumulative_mode=SMACumulativeMode.MINIMUM,
+        aggregation=SMAAggregation.MINIMUM,
     ),
     "Measurement.ExtGridMs.PhV.phsA": KnownChannelEntry(
         device_kind=SMADeviceKind.GRID,
@@ -524,11 +566,13 @@ __KNOWN_CHANNELS: dict[
         device_kind=SMADeviceKind.GRID,
         unit=SMAUnit.WATT_HOUR,
         cumulative_mode=SMACumulativeMode.TOTAL,
+        aggregation=SMAAggregation.LATEST,
     ),
     "Measurement.ExtGridMs.TotWhOut": KnownChannelEntry(
         device_kind=SMADeviceKind.GRID,
         unit=SMAUnit.WATT_HOUR,
         cumulative_mode=SMACumulativeMode.TOTAL,
+        aggregation=SMAAggregation.LATEST,
     ),
     "Measurement.ExtGridMs.VAr.phsA": KnownChannelEntry(
         device_kind=SMADeviceKind.GRID,
@@ -612,16 +656,47 @@ __KNOWN_CHANNELS: dict[
 }
 
 
-def get_known_channel(channel_id: str) -> KnownChannelEntry | None:
+# read-only view of all known channels, keyed by known channel key
+KNOWN_CHANNELS: Mapping[str, KnownChannelEntry] = MappingProxyType(__KNOWN_CHANNELS)
+
+
+@lru_cache(maxsize=4096)
+def known_channel_key(channel_id: str) -> str:
     """
-    Get known channel by channel_id.
+    Get the key of a channel in the known channels.
 
-    this function handles array channels with arbitrary index automatically.
+    array channels with arbitrary index map to the same key, with empty index brackets.
     """
     # replace array index brackets with empty brackets
     if channel_id.endswith("]"):
         bracket_start = channel_id.rfind("[")
-        channel_id = f"{channel_id[0:bracket_start]}[]"
+        return f"{channel_id[0:bracket_start]}[]"
+
+    return channel_id
+
+
+def get_known_channel(channel_id: str) -> KnownChannelEntry | None:
+    """
+    Get known channel by channel_id.
+
+    this function handles array channels with arbitrary index automatically.
+    """
+    return __KNOWN_CHANNELS.get(known_channel_key(channel_id), None)
+
+
+def get_channel_aggregation(channel_id: str) -> SMAAggregation:
+    """Get how samples of a channel are aggregated into one value."""
+    known_channel = get_known_channel(channel_id)
+    if known_channel is None:
+        return SMAAggregation.LATEST
+
+    if known_channel.aggregation is not None:
+        return known_channel.aggregation
+
+    if known_channel.cumulative_mode is None and known_channel.unit not in (
+        SMAUnit.ENUM,
+        SMAUnit.PLAIN_NUMBER,
+    ):
+        return SMAAggregation.MEAN
 
-    # get known channel
-    return __KNOWN_CHANNELS.get(channel_id, None)
+    return SMAAggregation.LATEST
@@ -0,0 +1,277 @@
+"""
+Localization scraping of the SMA ennexOS web ui.
+
+only needed for diagnostics and to name channels that are not known,
+so this module is imported on first use.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import re
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+
+import aiohttp
+
+from .model import SMAApiClientError
+
+# runtime.js script tag in the landing page
+__RUNTIME_JS = re.compile(
+    r'<script src="(runtime\.[\w]+\.js)"(?: type="module")?></script>'
+)
+
+# mapping table of chunk ids to chunk hashes in runtime.js
+__CHUNK_MAPPING_TABLE = re.compile(
+    r'"\."\+{((?:[a-z0-9]+:\"[a-z0-9]+\",?)+)}\[[a-z]\]\+".js"'
+)
+
+# single entry of the chunk mapping table
+__CHUNK_MAPPING_ENTRY = re.compile(r"([a-z0-9]+):\"([a-z0-9]+)\",?")
+
+# prefix of message ids of measurement channels
+__CHANNEL_MESSAGE_PREFIX = "Measurement."
+
+# localization data embedded in a chunk
+__LANG_DATA = re.compile(r"\.exports=JSON\.parse\('(\{\"META\":.+)'\)")
+
+
+# maximum number of chunks downloaded at the same time
+DEFAULT_MAX_CONCURRENT_DOWNLOADS = 4
+
+
+class LocalizationCache:
+    """
+    on-disk cache of parsed localization chunks, one file per chunk.
+
+    chunks are keyed by their file name, which includes the chunk hash.
+    chunks without localization data are cached too, so unchanged firmware is never rescanned.
+    all methods are blocking and should be run in an executor.
+    """
+
+    __directory: Path
+
+    def __init__(self, directory: Path) -> None:
+        """Initialize cache in a directory, created on first save."""
+        self.__directory = directory
+
+    def load(self, filenames: Iterable[str]) -> dict[str, dict | None]:
+        """
+        Load cached chunks.
+
+        :param filenames: file names of the chunks to load
+        :returns: localization data of all cached chunks, None for chunks without localization data
+        """
+        cached: dict[str, dict | None] = {}
+        for filename in filenames:
+            with contextlib.suppress(OSError, ValueError, KeyError, TypeError):
+                entry = json.loads(self.__path(filename).read_text(encoding="utf-8"))
+                cached[filename] = entry["lang_data"]
+
+        return cached
+
+    def save(self, chunks: Mapping[str, dict | None]) -> None:
+        """Save parsed chunks, None for chunks without localization data."""
+        self.__directory.mkdir(parents=True, exist_ok=True)
+        for filename, lang_data in chunks.items():
+            # write to a temporary file first, so a partial write is never loaded
+            path = self.__path(filename)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps({"lang_data": lang_data}), encoding="utf-8")
+            tmp_path.replace(path)
+
+    def prune(self, keep: Iterable[str]) -> None:
+        """Remove all cached chunks except the given ones, e.g. after a firmware update."""
+        if not self.__directory.is_dir():
+            return
+
+        keep_paths = {self.__path(filename) for filename in keep}
+        for path in self.__directory.iterdir():
+            if path not in keep_paths:
+                path.unlink(missing_ok=True)
+
+    def __path(self, filename: str) -> Path:
+        """Path of the cache file of a chunk."""
+        return self.__directory / f"{filename}.json"
+
+
+async def fetch_chunk_mapping_table(
+    session: aiohttp.ClientSession, base_url: str
+) -> dict[str, str]:
+    """
+    Retrieve the mapping table of web ui chunks from the runtime.js of the device.
+
+    :param session: session to use for the requests
+    :param base_url: base url of the device
+    :returns: dict of chunk id to chunk hash
+    """
+    # get landing page HTML
+    async with session.get(base_url) as response:
+        response.raise_for_status()
+        html = await response.text()
+
+    # extract runtime.js script url
+    match = __RUNTIME_JS.search(html)
+    if not match:
+        raise SMAApiClientError("runtime.js module not found")
+
+    runtime_js_url = f"{base_url}/webui/{match.group(1)}"
+
+    # get runtime.js
+    async with session.get(runtime_js_url) as response:
+        response.raise_for_status()
+        runtime_js = await response.text()
+
+    # extract mapping table for js files
+    match = __CHUNK_MAPPING_TABLE.search(runtime_js)
+    if not match:
+        raise SMAApiClientError("JS file mapping table not found")
+
+    return parse_chunk_mapping_table(match.group(1))
+
+
+def chunk_mapping_fingerprint(mapping_table: Mapping[str, str]) -> str:
+    """
+    Fingerprint of a chunk mapping table.
+
+    chunk hashes change with the content of the chunks, so the fingerprint changes with every firmware update of the web ui.
+    """
+    return hashlib.sha256(
+        json.dumps(sorted(mapping_table.items())).encode()
+    ).hexdigest()
+
+
+async def fetch_localizations(
+    session: aiohttp.ClientSession,
+    base_url: str,
+    cache: LocalizationCache | None = None,
+    max_concurrent_downloads: int = DEFAULT_MAX_CONCURRENT_DOWNLOADS,
+) -> list[tuple[str, dict]]:
+    """
+    Retrieve all available localizations from the web ui of the device.
+
+    chunks are downloaded concurrently and parsed in an executor, as they can be multiple megabytes each.
+    :param session: session to use for the requests
+    :param base_url: base url of the device
+    :param cache: cache of parsed chunks, chunks in the cache are not downloaded again
+    :param max_concurrent_downloads: maximum number of chunks downloaded at the same time
+    :returns: list of (chunk filename, localization data), in the order of the chunk mapping table
+    """
+    loop = asyncio.get_running_loop()
+
+    mapping_table = await fetch_chunk_mapping_table(session, base_url)
+    filenames = [
+        f"{chunk_id}.{chunk_hash}.js" for chunk_id, chunk_hash in mapping_table.items()
+    ]
+
+    # chunks are immutable for a given hash, so cached chunks are always valid
+    cached: dict[str, dict | None] = {}
+    if cache is not None:
+        cached = await loop.run_in_executor(None, cache.load, filenames)
+
+    semaphore = asyncio.Semaphore(max_concurrent_downloads)
+
+    async def __load_chunk(filename: str) -> dict | None:
+        async with semaphore, session.get(f"{base_url}/webui/{filename}") as response:
+            response.raise_for_status()
+            js_content = await response.text()
+
+        return await loop.run_in_executor(None, parse_lang_data, js_content)
+
+    # load all js files not in the cache and check them for localization data.
+    # failed chunks are skipped, and not cached
+    missing = [filename for filename in filenames if filename not in cached]
+    results = await asyncio.gather(
+        *(__load_chunk(filename) for filename in missing), return_exceptions=True
+    )
+    loaded = {
+        filename: result
+        for filename, result in zip(missing, results, strict=True)
+        if not isinstance(result, BaseException)
+    }
+
+    if cache is not None:
+
+        def __update_cache() -> None:
+            cache.save(loaded)
+            cache.prune(filenames)
+
+        await loop.run_in_executor(None, __update_cache)
+
+    chunks = cached | loaded
+    return [
+        (filename, lang_data)
+        for filename in filenames
+        if (lang_data := chunks.get(filename)) is not None
+    ]
+
+
+def parse_chunk_mapping_table(mapping_table: str) -> dict[str, str]:
+    """Convert the js literal object of the chunk mapping table to a dict of chunk id to hash."""
+    return json.loads(
+        "{" + __CHUNK_MAPPING_ENTRY.sub(r'"\1":"\2",', mapping_table).rstrip(",") + "}"
+    )
+
+
+def parse_lang_data(js_content: str) -> dict | None:
+    """Extract the localization data of a chunk, None if the chunk has none."""
+    match = __LANG_DATA.search(js_content)
+    if not match:
+        return None
+
+    return json.loads(match.group(1).encode().decode("unicode_escape"))
+
+
+def build_channel_name_index(
+    localizations: list[tuple[str, dict]], language: str = "en"
+) -> dict[str, str]:
+    """
+    Build an index of channel ids to their localized name.
+
+    message ids of channels are their channel ids, without array index.
+    localizations are preferred by their META.lang: the requested language, then the same
+    language in another region, then english. the first localization containing a channel wins.
+    :param localizations: localizations as returned by fetch_localizations
+    :param language: preferred language, e.g. "de" or "en-GB"
+    :returns: dict of channel id, without array index, to localized name
+    """
+    language = _normalize_language(language)
+    primary_language = language.split("-")[0]
+
+    def __rank(lang_data: dict) -> int:
+        meta = lang_data.get("META")
+        lang = meta.get("lang") if isinstance(meta, dict) else None
+        if not isinstance(lang, str):
+            return 3
+
+        lang = _normalize_language(lang)
+        if lang == language:
+            return 0
+        if lang.split("-")[0] == primary_language:
+            return 1
+        if lang.split("-")[0] == "en":
+            return 2
+        return 3
+
+    # sorting is stable, so equally ranked localizations keep their order
+    ranked = sorted((lang_data for _, lang_data in localizations), key=__rank)
+
+    index: dict[str, str] = {}
+    for lang_data in ranked:
+        for message_id, text in lang_data.items():
+            if (
+                isinstance(text, str)
+                and message_id.startswith(__CHANNEL_MESSAGE_PREFIX)
+                and message_id not in index
+            ):
+                index[message_id] = text
+
+    return index
+
+
+def _normalize_language(language: str) -> str:
+    """Normalize a language tag for comparison, e.g. "en_US" to "en-us"."""
+    return language.replace("_", "-").lower()
@@ -0,0 +1,98 @@
+"""
+Logging helpers with close to no cost while a level is disabled.
+
+messages use %-style arguments, so they are only formatted if they are actually logged.
+arguments that are expensive to build can be deferred using LazyFormat.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from logging import DEBUG, Logger
+
+
+class LazyFormat:
+    """log argument built only when the message is formatted."""
+
+    __slots__ = ("__build",)
+
+    def __init__(self, build: Callable[[], object]) -> None:
+        """
+        Initialize a lazy argument.
+
+        :param build: function building the argument, called each time the message is formatted
+        """
+        self.__build = build
+
+    def __str__(self) -> str:
+        """Build the argument."""
+        return str(self.__build())
+
+
+class LazyLogger:
+    """
+    wrapper of a optional logger, checking the level before doing anything.
+
+    allows logging without checking if a logger was given first.
+    """
+
+    __slots__ = ("__logger",)
+
+    __logger: Logger | None
+
+    def __init__(self, logger: Logger | None) -> None:
+        """Initialize wrapper of a logger, None to log nothing."""
+        self.__logger = logger
+
+    @property
+    def logger(self) -> Logger | None:
+        """The wrapped logger."""
+        return self.__logger
+
+    def is_enabled_for(self, level: int) -> bool:
+        """Check if messages of a level are logged."""
+        return self.__logger is not None and self.__logger.isEnabledFor(level)
+
+    def debug(self, msg: str, *args: object) -> None:
+        """Log a debug message, formatted lazily using args."""
+        if self.__logger is not None and self.__logger.isEnabledFor(DEBUG):
+            self.__logger.debug(msg, *args)
+
+
+class SampledLogger:
+    """
+    logs only every n-th message, for messages that are logged very often.
+
+    e.g. per-entity updates of large plants, which would otherwise flood the debug log.
+    messages are only counted while the level is enabled.
+    """
+
+    __slots__ = ("__count", "__logger", "__rate")
+
+    __logger: Logger
+    __rate: int
+    __count: int
+
+    def __init__(self, logger: Logger, rate: int) -> None:
+        """
+        Initialize sampled logger.
+
+        :param logger: logger to log to
+        :param rate: log one of every rate messages, 1 to log all
+        """
+        if rate < 1:
+            raise ValueError("rate must be at least 1")
+
+        self.__logger = logger
+        self.__rate = rate
+        self.__count = 0
+
+    def debug(self, msg: str, *args: object) -> None:
+        """Log a debug message if it is sampled, formatted lazily using args."""
+        if not self.__logger.isEnabledFor(DEBUG):
+            return
+
+        sampled = self.__count == 0
+        self.__count = (self.__count + 1) % self.__rate
+        if sampled:
+            self.__logger.debug(msg, *args)
@@ -0,0 +1,247 @@
+"""Performance metrics of the SMA API client."""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from dataclasses import asdict, dataclass
+
+# number of recent samples percentiles are computed over
+DEFAULT_SAMPLE_WINDOW = 256
+
+# number of recent request traces kept
+DEFAULT_TRACE_BUFFER_SIZE = 50
+
+
+class DurationStats:
+    """
+    statistics of durations, e.g. of requests to one endpoint.
+
+    count, total and maximum cover all samples, percentiles only the most recent ones.
+    recording a sample is O(1), percentiles are computed on demand.
+    """
+
+    __slots__ = ("__count", "__maximum", "__recent", "__total")
+
+    __count: int
+    __total: float
+    __maximum: float
+    __recent: deque[float]
+
+    def __init__(self, window: int = DEFAULT_SAMPLE_WINDOW) -> None:
+        """
+        Initialize empty statistics.
+
+        :param window: number of recent samples to compute percentiles over
+        """
+        self.__count = 0
+        self.__total = 0.0
+        self.__maximum = 0.0
+        self.__recent = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        """Return the number of samples recorded."""
+        return self.__count
+
+    def record(self, seconds: float) -> None:
+        """Record a duration, in seconds."""
+        self.__count += 1
+        self.__total += seconds
+        self.__maximum = max(self.__maximum, seconds)
+        self.__recent.append(seconds)
+
+    @property
+    def mean(self) -> float | None:
+        """Mean of all durations."""
+        return self.__total / self.__count if self.__count > 0 else None
+
+    @property
+    def maximum(self) -> float | None:
+        """Maximum of all durations."""
+        return self.__maximum if self.__count > 0 else None
+
+    @property
+    def latest(self) -> float | None:
+        """The most recent duration."""
+        return self.__recent[-1] if len(self.__recent) > 0 else None
+
+    def percentile(self, percent: float) -> float | None:
+        """
+        Percentile of the recent durations, using the nearest rank.
+
+        :param percent: percentile to compute, 0 < percent <= 100
+        """
+        if len(self.__recent) == 0:
+            return None
+
+        ordered = sorted(self.__recent)
+        rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+        return ordered[rank - 1]
+
+    def as_dict(self) -> dict:
+        """Statistics as dict, durations in milliseconds."""
+
+        def __ms(seconds: float | None) -> float | None:
+            return round(seconds * 1000, 3) if seconds is not None else None
+
+        return {
+            "count": self.__count,
+            "mean_ms": __ms(self.mean),
+            "p50_ms": __ms(self.percentile(50)),
+            "p90_ms": __ms(self.percentile(90)),
+            "p99_ms": __ms(self.percentile(99)),
+            "max_ms": __ms(self.maximum),
+        }
+
+
+@dataclass(slots=True)
+class RequestTrace:
+    """trace of a single api request, including all of its attempts."""
+
+    # method and endpoint, without query
+    endpoint: str
+
+    # unix time the request was started at
+    started_at: float
+
+    # duration of all attempts including reading the response body, in seconds
+    duration: float
+
+    # number of attempts, more than 1 if the request was retried
+    attempts: int
+
+    # http status of the last response, None if no response was received
+    status: int | None = None
+
+    # size of the response body as read, None if no body was read
+    response_bytes: int | None = None
+
+    # error of the last attempt, None if the request succeeded
+    error: str | None = None
+
+
+class SMAClientMetrics:
+    """
+    performance metrics of a SMA API client.
+
+    collected always, as recording is cheap compared to a request.
+    """
+
+    __requests: dict[str, DurationStats]
+    __request_durations: DurationStats
+    __errors: dict[str, int]
+    __parse_times: dict[str, DurationStats]
+    __traces: deque[RequestTrace]
+    __window: int
+
+    retries: int
+    reauths: int
+    bytes_received: int
+
+    def __init__(
+        self,
+        window: int = DEFAULT_SAMPLE_WINDOW,
+        trace_buffer_size: int = DEFAULT_TRACE_BUFFER_SIZE,
+    ) -> None:
+        """
+        Initialize empty metrics.
+
+        :param window: number of recent samples to compute percentiles over
+        :param trace_buffer_size: number of recent request traces kept
+        """
+        self.__requests = {}
+        self.__request_durations = DurationStats(window)
+        self.__errors = {}
+        self.__parse_times = {}
+        self.__traces = deque(maxlen=trace_buffer_size)
+        self.__window = window
+        self.retries = 0
+        self.reauths = 0
+        self.bytes_received = 0
+
+    @staticmethod
+    def endpoint_key(method: str, endpoint: str) -> str:
+        """Key of a endpoint, without query so requests for different ids share it."""
+        return f"{method} {endpoint.split('?', 1)[0]}"
+
+    def record_request(self, trace: RequestTrace) -> None:
+        """Record a finished request, successful or not."""
+        stats = self.__requests.get(trace.endpoint)
+        if stats is None:
+            stats = self.__requests[trace.endpoint] = DurationStats(self.__window)
+        stats.record(trace.duration)
+        self.__request_durations.record(trace.duration)
+
+        if trace.error is not None:
+            self.__errors[trace.endpoint] = self.__errors.get(trace.endpoint, 0) + 1
+
+        self.retries += trace.attempts - 1
+        if trace.response_bytes is not None:
+            self.bytes_received += trace.response_bytes
+
+        self.__traces.append(trace)
+
+    def record_parse(self, name: str, seconds: float) -> None:
+        """Record the time it took to parse a response."""
+        stats = self.__parse_times.get(name)
+        if stats is None:
+            stats = self.__parse_times[name] = DurationStats(self.__window)
+        stats.record(seconds)
+
+    @property
+    def requests(self) -> dict[str, DurationStats]:
+        """Request durations, by endpoint key."""
+        return self.__requests
+
+    @property
+    def request_durations(self) -> DurationStats:
+        """Request durations of all endpoints."""
+        return self.__request_durations
+
+    def latest_trace(self, endpoint: str) -> RequestTrace | None:
+        """
+        Get the most recent trace of a endpoint.
+
+        :param endpoint: endpoint key, see endpoint_key()
+        :returns: the trace, or None if the endpoint was not requested recently
+        """
+        return next(
+            (trace for trace in reversed(self.__traces) if trace.endpoint == endpoint),
+            None,
+        )
+
+    @property
+    def parse_times(self) -> dict[str, DurationStats]:
+        """Parse durations, by name of the parsed response."""
+        return self.__parse_times
+
+    @property
+    def traces(self) -> list[RequestTrace]:
+        """The most recent request traces, oldest first."""
+        return list(self.__traces)
+
+    @property
+    def request_count(self) -> int:
+        """Total number of requests."""
+        return sum(len(stats) for stats in self.__requests.values())
+
+    @property
+    def error_count(self) -> int:
+        """Total number of failed requests."""
+        return sum(self.__errors.values())
+
+    def as_dict(self) -> dict:
+        """Snapshot of all metrics as dict."""
+        return {
+            "requests": {
+                endpoint: {**stats.as_dict(), "errors": self.__errors.get(endpoint, 0)}
+                for endpoint, stats in self.__requests.items()
+            },
+            "retries": self.retries,
+            "reauths": self.reauths,
+            "bytes_received": self.bytes_received,
+            "parse_times": {
+                name: stats.as_dict() for name, stats in self.__parse_times.items()
+            },
+            "traces": [asdict(trace) for trace in self.__traces],
+        }
@@ -65,9 +65,34 @@ class AuthToken:
                 "field 'expires_in' in auth token info is not an int"
             )
 
+        # granted_at is only present in persisted tokens, see to_dict()
+        granted_at = datetime.now()
+        if "granted_at" in data:
+            if not isinstance(data["granted_at"], str):
+                raise SMAApiParsingError(
+                    "field 'granted_at' in auth token info is not a string"
+                )
+            try:
+                granted_at = datetime.fromisoformat(data["granted_at"])
+            except ValueError as err:
+                raise SMAApiParsingError(
+                    "field 'granted_at' in auth token info is not a valid timestamp"
+                ) from err
+
         return cls(
             access_token=data["access_token"],
             refresh_token=data["refresh_token"],
             token_type=data["token_type"],
             expires_in=data["expires_in"],
+            granted_at=granted_at,
         )
+
+    def to_dict(self) -> dict:
+        """Convert to dict, for persisting the token. can be restored using from_dict."""
+        return {
+            "access_token": self.access_token,
+            "refresh_token": self.refresh_token,
+            "token_type": self.token_type,
+            "expires_in": self.expires_in,
+            "granted_at": self.granted_at.isoformat(),
+        }
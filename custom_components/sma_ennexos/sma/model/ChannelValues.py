@@ -1,9 +1,11 @@
 """Measurement values of a single sensor channel."""
 
-from dataclasses import dataclass
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass
 
 from .errors import SMAApiParsingError
-from .TimeValuePair import TimeValuePair
+from .TimeValueColumn import TimeValueColumn
+from .TimeValuePair import SMAValue, TimeValuePair
 
 
 @dataclass
@@ -12,7 +14,7 @@ class ChannelValues:
 
     channel_id: str
     component_id: str
-    values: list[TimeValuePair]
+    values: Sequence[TimeValuePair]
 
     @property
     def latest_value(self) -> TimeValuePair:
@@ -23,6 +25,14 @@ class ChannelValues:
             )
         return self.values[-1]
 
+    def to_dict(self) -> dict:
+        """Convert to dict, with the same layout as dataclasses.asdict()."""
+        return {
+            "channel_id": self.channel_id,
+            "component_id": self.component_id,
+            "values": [asdict(v) for v in self.values],
+        }
+
     @classmethod
     def __parse_dict(cls, data: dict) -> tuple[str, str, list[dict]]:
         """
@@ -59,6 +69,52 @@ class ChannelValues:
 
         return (data["channelId"], data["componentId"], data["values"])
 
+    @classmethod
+    def __parse_array_values(
+        cls, values: list[dict]
+    ) -> tuple[tuple[str, ...], list[list[SMAValue | None]]]:
+        """
+        Parse the time slices of an array channel into columns.
+
+        :returns: tuple of (times, columns), with one column per array index.
+        indices missing in a time slice are filled with None.
+        """
+        times: list[str] = []
+        slices: list[list] = []
+        for v in values:
+            if "time" not in v or not isinstance(v["time"], str):
+                raise SMAApiParsingError(
+                    "field 'time' in array channel values is missing or not a string"
+                )
+            if "values" not in v or not isinstance(v["values"], list):
+                raise SMAApiParsingError(
+                    "field 'values' in array channel values is missing or not a list"
+                )
+
+            times.append(v["time"])
+            slices.append(v["values"])
+
+        # transpose time slices to columns
+        column_count = max(len(s) for s in slices)
+        columns: list[list[SMAValue | None]] = [
+            [cls.__parse_array_value(s[i]) if i < len(s) else None for s in slices]
+            for i in range(column_count)
+        ]
+
+        return (tuple(times), columns)
+
+    @staticmethod
+    def __parse_array_value(value: object) -> SMAValue | None:
+        """Normalize a array element, keeping elements that are not a SMAValue as-is."""
+        if value is None:
+            return None
+
+        # array elements were never validated, so unexpected elements are tolerated
+        if not isinstance(value, SMAValue):
+            return value  # type: ignore[return-value]
+
+        return TimeValuePair.parse_value(value)
+
     @classmethod
     def from_dict(cls, data: dict) -> list["ChannelValues"]:
         """Create from dict, verify required fields and their types."""
@@ -73,25 +129,21 @@ class ChannelValues:
             and "values" in values[0]  # has values field
             and isinstance(values[0]["values"], list)  # values field is a list
         ):
-            # TODO: in array channels, only the first value is used.
-            # normally, this should be fine since no other values are ever returned by the api.
-            # still, being able to handle multiple values would be more correct.
-
             # array channel:
             # trim "[]" from channel id
             channelId = channelId[:-2] if channelId.endswith("[]") else channelId
 
-            # get shared time
-            time = values[0]["time"]
+            # parse all time slices into one column per array index
+            times, columns = cls.__parse_array_values(values)
 
-            # manually create ChannelValues for each array value
+            # create ChannelValues for each array index, all sharing the same times
             return [
                 cls(
                     channel_id=f"{channelId}[{i}]",
                     component_id=componentId,
-                    values=[TimeValuePair(time=time, value=value)],
+                    values=TimeValueColumn(times=times, values=column),
                 )
-                for i, value in enumerate(values[0]["values"])
+                for i, column in enumerate(columns)
             ]
         else:
             # single-value channel:
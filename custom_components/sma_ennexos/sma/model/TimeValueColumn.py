@@ -0,0 +1,111 @@
+"""Columnar storage for the values of a single array channel index."""
+
+import math
+from array import array
+from collections.abc import Iterator, Sequence
+from typing import overload
+
+from .TimeValuePair import SMAValue, TimeValuePair
+
+
+class TimeValueColumn(Sequence[TimeValuePair]):
+    """
+    a column of values of one array channel index, sharing time stamps with the other indices.
+
+    values are stored in a compact typed array where that keeps them unchanged ('q' if all
+    values are integers, 'd' if all values are floats, with None stored as NaN).
+    anything else (e.g. integers with gaps, or string values) falls back to a plain list.
+    TimeValuePair objects are only created when accessed.
+    """
+
+    __slots__ = ("__times", "__values")
+
+    __times: tuple[str, ...]
+    __values: array | list[SMAValue | None]
+
+    def __init__(
+        self, times: tuple[str, ...], values: Sequence[SMAValue | None]
+    ) -> None:
+        """Initialize column, times are expected to be shared between columns."""
+        if len(times) != len(values):
+            raise ValueError(
+                f"times and values must have the same length ({len(times)} != {len(values)})"
+            )
+
+        self.__times = times
+        self.__values = self.__pack(values)
+
+    @staticmethod
+    def __pack(values: Sequence[SMAValue | None]) -> array | list[SMAValue | None]:
+        """Pack values into the most compact storage possible."""
+        # note: type() is used instead of isinstance() to exclude bool.
+        # integers are never stored as floats, so they keep their type and precision
+        try:
+            if all(type(v) is int for v in values):
+                return array("q", values)  # type: ignore[arg-type]
+            if all(v is None or type(v) is float for v in values):
+                return array("d", (math.nan if v is None else v for v in values))
+        except OverflowError:
+            # integer too large for a typed array
+            pass
+
+        return list(values)
+
+    def __unpack(self, value: SMAValue | None) -> SMAValue | None:
+        """Convert a stored value back, NaN in float columns is None."""
+        if isinstance(value, float) and math.isnan(value):
+            return None
+        return value
+
+    @property
+    def times(self) -> tuple[str, ...]:
+        """Time stamps of the values, shared with other columns of the same channel."""
+        return self.__times
+
+    @property
+    def raw_values(self) -> array | list[SMAValue | None]:
+        """The underlying value storage. float columns store None as NaN."""
+        return self.__values
+
+    @overload
+    def __getitem__(self, index: int) -> TimeValuePair: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[TimeValuePair]: ...
+
+    def __getitem__(self, index: int | slice) -> TimeValuePair | list[TimeValuePair]:
+        """Get a single TimeValuePair, or a list of them for slices."""
+        if isinstance(index, slice):
+            return [
+                TimeValuePair(time=time, value=self.__unpack(value))
+                for time, value in zip(
+                    self.__times[index], self.__values[index], strict=True
+                )
+            ]
+
+        return TimeValuePair(
+            time=self.__times[index], value=self.__unpack(self.__values[index])
+        )
+
+    def __len__(self) -> int:
+        """Get the number of values."""
+        return len(self.__values)
+
+    def __iter__(self) -> Iterator[TimeValuePair]:
+        """Iterate all values as TimeValuePair."""
+        for time, value in zip(self.__times, self.__values, strict=True):
+            yield TimeValuePair(time=time, value=self.__unpack(value))
+
+    def __eq__(self, other: object) -> bool:
+        """Compare to any other sequence of TimeValuePair."""
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            a == b for a, b in zip(self, other, strict=True)
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        """Representation of the column."""
+        return f"TimeValueColumn({list(self)!r})"
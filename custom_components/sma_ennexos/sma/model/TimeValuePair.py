@@ -28,19 +28,23 @@ class TimeValuePair:
             raise SMAApiParsingError("field 'time' in time value pair is not a string")
 
         # value is optional
-        value = None
-        if "value" in data:
-            if isinstance(data["value"], SMAValue):
-                value = data["value"]
-            else:
-                raise SMAApiParsingError(
-                    "field 'value' in time value pair is not a SMAValue"
-                )
+        value = cls.parse_value(data["value"]) if "value" in data else None
+
+        return cls(time=data["time"], value=value)
+
+    @staticmethod
+    def parse_value(value: object) -> SMAValue | None:
+        """Verify and normalize a raw value, as found in the 'value' field."""
+        if not isinstance(value, SMAValue):
+            raise SMAApiParsingError(
+                "field 'value' in time value pair is not a SMAValue"
+            )
+
         # newer firmware started returning "NaN" as value instead of null
         # we treat "NaN" as None
         if isinstance(value, str) and value.lower() == "nan":
-            value = None
+            return None
         if isinstance(value, float) and math.isnan(value):
-            value = None
+            return None
 
-        return cls(time=data["time"], value=value)
+        return value
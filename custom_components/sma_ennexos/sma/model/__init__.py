@@ -10,6 +10,7 @@ from .errors import (
     SMAApiParsingError,
 )
 from .LiveMeasurementQueryItem import LiveMeasurementQueryItem
+from .TimeValueColumn import TimeValueColumn
 from .TimeValuePair import SMAValue, TimeValuePair
 
 __all__ = [
@@ -22,5 +23,6 @@ __all__ = [
     "ComponentInfo",
     "LiveMeasurementQueryItem",
     "SMAValue",
+    "TimeValueColumn",
     "TimeValuePair",
 ]
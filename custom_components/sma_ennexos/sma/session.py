@@ -3,6 +3,7 @@
 import asyncio
 import contextlib
 import socket
+import time
 from collections.abc import Awaitable, Callable
 from logging import Logger
 from typing import Any, Literal
@@ -10,11 +11,14 @@ from typing import Any, Literal
 import aiohttp
 import async_timeout
 
+from custom_components.sma_ennexos.sma.log import LazyLogger
+from custom_components.sma_ennexos.sma.metrics import RequestTrace, SMAClientMetrics
 from custom_components.sma_ennexos.sma.model import AuthToken
 from custom_components.sma_ennexos.sma.model.errors import (
     SMAApiAuthenticationError,
     SMAApiClientError,
 )
+from custom_components.sma_ennexos.sma.tracing import span
 
 
 class SMAClientSession:
@@ -26,7 +30,8 @@ class SMAClientSession:
 
     __timeout: float | None
     __retries: int
-    __logger: Logger | None
+    __logger: LazyLogger
+    __metrics: SMAClientMetrics | None
 
     session_id: str | None = None
     token: AuthToken | None = None
@@ -41,6 +46,7 @@ class SMAClientSession:
         timeout: float | None = None,
         retries: int | None = None,
         logger: Logger | None = None,
+        metrics: SMAClientMetrics | None = None,
     ) -> None:
         """Initialize the session."""
         self.__session = session
@@ -48,7 +54,8 @@ class SMAClientSession:
         self.__base_url = base_url
         self.__timeout = timeout
         self.__retries = retries if retries is not None else 0
-        self.__logger = logger
+        self.__logger = LazyLogger(logger)
+        self.__metrics = metrics
 
     @property
     def host(self) -> str:
@@ -60,6 +67,28 @@ class SMAClientSession:
         """Get the base url of the session."""
         return self.__base_url
 
+    @property
+    def timeout(self) -> float | None:
+        """Timeout of a single request, in seconds."""
+        return self.__timeout
+
+    @timeout.setter
+    def timeout(self, timeout: float | None) -> None:
+        """Set the timeout of a single request, applies to the next request."""
+        self.__timeout = timeout
+
+    @property
+    def retries(self) -> int:
+        """Number of retries after a failed request."""
+        return self.__retries
+
+    @retries.setter
+    def retries(self, retries: int) -> None:
+        """Set the number of retries, applies to the next request."""
+        if retries < 0:
+            raise ValueError("retries must be at least 0")
+        self.__retries = retries
+
     @property
     def __base_headers(self) -> dict:
         """Base headers for all requests."""
@@ -97,8 +126,7 @@ class SMAClientSession:
             return
 
         self.session_id = session_cookie.value
-        if self.__logger:
-            self.__logger.debug(f"got session id {self.session_id}")
+        self.__logger.debug("got session id %s", self.session_id)
 
     async def request(
         self,
@@ -119,55 +147,120 @@ class SMAClientSession:
             raise ValueError("retries must be at least 0")
 
         url = f"{self.__base_url}/{endpoint}"
+        started_at = time.time()
+        start = time.monotonic()
+        attempts = 0
+        status = None
+
+        with span("request", method=method, endpoint=endpoint) as request_span:
+            last_error = SMAApiClientError("Unknown error")  # should not happen
+            for _ in range(self.__retries + 1):
+                attempts += 1
+                try:
+                    async with async_timeout.timeout(self.__timeout):
+                        # process auth headers on every retry, as they might have
+                        # changed due to re-auth
+                        auth_headers = {}
+                        if auth == "none":
+                            auth_headers = self.__base_headers
+                        elif auth == "session":
+                            auth_headers = self.__session_headers
+                        elif auth == "full":
+                            auth_headers = self.__auth_headers
+
+                        response = await self.__session.request(
+                            method=method,
+                            url=url,
+                            data=data,
+                            json=json,
+                            headers={
+                                **auth_headers,
+                                **headers,
+                            },
+                        )
+
+                        # remove any cookies set by the request, we handle them
+                        # manually
+                        self.__session.cookie_jar.clear()
+
+                        self.__update_session_cookie(response)
+                        status = response.status
+
+                        # check if unauthorized
+                        if response.status in (401, 403):
+                            if self.__metrics is not None:
+                                self.__metrics.reauths += 1
+
+                            # ignore any errors during reauth
+                            with contextlib.suppress(Exception):
+                                if self.reauth_hook:
+                                    await self.reauth_hook(endpoint)
+
+                            last_error = SMAApiAuthenticationError("Unauthorized")
+                            continue
+
+                        response.raise_for_status()
+
+                        # read the body within the timeout, so the metrics include it.
+                        # the response keeps it, so callers reading it again get it right away
+                        with span("read"):
+                            body = await response.read()
+
+                        request_span.set_attribute("attempts", attempts)
+                        request_span.set_attribute("status", status)
+                        self.__record(
+                            method,
+                            endpoint,
+                            started_at,
+                            start,
+                            attempts,
+                            status,
+                            response_bytes=len(body),
+                        )
+                        return response
+                except (
+                    aiohttp.ClientError,
+                    asyncio.TimeoutError,
+                    socket.gaierror,
+                ) as err:
+                    self.__logger.debug("Error fetching '%s': %s", url, err)
+                    last_error = err
+
+                    # retry
+                    continue
+
+            request_span.set_attribute("attempts", attempts)
+            request_span.set_attribute("status", status)
+            self.__record(
+                method, endpoint, started_at, start, attempts, status, error=last_error
+            )
+            raise SMAApiClientError(
+                f"Error fetching '{url}': {last_error}"
+            ) from last_error
+
+    def __record(
+        self,
+        method: str,
+        endpoint: str,
+        started_at: float,
+        start: float,
+        attempts: int,
+        status: int | None,
+        response_bytes: int | None = None,
+        error: BaseException | None = None,
+    ) -> None:
+        """Record a finished request in the metrics, if any."""
+        if self.__metrics is None:
+            return
 
-        last_error = SMAApiClientError("Unknown error")  # should not happen
-        for _ in range(self.__retries + 1):
-            try:
-                async with async_timeout.timeout(self.__timeout):
-                    # process auth headers on every retry, as they might have changed
-                    # due to re-auth
-                    auth_headers = {}
-                    if auth == "none":
-                        auth_headers = self.__base_headers
-                    elif auth == "session":
-                        auth_headers = self.__session_headers
-                    elif auth == "full":
-                        auth_headers = self.__auth_headers
-
-                    response = await self.__session.request(
-                        method=method,
-                        url=url,
-                        data=data,
-                        json=json,
-                        headers={
-                            **auth_headers,
-                            **headers,
-                        },
-                    )
-
-                    # remove any cookies set by the request, we handle them manually
-                    self.__session.cookie_jar.clear()
-
-                    self.__update_session_cookie(response)
-
-                    # check if unauthorized
-                    if response.status in (401, 403):
-                        # ignore any errors during reauth
-                        with contextlib.suppress(Exception):
-                            if self.reauth_hook:
-                                await self.reauth_hook(endpoint)
-
-                        last_error = SMAApiAuthenticationError("Unauthorized")
-                        continue
-
-                    response.raise_for_status()
-                    return response
-            except (aiohttp.ClientError, asyncio.TimeoutError, socket.gaierror) as err:
-                if self.__logger:
-                    self.__logger.debug(f"Error fetching '{url}': {err}")
-                last_error = err
-
-                # retry
-                continue
-
-        raise SMAApiClientError(f"Error fetching '{url}': {last_error}") from last_error
+        self.__metrics.record_request(
+            RequestTrace(
+                endpoint=SMAClientMetrics.endpoint_key(method, endpoint),
+                started_at=started_at,
+                duration=time.monotonic() - start,
+                attempts=attempts,
+                status=status,
+                response_bytes=response_bytes,
+                error=repr(error) if error is not None else None,
+            )
+        )
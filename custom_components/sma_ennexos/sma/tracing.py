@@ -0,0 +1,252 @@
+"""
+Lightweight tracing of update cycles.
+
+spans are nested using a context variable, so they propagate through awaits of the same task.
+finished root spans, including all of their children, are passed to the registered sinks.
+without any sinks, span() returns a shared no-op span, so tracing costs close to nothing.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from collections.abc import Callable
+from contextvars import ContextVar, Token
+from logging import DEBUG, Logger
+from types import TracebackType
+from typing import Any
+
+# a sink receives every finished root span
+SpanSink = Callable[["Span"], None]
+
+# accessed from classes, so not name-mangled
+_current_span: ContextVar[Span | None] = ContextVar("sma_current_span", default=None)
+_sinks: list[SpanSink] = []
+
+
+class Span:
+    """a timed stage of a update cycle, with nested child stages."""
+
+    __slots__ = (
+        "__start",
+        "__token",
+        "attributes",
+        "children",
+        "duration",
+        "error",
+        "name",
+        "parent",
+        "started_at",
+    )
+
+    name: str
+    attributes: dict[str, Any]
+    parent: Span | None
+    children: list[Span]
+    started_at: float
+    duration: float | None
+    error: str | None
+
+    def __init__(self, name: str, attributes: dict[str, Any]) -> None:
+        """Initialize a span, it starts when entered."""
+        self.name = name
+        self.attributes = attributes
+        self.parent = None
+        self.children = []
+        self.started_at = 0.0
+        self.duration = None
+        self.error = None
+        self.__start = 0.0
+        self.__token: Token[Span | None] | None = None
+
+    def __enter__(self) -> Span:
+        """Start the span, as child of the current span."""
+        self.parent = _current_span.get()
+        if self.parent is not None:
+            self.parent.children.append(self)
+
+        self.__token = _current_span.set(self)
+        self.started_at = time.time()
+        self.__start = time.perf_counter()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """End the span, and emit it to all sinks if it is a root span."""
+        self.duration = time.perf_counter() - self.__start
+        if exc is not None:
+            self.error = repr(exc)
+
+        if self.__token is not None:
+            _current_span.reset(self.__token)
+            self.__token = None
+
+        if self.parent is None:
+            _emit(self)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Set a attribute of the span."""
+        self.attributes[key] = value
+
+    def as_dict(self) -> dict:
+        """Span and all of its children as dict, durations in milliseconds."""
+        return {
+            "name": self.name,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration * 1000, 3)
+            if self.duration is not None
+            else None,
+            "attributes": self.attributes,
+            "error": self.error,
+            "children": [child.as_dict() for child in self.children],
+        }
+
+    def summary(self) -> str:
+        """One-line summary of the span and its children, e.g. 'update 12.3ms [login 1.0ms, ...]'."""
+        duration = f"{self.duration * 1000:.1f}ms" if self.duration is not None else "?"
+        text = f"{self.name} {duration}"
+        if self.error is not None:
+            text += f" ({self.error})"
+        if len(self.children) > 0:
+            text += f" [{', '.join(child.summary() for child in self.children)}]"
+        return text
+
+
+class _NoopSpan:
+    """span used while tracing is disabled, does nothing."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> _NoopSpan:
+        """Do nothing."""
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Do nothing."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Do nothing."""
+
+
+__NOOP_SPAN = _NoopSpan()
+
+
+def span(name: str, **attributes: Any) -> Span | _NoopSpan:
+    """
+    Create a span, to be used as context manager.
+
+    :param name: name of the stage
+    :param attributes: attributes of the span, e.g. the endpoint of a request
+    :returns: a new span, or a shared no-op span if tracing is disabled
+    """
+    if not _sinks:
+        return __NOOP_SPAN
+    return Span(name, attributes)
+
+
+def tracing_enabled() -> bool:
+    """Check if any sink is registered."""
+    return len(_sinks) > 0
+
+
+def add_sink(sink: SpanSink) -> Callable[[], None]:
+    """
+    Register a sink for finished root spans.
+
+    :returns: function to remove the sink again
+    """
+    _sinks.append(sink)
+
+    def __remove() -> None:
+        if sink in _sinks:
+            _sinks.remove(sink)
+
+    return __remove
+
+
+def _emit(span: Span) -> None:
+    """Pass a finished root span to all sinks."""
+    for sink in list(_sinks):
+        sink(span)
+
+
+class RingBufferSink:
+    """keeps the most recent root spans in memory."""
+
+    __spans: deque[Span]
+
+    def __init__(self, size: int = 20) -> None:
+        """Initialize sink keeping the last n root spans."""
+        self.__spans = deque(maxlen=size)
+
+    def __call__(self, span: Span) -> None:
+        """Keep a finished root span."""
+        self.__spans.append(span)
+
+    @property
+    def spans(self) -> list[Span]:
+        """The most recent root spans, oldest first."""
+        return list(self.__spans)
+
+
+class LogSummarySink:
+    """logs a one-line summary of every root span."""
+
+    __logger: Logger
+    __level: int
+
+    def __init__(self, logger: Logger, level: int = DEBUG) -> None:
+        """Initialize sink logging to a logger, at the given level."""
+        self.__logger = logger
+        self.__level = level
+
+    def __call__(self, span: Span) -> None:
+        """Log the summary of a finished root span."""
+        if self.__logger.isEnabledFor(self.__level):
+            self.__logger.log(self.__level, "trace: %s", span.summary())
+
+
+class OpenTelemetrySink:
+    """
+    exports root spans and their children to OpenTelemetry.
+
+    requires the opentelemetry-api package, raises ImportError if it is not installed.
+    """
+
+    def __init__(self, tracer_name: str = __name__) -> None:
+        """Initialize sink using a tracer of the global tracer provider."""
+        from opentelemetry import trace
+
+        self.__trace = trace
+        self.__tracer = trace.get_tracer(tracer_name)
+
+    def __call__(self, span: Span) -> None:
+        """Export a finished root span."""
+        self.__export(span, None)
+
+    def __export(self, span: Span, parent: Any) -> None:
+        """Export a span as child of a OpenTelemetry span, None for root spans."""
+        start_ns = int(span.started_at * 1e9)
+        otel_span = self.__tracer.start_span(
+            span.name,
+            context=self.__trace.set_span_in_context(parent)
+            if parent is not None
+            else None,
+            attributes={
+                key: value
+                for key, value in span.attributes.items()
+                if isinstance(value, str | bool | int | float)
+            },
+            start_time=start_ns,
+        )
+        if span.error is not None:
+            otel_span.set_status(self.__trace.StatusCode.ERROR, span.error)
+
+        for child in span.children:
+            self.__export(child, otel_span)
+
+        otel_span.end(end_time=start_ns + int((span.duration or 0.0) * 1e9))
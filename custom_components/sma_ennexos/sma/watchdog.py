@@ -0,0 +1,126 @@
+"""Watchdog for synchronous work blocking the event loop."""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from logging import Logger
+from typing import Any
+
+# stages taking longer than this block the event loop noticeably, in seconds.
+# same as the slow callback duration of asyncio debug mode
+DEFAULT_BLOCKING_THRESHOLD = 0.1
+
+# maximum number of stages kept per cycle, e.g. if samples are parsed in between updates
+MAX_STAGES_PER_CYCLE = 32
+
+
+@dataclass(slots=True)
+class BlockingStage:
+    """a synchronous stage that ran on the event loop."""
+
+    # name of the stage, e.g. "parse"
+    name: str
+
+    # wall time of the stage, the time the event loop was blocked for, in seconds
+    duration: float
+
+    # cpu time of the stage, in seconds
+    cpu_time: float
+
+    # details of the stage, e.g. the size of the parsed response
+    details: dict[str, Any] = field(default_factory=dict)
+
+    def summary(self) -> str:
+        """Summary of the stage, e.g. 'parse 120.0ms (cpu 118.2ms, bytes=1024)'."""
+        details = "".join(f", {key}={value}" for key, value in self.details.items())
+        return (
+            f"{self.name} {self.duration * 1000:.1f}ms "
+            f"(cpu {self.cpu_time * 1000:.1f}ms{details})"
+        )
+
+
+class LoopBlockWatchdog:
+    """
+    measures synchronous stages of a update cycle, e.g. parsing and dispatching to listeners.
+
+    stages must not await, so their duration is the time the event loop was blocked for.
+    if any stage of a cycle took longer than the threshold, a warning with a breakdown
+    of all stages of the cycle is logged.
+    """
+
+    __logger: Logger
+    __stages: deque[BlockingStage]
+    __last_cycle: list[BlockingStage]
+
+    threshold: float
+    blocked_cycles: int
+
+    def __init__(
+        self, logger: Logger, threshold: float = DEFAULT_BLOCKING_THRESHOLD
+    ) -> None:
+        """
+        Initialize watchdog.
+
+        :param logger: logger to warn about blocking cycles on
+        :param threshold: duration of a stage to warn at, in seconds
+        """
+        self.__logger = logger
+        self.__stages = deque(maxlen=MAX_STAGES_PER_CYCLE)
+        self.__last_cycle = []
+        self.threshold = threshold
+        self.blocked_cycles = 0
+
+    @contextmanager
+    def measure(self, name: str, **details: Any) -> Iterator[None]:
+        """
+        Measure a synchronous stage of the current cycle.
+
+        :param name: name of the stage
+        :param details: details included in the breakdown, e.g. the number of listeners
+        """
+        start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            self.__stages.append(
+                BlockingStage(
+                    name=name,
+                    duration=time.perf_counter() - start,
+                    cpu_time=time.thread_time() - cpu_start,
+                    details=details,
+                )
+            )
+
+    def finish_cycle(self, description: str) -> bool:
+        """
+        Finish the current cycle, warning if any of its stages blocked the event loop.
+
+        :param description: description of the cycle used in the warning, e.g. "update of sma.local"
+        :returns: True if the cycle blocked the event loop for longer than the threshold
+        """
+        stages = list(self.__stages)
+        self.__stages.clear()
+        self.__last_cycle = stages
+
+        if not any(stage.duration > self.threshold for stage in stages):
+            return False
+
+        self.blocked_cycles += 1
+        self.__logger.warning(
+            "%s blocked the event loop for %.1fms, more than %.1fms: %s",
+            description,
+            max(stage.duration for stage in stages) * 1000,
+            self.threshold * 1000,
+            ", ".join(stage.summary() for stage in stages),
+        )
+        return True
+
+    @property
+    def last_cycle(self) -> list[BlockingStage]:
+        """Stages of the most recently finished cycle."""
+        return self.__last_cycle
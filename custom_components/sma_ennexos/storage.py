@@ -0,0 +1,167 @@
+"""Persistent storage for the SMA ennexOS integration."""
+
+from __future__ import annotations
+
+import shutil
+from dataclasses import asdict
+from pathlib import Path
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import STORAGE_DIR, Store
+
+from .const import DOMAIN, LOGGER
+from .sma.model import ComponentInfo
+
+TOPOLOGY_STORAGE_VERSION = 1
+SESSION_STORAGE_VERSION = 1
+CHANNEL_NAMES_STORAGE_VERSION = 1
+
+
+class SMATopologyStore:
+    """
+    persistent cache of the components and channels discovered for a config entry.
+
+    allows creating entities on startup without waiting for a full discovery.
+    """
+
+    __store: Store[dict]
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize store for a config entry."""
+        self.__store = Store(
+            hass,
+            TOPOLOGY_STORAGE_VERSION,
+            f"{DOMAIN}.topology.{entry_id}",
+        )
+
+    async def async_load(
+        self,
+    ) -> tuple[list[ComponentInfo], list[tuple[str, str]]] | None:
+        """
+        Load the cached topology.
+
+        :returns: tuple of (components, channels), with channels as (component_id, channel_id).
+        None if nothing is cached or the cache is invalid.
+        """
+        data = await self.__store.async_load()
+        if data is None:
+            return None
+
+        try:
+            components = [ComponentInfo(**c) for c in data["components"]]
+            channels = [
+                (str(component_id), str(channel_id))
+                for component_id, channel_id in data["channels"]
+            ]
+        except (KeyError, TypeError, ValueError) as err:
+            LOGGER.warning("ignoring invalid topology cache: %s", err)
+            return None
+
+        return (components, channels)
+
+    async def async_save(
+        self, components: list[ComponentInfo], channels: list[tuple[str, str]]
+    ) -> None:
+        """Save the topology."""
+        await self.__store.async_save(
+            {
+                "components": [asdict(c) for c in components],
+                "channels": [list(channel) for channel in channels],
+            }
+        )
+
+    async def async_remove(self) -> None:
+        """Remove the cached topology."""
+        await self.__store.async_remove()
+
+
+class SMASessionStore:
+    """
+    persistent storage of the api session of a config entry.
+
+    allows resuming the session after a restart instead of logging in again.
+    stored in private storage, as it contains the access and refresh tokens.
+    """
+
+    __store: Store[dict]
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize store for a config entry."""
+        self.__store = Store(
+            hass,
+            SESSION_STORAGE_VERSION,
+            f"{DOMAIN}.session.{entry_id}",
+            private=True,
+        )
+
+    async def async_load(self) -> dict | None:
+        """Load the persisted session state, None if nothing is persisted."""
+        return await self.__store.async_load()
+
+    async def async_save(self, state: dict) -> None:
+        """Save the session state."""
+        await self.__store.async_save(state)
+
+    async def async_remove(self) -> None:
+        """Remove the persisted session state."""
+        await self.__store.async_remove()
+
+
+class SMAChannelNameStore:
+    """
+    persistent index of channel ids to the names localized by the device.
+
+    built once per firmware, identified by the fingerprint of the web ui localizations.
+    """
+
+    __store: Store[dict]
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize store for a config entry."""
+        self.__store = Store(
+            hass,
+            CHANNEL_NAMES_STORAGE_VERSION,
+            f"{DOMAIN}.channel_names.{entry_id}",
+        )
+
+    async def async_load(self) -> tuple[str, dict[str, str]] | None:
+        """
+        Load the channel name index.
+
+        :returns: tuple of (fingerprint, names), with names as channel id without array index to name.
+        None if nothing is stored or the index is invalid.
+        """
+        data = await self.__store.async_load()
+        if data is None:
+            return None
+
+        try:
+            fingerprint = str(data["fingerprint"])
+            names = {
+                str(channel_id): str(name) for channel_id, name in data["names"].items()
+            }
+        except (KeyError, TypeError, AttributeError) as err:
+            LOGGER.warning("ignoring invalid channel name index: %s", err)
+            return None
+
+        return (fingerprint, names)
+
+    async def async_save(self, fingerprint: str, names: dict[str, str]) -> None:
+        """Save the channel name index."""
+        await self.__store.async_save({"fingerprint": fingerprint, "names": names})
+
+    async def async_remove(self) -> None:
+        """Remove the channel name index."""
+        await self.__store.async_remove()
+
+
+def localization_cache_dir(hass: HomeAssistant, entry_id: str) -> Path:
+    """Directory of the on-disk localization cache of a config entry."""
+    return Path(hass.config.path(STORAGE_DIR, f"{DOMAIN}.localizations.{entry_id}"))
+
+
+async def async_remove_localization_cache(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the on-disk localization cache of a config entry."""
+    await hass.async_add_executor_job(
+        shutil.rmtree, localization_cache_dir(hass, entry_id), True
+    )
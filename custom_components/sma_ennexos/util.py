@@ -1,55 +1,48 @@
 """integration utilities."""
 
+import re
+from functools import lru_cache
 from typing import Literal
 
 
-def __normalize_for_id_old(s: str) -> str:
-    """Normalize a string for use in an entity id or translation key."""
-    # lower case
-    s = s.lower()
+# "delimiting characters" and spaces, replaced with underscores
+__DELIMITERS = str.maketrans(" -.:", "____")
 
-    # replace "delimiting characters" and spaces with underscores
-    for c in " -.:":
-        s = s.replace(c, "_")
+# umlauts, replaced with ascii equivalents
+__UMLAUTS = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"})
 
-    # remove all non-alphanumeric characters except underscores
-    s = "".join(c if c.isalnum() or c == "_" else "" for c in s)
+# anything but alphanumeric characters (including non-ascii) and underscores
+__NON_WORD = re.compile(r"\W+")
 
-    # trim underscores from start and end
-    s = s.strip("_")
+# anything but the characters allowed in entity ids (a-z, 0-9, and underscore)
+__NON_ID = re.compile(r"[^a-z0-9_]+")
 
-    # remove all occurrences of multiple underscores
-    while "__" in s:
-        s = s.replace("__", "_")
+__MULTIPLE_UNDERSCORES = re.compile(r"__+")
 
-    return s
+# normalized strings are cached, since the same component names and channel ids
+# are normalized for many entities
+__NORMALIZE_CACHE_SIZE = 4096
 
 
-def __normalize_for_id(s: str) -> str:
+@lru_cache(maxsize=__NORMALIZE_CACHE_SIZE)
+def __normalize_for_id_old(s: str) -> str:
     """Normalize a string for use in an entity id or translation key."""
-    s = __normalize_for_id_old(s)
+    # lower case, replace delimiters and remove all non-alphanumeric characters except underscores
+    s = __NON_WORD.sub("", s.lower().translate(__DELIMITERS))
 
-    # replace umlauts with ascii equivalents
-    UMLAUT_REPLACEMENTS = {
-        "ä": "ae",
-        "ö": "oe",
-        "ü": "ue",
-        "ß": "ss",
-    }
-    for umlaut, replacement in UMLAUT_REPLACEMENTS.items():
-        s = s.replace(umlaut, replacement)
+    # trim underscores from start and end, and collapse multiple underscores
+    return "_".join(part for part in s.split("_") if part)
 
-    # filter to only allow allowed characters (a-z, 0-9, and underscore)
-    def is_allowed_char(c: str) -> bool:
-        return ("0" <= c <= "9") or ("a" <= c <= "z") or c == "_"
 
-    s = "".join(c if is_allowed_char(c) else "" for c in s)
-
-    # remove all occurrences of multiple underscores
-    while "__" in s:
-        s = s.replace("__", "_")
+@lru_cache(maxsize=__NORMALIZE_CACHE_SIZE)
+def __normalize_for_id(s: str) -> str:
+    """Normalize a string for use in an entity id or translation key."""
+    # replace umlauts and filter to only allow allowed characters
+    s = __NON_ID.sub("", __normalize_for_id_old(s).translate(__UMLAUTS))
 
-    return s
+    # remove all occurrences of multiple underscores.
+    # note: underscores at start and end are kept, matching the previous implementation
+    return __MULTIPLE_UNDERSCORES.sub("_", s)
 
 
 def channel_parts_to_entity_id(
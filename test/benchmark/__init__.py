@@ -0,0 +1 @@
+"""Performance benchmarks for the sma_ennexos integration."""
@@ -0,0 +1,97 @@
+"""Synthetic ennexOS plants of different sizes, for benchmarks."""
+
+import json
+
+from custom_components.sma_ennexos.sma.known_channels import KNOWN_CHANNELS
+from custom_components.sma_ennexos.sma.model import ComponentInfo
+
+# plant sizes as (components, channels), from a single small inverter to a large plant
+PLANT_SIZES = [(1, 10), (10, 100), (50, 1_000), (500, 10_000)]
+PLANT_SIZE_IDS = [f"{components}x{channels}" for components, channels in PLANT_SIZES]
+
+# known scalar channels first, so the known share of small plants is realistic
+SCALAR_CHANNEL_IDS = sorted(
+    channel_id for channel_id in KNOWN_CHANNELS if not channel_id.endswith("[]")
+)
+
+# array channel included once per component, with one value per dc input
+ARRAY_CHANNEL_ID = "Measurement.DcMs.Watt[]"
+ARRAY_SIZE = 2
+
+SAMPLE_TIME = "2024-02-01T11:30:00Z"
+
+
+def synthetic_components(component_count: int) -> list[ComponentInfo]:
+    """Create the plant and its components, the plant first."""
+    return [
+        ComponentInfo(component_id="Plant:1", component_type="Plant", name="Plant"),
+        *(
+            ComponentInfo(
+                component_id=f"IGULD:SN-{c}",
+                component_type="Inverter",
+                name=f"Inverter {c}",
+            )
+            for c in range(component_count)
+        ),
+    ]
+
+
+def synthetic_channel_ids(channel_count: int) -> list[str]:
+    """
+    Create the channel ids of a component.
+
+    :param channel_count: number of channels, array channels count once per array index
+    """
+    channel_ids = []
+    if channel_count >= 10:
+        channel_ids.append(ARRAY_CHANNEL_ID)
+        channel_count -= ARRAY_SIZE
+
+    channel_ids.extend(SCALAR_CHANNEL_IDS[:channel_count])
+    channel_ids.extend(
+        f"Measurement.Synthetic.Channel{i}"
+        for i in range(channel_count - len(SCALAR_CHANNEL_IDS))
+    )
+    return channel_ids
+
+
+def synthetic_measurements_payload(
+    component_count: int, channel_count: int
+) -> list[dict]:
+    """
+    Create a measurements/live response of a plant.
+
+    :param component_count: number of components, excluding the plant
+    :param channel_count: number of channels of all components, split evenly
+    """
+    payload = []
+    for component in synthetic_components(component_count)[1:]:
+        for i, channel_id in enumerate(
+            synthetic_channel_ids(channel_count // component_count)
+        ):
+            if channel_id == ARRAY_CHANNEL_ID:
+                values = [
+                    {
+                        "time": SAMPLE_TIME,
+                        "values": [i * 10.0 + n for n in range(ARRAY_SIZE)],
+                    }
+                ]
+            else:
+                values = [{"time": SAMPLE_TIME, "value": i * 10.0}]
+
+            payload.append(
+                {
+                    "channelId": channel_id,
+                    "componentId": component.component_id,
+                    "values": values,
+                }
+            )
+
+    return payload
+
+
+def synthetic_measurements_body(component_count: int, channel_count: int) -> bytes:
+    """Create a measurements/live response of a plant, encoded as it is received."""
+    return json.dumps(
+        synthetic_measurements_payload(component_count, channel_count)
+    ).encode()
@@ -0,0 +1,116 @@
+"""Benchmark sensor entity creation for large plants."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.sma_ennexos.const import CONF_USE_SSL, DOMAIN
+from custom_components.sma_ennexos.coordinator import SMADataCoordinator
+from custom_components.sma_ennexos.sensor import create_sensor_entities
+from custom_components.sma_ennexos.sma.client import SMAApiClient
+from custom_components.sma_ennexos.sma.model import ChannelValues, ComponentInfo
+from test.benchmark.synthetic import (
+    PLANT_SIZE_IDS,
+    PLANT_SIZES,
+    synthetic_components,
+    synthetic_measurements_body,
+)
+
+COMPONENT_COUNT = 50
+CHANNELS_PER_COMPONENT = 100
+
+# mix of known scalar, known array and unknown channels
+CHANNEL_IDS = [
+    "Measurement.GridMs.TotW",
+    "Measurement.GridMs.Hz",
+    "Measurement.GridMs.PhV.phsA",
+    "Measurement.Metering.TotWhOut",
+    "Measurement.Operation.Health",
+    *(f"Measurement.DcMs.Watt[{i}]" for i in range(45)),
+    *(f"Measurement.Unknown.Channel{i}" for i in range(50)),
+]
+
+
+@pytest.mark.benchmark(group="entity-setup")
+async def test_create_5000_sensor_entities(hass, mock_sma_client, benchmark):
+    """Benchmark creating 5,000 sensor entities across 50 components."""
+    assert len(CHANNEL_IDS) == CHANNELS_PER_COMPONENT
+
+    mock_sma_client.components = [
+        ComponentInfo(
+            component_id=f"component{c}",
+            component_type="Inverter",
+            name=f"Inverter {c}",
+        )
+        for c in range(COMPONENT_COUNT)
+    ]
+    mock_sma_client.measurements = [
+        ChannelValues(
+            component_id=f"component{c}",
+            channel_id=channel_id,
+            values=[],
+        )
+        for c in range(COMPONENT_COUNT)
+        for channel_id in CHANNEL_IDS
+    ]
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="benchmark",
+        data={CONF_USE_SSL: False},
+    )
+    coordinator = SMADataCoordinator(
+        hass,
+        config_entry=entry,
+        client=SMAApiClient(
+            host="sma.local", username="user", password="password", session=MagicMock()
+        ),
+    )
+    await coordinator._async_setup()
+
+    entities = benchmark.pedantic(
+        create_sensor_entities,
+        args=(coordinator, coordinator.all_measurements),
+        rounds=5,
+        iterations=1,
+    )
+    assert len(entities) == COMPONENT_COUNT * CHANNELS_PER_COMPONENT
+
+    await coordinator._async_unload()
+
+
+@pytest.mark.benchmark(group="entity-setup-synthetic")
+@pytest.mark.parametrize(("components", "channels"), PLANT_SIZES, ids=PLANT_SIZE_IDS)
+async def test_create_sensor_entities_synthetic(
+    hass, mock_sma_client, benchmark, components, channels
+):
+    """Benchmark creating the sensor entities of synthetic plants."""
+    mock_sma_client.components = synthetic_components(components)
+    mock_sma_client.measurements = SMAApiClient._SMAApiClient__parse_measurements(
+        synthetic_measurements_body(components, channels)
+    )
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="benchmark",
+        data={CONF_USE_SSL: False},
+    )
+    coordinator = SMADataCoordinator(
+        hass,
+        config_entry=entry,
+        client=SMAApiClient(
+            host="sma.local", username="user", password="password", session=MagicMock()
+        ),
+    )
+    await coordinator._async_setup()
+
+    entities = benchmark.pedantic(
+        create_sensor_entities,
+        args=(coordinator, coordinator.all_measurements),
+        rounds=5,
+        iterations=1,
+    )
+    assert len(entities) == channels
+
+    await coordinator._async_unload()
@@ -0,0 +1,47 @@
+"""Measure the import time of the integration, using python -X importtime."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# repository root, so custom_components is importable
+REPO_ROOT = Path(__file__).parents[2]
+
+
+def import_modules(module: str) -> dict[str, int]:
+    """
+    Import a module in a fresh interpreter.
+
+    :param module: name of the module to import
+    :returns: cumulative import time in microseconds of every module imported
+    """
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    # lines look like 'import time:  self [us] | cumulative | imported package'
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+
+    return times
+
+
+@pytest.mark.benchmark(group="import")
+def test_integration_import_time(benchmark):
+    """Measure the cumulative import time of the integration, see test_lazy_imports for what it defers."""
+    times = benchmark.pedantic(
+        import_modules, args=("custom_components.sma_ennexos",), rounds=3
+    )
+    benchmark.extra_info["cumulative_us"] = times["custom_components.sma_ennexos"]
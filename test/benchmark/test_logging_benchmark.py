@@ -0,0 +1,84 @@
+"""Benchmark the cost of debug logging while the debug level is disabled."""
+
+import logging
+
+import pytest
+
+from custom_components.sma_ennexos.sma.log import LazyFormat, LazyLogger, SampledLogger
+
+MESSAGE_COUNT = 10_000
+
+CHANNELS = [(f"component{i % 10}", f"Measurement.Channel{i}") for i in range(1000)]
+
+
+@pytest.fixture
+def logger():
+    """Logger with the debug level disabled, like in a default installation."""
+    logger = logging.getLogger("sma_ennexos_benchmark")
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+@pytest.mark.benchmark(group="logging")
+def test_fstring_logging(benchmark, logger):
+    """Benchmark f-string debug messages, as a baseline."""
+
+    def log_messages() -> None:
+        for i in range(MESSAGE_COUNT):
+            logger.debug(f"getting device info for component=component{i}")
+
+    benchmark(log_messages)
+
+
+@pytest.mark.benchmark(group="logging")
+def test_lazy_logging(benchmark, logger):
+    """Benchmark lazily formatted debug messages."""
+    lazy_logger = LazyLogger(logger)
+
+    def log_messages() -> None:
+        for i in range(MESSAGE_COUNT):
+            lazy_logger.debug("getting device info for component=component%s", i)
+
+    benchmark(log_messages)
+
+
+@pytest.mark.benchmark(group="logging")
+def test_sampled_logging(benchmark, logger):
+    """Benchmark sampled per-entity update messages."""
+    sampled_logger = SampledLogger(logger, 100)
+
+    def log_messages() -> None:
+        for i in range(MESSAGE_COUNT):
+            sampled_logger.debug("updated %s = %s (%s)", "sensor.x", i, int)
+
+    benchmark(log_messages)
+
+
+@pytest.mark.benchmark(group="logging-query")
+def test_query_join_logging(benchmark, logger):
+    """Benchmark joining every channel of a query into a debug message, as a baseline."""
+
+    def log_query() -> None:
+        logger.debug(
+            "generated measurements query: %s",
+            "; ".join(f"{component}@{channel}" for component, channel in CHANNELS),
+        )
+
+    benchmark(log_query)
+
+
+@pytest.mark.benchmark(group="logging-query")
+def test_query_lazy_logging(benchmark, logger):
+    """Benchmark deferring the join of every channel until the message is formatted."""
+
+    def log_query() -> None:
+        logger.debug(
+            "generated measurements query: %s",
+            LazyFormat(
+                lambda: "; ".join(
+                    f"{component}@{channel}" for component, channel in CHANNELS
+                )
+            ),
+        )
+
+    benchmark(log_query)
@@ -0,0 +1,35 @@
+"""Benchmark parsing measurements responses of synthetic plants."""
+
+import pytest
+
+from custom_components.sma_ennexos.sma.client import SMAApiClient
+from custom_components.sma_ennexos.sma.model import ChannelValues
+from test.benchmark.synthetic import (
+    PLANT_SIZE_IDS,
+    PLANT_SIZES,
+    synthetic_measurements_body,
+    synthetic_measurements_payload,
+)
+
+
+@pytest.mark.benchmark(group="parse-channel-values")
+@pytest.mark.parametrize(("components", "channels"), PLANT_SIZES, ids=PLANT_SIZE_IDS)
+def test_channel_values_from_dict(benchmark, components, channels):
+    """Benchmark ChannelValues.from_dict for all measurements of a plant."""
+    payload = synthetic_measurements_payload(components, channels)
+
+    parsed = benchmark(
+        lambda: [ChannelValues.from_dict(measurement) for measurement in payload]
+    )
+    assert sum(len(cvs) for cvs in parsed) == channels
+
+
+@pytest.mark.benchmark(group="parse-measurements")
+@pytest.mark.parametrize(("components", "channels"), PLANT_SIZES, ids=PLANT_SIZE_IDS)
+def test_parse_measurements(benchmark, components, channels):
+    """Benchmark decoding and parsing a measurements response, as done by the client."""
+    body = synthetic_measurements_body(components, channels)
+    benchmark.extra_info["bytes"] = len(body)
+
+    parsed = benchmark(SMAApiClient._SMAApiClient__parse_measurements, body)
+    assert len(parsed) == channels
@@ -0,0 +1,100 @@
+"""Benchmark the update cycle of the coordinator for synthetic plants."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.sma_ennexos.const import (
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_USE_SSL,
+    CONF_USERNAME,
+    CONF_VERIFY_SSL,
+    DOMAIN,
+)
+from custom_components.sma_ennexos.coordinator import SMADataCoordinator
+from custom_components.sma_ennexos.sma.client import SMAApiClient
+from test.benchmark.synthetic import (
+    PLANT_SIZE_IDS,
+    PLANT_SIZES,
+    synthetic_components,
+    synthetic_measurements_body,
+)
+
+
+@pytest.mark.benchmark(group="query")
+@pytest.mark.parametrize(("components", "channels"), PLANT_SIZES, ids=PLANT_SIZE_IDS)
+async def test_query_building(hass, benchmark, components, channels):
+    """Benchmark building the measurements query from the listeners of all channels."""
+    measurements = SMAApiClient._SMAApiClient__parse_measurements(
+        synthetic_measurements_body(components, channels)
+    )
+
+    coordinator = SMADataCoordinator(
+        hass,
+        config_entry=MockConfigEntry(
+            domain=DOMAIN,
+            entry_id="benchmark",
+            data={CONF_USE_SSL: False},
+        ),
+        client=SMAApiClient(
+            host="sma.local", username="user", password="password", session=MagicMock()
+        ),
+    )
+    remove_listeners = [
+        coordinator.async_add_listener(
+            lambda: None, (measurement.component_id, measurement.channel_id)
+        )
+        for measurement in measurements
+    ]
+
+    query = benchmark(lambda: coordinator._SMADataCoordinator__query)
+    assert len(query) == channels
+
+    for remove_listener in remove_listeners:
+        remove_listener()
+
+
+@pytest.mark.benchmark(group="update-cycle")
+@pytest.mark.parametrize(("components", "channels"), PLANT_SIZES, ids=PLANT_SIZE_IDS)
+async def test_update_dispatch_cycle(
+    hass, mock_sma_client, benchmark, components, channels
+):
+    """
+    Benchmark one update cycle, from the received response to all sensors written.
+
+    the response is parsed and dispatched to the enabled sensors of the plant.
+    requests are not included, as they are dominated by the device.
+    """
+    body = synthetic_measurements_body(components, channels)
+    mock_sma_client.components = synthetic_components(components)
+    mock_sma_client.measurements = SMAApiClient._SMAApiClient__parse_measurements(body)
+
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="benchmark",
+        data={
+            CONF_HOST: "sma.local",
+            CONF_USERNAME: "user",
+            CONF_PASSWORD: "password",
+            CONF_USE_SSL: False,
+            CONF_VERIFY_SSL: True,
+        },
+    )
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator: SMADataCoordinator = hass.data[DOMAIN][config_entry.entry_id]
+    benchmark.extra_info["listeners"] = len(coordinator._listeners)
+
+    def update_cycle() -> None:
+        coordinator.async_set_updated_data(
+            SMAApiClient._SMAApiClient__parse_measurements(body)
+        )
+
+    benchmark.pedantic(update_cycle, rounds=10, iterations=1)
+    assert len(coordinator.data) == channels
+
+    await hass.config_entries.async_unload(config_entry.entry_id)
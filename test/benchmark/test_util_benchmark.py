@@ -0,0 +1,45 @@
+"""Benchmark id normalization."""
+
+import pytest
+
+from custom_components.sma_ennexos.sma.known_channels import __KNOWN_CHANNELS
+from custom_components.sma_ennexos.util import channel_parts_to_entity_id
+from test.test_util import legacy_normalize_for_id
+
+COMPONENT_NAMES = [f"Mein Gerät {i}" for i in range(50)]
+
+
+def create_entity_ids() -> list[str]:
+    """Create entity ids for all known channels of all components."""
+    return [
+        channel_parts_to_entity_id(component_name, channel_id, "sensor")
+        for component_name in COMPONENT_NAMES
+        for channel_id in __KNOWN_CHANNELS
+    ]
+
+
+def create_entity_ids_legacy() -> list[str]:
+    """Create entity ids using the previous normalization, for comparison."""
+    # array index as suffix, like channel_parts_to_entity_id
+    channel_ids = [
+        channel_id.replace("[", "_").replace("]", "") for channel_id in __KNOWN_CHANNELS
+    ]
+    return [
+        "sensor." + legacy_normalize_for_id(f"{component_name}_{channel_id}")
+        for component_name in COMPONENT_NAMES
+        for channel_id in channel_ids
+    ]
+
+
+@pytest.mark.benchmark(group="normalization")
+def test_normalize_entity_ids(benchmark):
+    """Benchmark the normalization of entity ids."""
+    entity_ids = benchmark(create_entity_ids)
+    assert len(entity_ids) == len(COMPONENT_NAMES) * len(__KNOWN_CHANNELS)
+
+
+@pytest.mark.benchmark(group="normalization")
+def test_normalize_entity_ids_legacy(benchmark):
+    """Benchmark the previous normalization of entity ids, as a baseline."""
+    entity_ids = benchmark(create_entity_ids_legacy)
+    assert entity_ids == create_entity_ids()
@@ -42,32 +42,43 @@ class MockSmaClientHandle:
 
     cnt_login: int = 0
     cnt_logout: int = 0
+    cnt_get_navigation: int = 0
     cnt_get_all_components: int = 0
     cnt_get_all_live_measurements: int = 0
     cnt_get_live_measurements: int = 0
     cnt_get_localizations: int = 0
+    cnt_get_localization_fingerprint: int = 0
 
     def reset_counts(self):
         """Reset all call counts to zero."""
         self.cnt_login = 0
         self.cnt_logout = 0
+        self.cnt_get_navigation = 0
         self.cnt_get_all_components = 0
         self.cnt_get_all_live_measurements = 0
         self.cnt_get_live_measurements = 0
         self.cnt_get_localizations = 0
+        self.cnt_get_localization_fingerprint = 0
 
-    # return value for get_all_components
+    # return value for get_navigation and get_all_components
     components: list[ComponentInfo] = []
 
+    # navigation passed to the last get_all_components call
+    last_navigation: list[ComponentInfo] | None = None
+
     # return value for get_all_live_measurements and get_live_measurements
     measurements: list[ChannelValues] = []
 
     # return value for get_localizations
     localizations: list[tuple[str, dict]] = []
 
+    # return value for get_localization_fingerprint
+    localization_fingerprint: str = "mock-fingerprint"
+
     # additional hooks
     on_login: Callable | None = None
     on_logout: Callable | None = None
+    on_get_navigation: Callable | None = None
     on_get_all_components: Callable | None = None
     on_get_all_live_measurements: Callable[[list[str]], None] | None = None
     on_get_live_measurements: (
@@ -94,11 +105,19 @@ def mock_sma_client():
             hnd.on_logout()
         hnd.cnt_logout += 1
 
-    async def get_all_components():
+    async def get_navigation():
+        nonlocal hnd
+        if hnd.on_get_navigation:
+            hnd.on_get_navigation()
+        hnd.cnt_get_navigation += 1
+        return hnd.components
+
+    async def get_all_components(navigation: list[ComponentInfo] | None = None):
         nonlocal hnd
         if hnd.on_get_all_components:
             hnd.on_get_all_components()
         hnd.cnt_get_all_components += 1
+        hnd.last_navigation = navigation
         return hnd.components
 
     async def get_all_live_measurements(component_ids: list[str]):
@@ -113,15 +132,27 @@ def mock_sma_client():
         if hnd.on_get_live_measurements:
             hnd.on_get_live_measurements(query)
         hnd.cnt_get_live_measurements += 1
-        return hnd.measurements
 
-    async def get_localizations():
+        # like the device, only the queried channels are returned
+        queried = {(item.component_id, item.channel_id) for item in query}
+        return [
+            measurement
+            for measurement in hnd.measurements
+            if (measurement.component_id, measurement.channel_id) in queried
+        ]
+
+    async def get_localizations(cache_dir=None):
         nonlocal hnd
         if hnd.on_get_localizations:
             hnd.on_get_localizations()
         hnd.cnt_get_localizations += 1
         return hnd.localizations
 
+    async def get_localization_fingerprint():
+        nonlocal hnd
+        hnd.cnt_get_localization_fingerprint += 1
+        return hnd.localization_fingerprint
+
     with (
         mock.patch(
             "custom_components.sma_ennexos.sma.client.SMAApiClient.login", wraps=login
@@ -129,6 +160,10 @@ def mock_sma_client():
         mock.patch(
             "custom_components.sma_ennexos.sma.client.SMAApiClient.logout", wraps=logout
         ),
+        mock.patch(
+            "custom_components.sma_ennexos.sma.client.SMAApiClient.get_navigation",
+            wraps=get_navigation,
+        ),
         mock.patch(
             "custom_components.sma_ennexos.sma.client.SMAApiClient.get_all_components",
             wraps=get_all_components,
@@ -145,6 +180,10 @@ def mock_sma_client():
             "custom_components.sma_ennexos.sma.client.SMAApiClient.get_localizations",
             wraps=get_localizations,
         ),
+        mock.patch(
+            "custom_components.sma_ennexos.sma.client.SMAApiClient.get_localization_fingerprint",
+            wraps=get_localization_fingerprint,
+        ),
     ):
         yield hnd
 
@@ -158,9 +197,15 @@ def mock_known_channels():
         nonlocal known_channels
         return known_channels.get(channel_id)
 
-    with mock.patch(
-        # have to patch the importing module, not the defining module
-        "custom_components.sma_ennexos.sensor.get_known_channel",
-        wraps=get_known_channel,
-    ) as m:
+    with (
+        mock.patch(
+            # have to patch the importing module, not the defining module
+            "custom_components.sma_ennexos.sensor.get_known_channel",
+            wraps=get_known_channel,
+        ) as m,
+        # descriptors precompiled from the real known channels do not apply
+        mock.patch(
+            "custom_components.sma_ennexos.sensor._KNOWN_CHANNEL_DESCRIPTORS", {}
+        ),
+    ):
         yield (m, known_channels)
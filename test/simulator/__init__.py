@@ -0,0 +1,15 @@
+"""
+Simulator of the ennexOS api, for load and latency testing.
+
+run standalone using "python -m test.simulator --help".
+"""
+
+from .plant import SimulatedPlant
+from .server import EnnexOSSimulator, SimulatorConfig, SimulatorStats
+
+__all__ = [
+    "EnnexOSSimulator",
+    "SimulatedPlant",
+    "SimulatorConfig",
+    "SimulatorStats",
+]
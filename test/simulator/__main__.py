@@ -0,0 +1,84 @@
+"""Run the ennexOS simulator standalone, e.g. to point a Home Assistant instance at it."""
+
+import argparse
+import asyncio
+
+from .server import EnnexOSSimulator, SimulatorConfig
+
+
+def __parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="python -m test.simulator",
+        description="Simulate the ennexOS api of a SMA device.",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="host to listen on")
+    parser.add_argument("--port", type=int, default=8080, help="port to listen on")
+    parser.add_argument(
+        "--components", type=int, default=10, help="number of inverters"
+    )
+    parser.add_argument(
+        "--channels", type=int, default=100, help="number of channels of all inverters"
+    )
+    parser.add_argument("--username", default="user")
+    parser.add_argument("--password", default="password")
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="latency per request, in seconds"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="random extra latency, in seconds"
+    )
+    parser.add_argument(
+        "--token-lifetime",
+        type=int,
+        default=300,
+        help="lifetime of access tokens, in seconds",
+    )
+    parser.add_argument(
+        "--unauthorized-rate",
+        type=float,
+        default=0.0,
+        help="share of authenticated requests answered with 401, 0 to 1",
+    )
+    parser.add_argument(
+        "--cpu-cost", type=float, default=0.0, help="cpu time per request, in seconds"
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    return parser.parse_args()
+
+
+async def __run(args: argparse.Namespace) -> None:
+    """Run the simulator until cancelled."""
+    simulator = EnnexOSSimulator(
+        SimulatorConfig(
+            components=args.components,
+            channels=args.channels,
+            username=args.username,
+            password=args.password,
+            latency=args.latency,
+            jitter=args.jitter,
+            token_lifetime=args.token_lifetime,
+            unauthorized_rate=args.unauthorized_rate,
+            cpu_cost=args.cpu_cost,
+            seed=args.seed,
+        )
+    )
+
+    address = await simulator.start(args.host, args.port)
+    print(
+        f"simulating {args.components} inverters with "
+        f"{simulator.plant.channel_count} channels on http://{address}, "
+        f"login as {args.username}:{args.password} without ssl"
+    )
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await simulator.stop()
+        print(f"handled requests: {dict(simulator.stats.requests)}")
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(__run(__parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,168 @@
+"""Simulated plant served by the ennexOS simulator."""
+
+import math
+import re
+import time
+from datetime import UTC, datetime
+
+from test.benchmark.synthetic import (
+    ARRAY_CHANNEL_ID,
+    ARRAY_SIZE,
+    synthetic_channel_ids,
+    synthetic_components,
+)
+
+# period of the simulated values, in seconds
+VALUE_PERIOD = 300.0
+
+# accessed from classes, so not name-mangled.
+# index of a array channel, e.g. the "[0]" of "Measurement.DcMs.Watt[0]"
+_ARRAY_INDEX = re.compile(r"\[\d*\]$")
+
+
+class SimulatedPlant:
+    """
+    a plant of inverters, using the synthetic channels of the benchmarks.
+
+    values follow a slow sine wave, so they change between polls like those of a real device.
+    """
+
+    __channels: dict[str, list[str]]
+    __inverter_indices: dict[str, int]
+
+    def __init__(self, component_count: int, channel_count: int) -> None:
+        """
+        Initialize plant.
+
+        :param component_count: number of inverters, excluding the plant itself
+        :param channel_count: number of channels of all inverters, split evenly
+        """
+        if component_count < 1:
+            raise ValueError("component_count must be at least 1")
+
+        self.components = synthetic_components(component_count)
+        self.plant = self.components[0]
+        self.__channels = {
+            component.component_id: synthetic_channel_ids(
+                channel_count // component_count
+            )
+            for component in self.components[1:]
+        }
+        self.__inverter_indices = {
+            component.component_id: index
+            for index, component in enumerate(self.components[1:])
+        }
+
+    @property
+    def channel_count(self) -> int:
+        """Number of channels of all components, array channels count once per index."""
+        return sum(
+            ARRAY_SIZE if channel_id == ARRAY_CHANNEL_ID else 1
+            for channel_ids in self.__channels.values()
+            for channel_id in channel_ids
+        )
+
+    def navigation(self, parent_id: str | None) -> list[dict]:
+        """Response of the navigation endpoint, the plant or its children."""
+        if parent_id is None:
+            components = [self.plant]
+        elif parent_id == self.plant.component_id:
+            components = self.components[1:]
+        else:
+            components = []
+
+        return [
+            {
+                "componentId": component.component_id,
+                "componentType": component.component_type,
+                "name": component.name,
+            }
+            for component in components
+        ]
+
+    def device_info(self, component_id: str) -> dict | None:
+        """Response of the plants/.../devices endpoint, None if the component is unknown."""
+        index = self.__inverter_indices.get(component_id)
+        if index is None:
+            return None
+
+        return {
+            "name": f"Inverter {index}",
+            "product": "Sunny Tripower X 25",
+            "vendor": "SMA",
+            "serial": f"SN-{index}",
+            "firmwareVersion": "3.10.10.R",
+            "ipAddress": f"10.0.{index // 256}.{index % 256}",
+            "generatorPower": 25000,
+            "productTagId": 9402,
+        }
+
+    def widget_info(self, component_id: str) -> dict | None:
+        """Response of the widgets/deviceinfo endpoint, None if the component is unknown."""
+        index = self.__inverter_indices.get(component_id)
+        if index is None:
+            return None
+
+        return {
+            "name": "STP 25-50",
+            "serial": f"SN-{index}",
+            "deviceInfoFeatures": [
+                {"infoWidgetType": "FirmwareVersion", "value": "3.10.10.R"},
+            ],
+            "productTagId": 9402,
+        }
+
+    def live_measurements(self, query: list[dict]) -> list[dict]:
+        """
+        Response of the measurements/live endpoint.
+
+        :param query: query items, either componentId only for all channels of a component,
+        or componentId and channelId for a single channel.
+        array channels are queried by any index, e.g. "[0]", and returned with all values once
+        """
+        # unique channels of the query, in order
+        queried: dict[tuple[str, str], None] = {}
+        for item in query:
+            component_id = item.get("componentId")
+            channel_ids = self.__channels.get(component_id, [])
+            if "channelId" in item:
+                channel_id = _ARRAY_INDEX.sub("[]", item["channelId"])
+                channel_ids = [c for c in channel_ids if c == channel_id]
+
+            for channel_id in channel_ids:
+                queried[(component_id, channel_id)] = None
+
+        now = time.time()
+        sample_time = datetime.fromtimestamp(now, UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+        measurements = []
+        for component_id, channel_id in queried:
+            measurements.append(
+                {
+                    "channelId": channel_id,
+                    "componentId": component_id,
+                    "values": [
+                        self.__sample(component_id, channel_id, sample_time, now)
+                    ],
+                }
+            )
+
+        return measurements
+
+    @staticmethod
+    def __sample(
+        component_id: str, channel_id: str, sample_time: str, now: float
+    ) -> dict:
+        """Get the current sample of a channel."""
+        # each channel gets its own phase, so channels don't change in lockstep
+        phase = (hash((component_id, channel_id)) % 360) / 180 * math.pi
+        value = round(
+            1000 + 500 * math.sin(2 * math.pi * now / VALUE_PERIOD + phase), 3
+        )
+
+        if channel_id == ARRAY_CHANNEL_ID:
+            return {
+                "time": sample_time,
+                "values": [value + n for n in range(ARRAY_SIZE)],
+            }
+        return {"time": sample_time, "value": value}
@@ -0,0 +1,325 @@
+"""aiohttp server simulating the ennexOS api of a SMA device."""
+
+import asyncio
+import json
+import random
+import secrets
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+from aiohttp import web
+
+from .plant import SimulatedPlant
+
+# base path of all api endpoints
+API_BASE = "/api/v1"
+
+
+@dataclass(kw_only=True)
+class SimulatorConfig:
+    """configuration of the simulated device."""
+
+    # size of the plant, see SimulatedPlant
+    components: int = 10
+    channels: int = 100
+
+    # credentials accepted by the token endpoint
+    username: str = "user"
+    password: str = "password"
+
+    # latency added to every request, plus a uniformly random jitter of up to jitter, in seconds
+    latency: float = 0.0
+    jitter: float = 0.0
+
+    # lifetime of access tokens, in seconds
+    token_lifetime: int = 300
+
+    # share of authenticated requests answered with 401, revoking the token, 0 to 1
+    unauthorized_rate: float = 0.0
+
+    # cpu time the device spends per request, in seconds.
+    # burned in a thread, so it competes with the client for the cpu but not the event loop
+    cpu_cost: float = 0.0
+
+    # seed of the random jitter and 401s, None for a random seed
+    seed: int | None = None
+
+
+@dataclass
+class _Token:
+    """a issued access token."""
+
+    session_id: str
+    refresh_token: str
+    expires_at: float
+
+
+@dataclass
+class SimulatorStats:
+    """counters of the requests handled by the simulator."""
+
+    # requests by endpoint, e.g. "POST measurements/live"
+    requests: Counter[str] = field(default_factory=Counter)
+
+    # logins using username and password
+    logins: int = 0
+
+    # logins using a refresh token
+    refreshes: int = 0
+
+    # requests answered with 401, because the token was expired or invalid
+    rejected: int = 0
+
+    # requests answered with 401 by unauthorized_rate
+    injected_unauthorized: int = 0
+
+
+class EnnexOSSimulator:
+    """
+    simulated ennexOS device, serving a SimulatedPlant.
+
+    covers the endpoints used by SMAApiClient: token, refreshtoken, navigation,
+    plants/.../devices, widgets/deviceinfo and measurements/live.
+    localizations are not simulated, the device web ui answers 404.
+    """
+
+    __config: SimulatorConfig
+    __random: random.Random
+    __tokens: dict[str, _Token]
+    __runner: web.AppRunner | None
+    __address: str | None
+
+    def __init__(self, config: SimulatorConfig) -> None:
+        """Initialize simulator."""
+        self.__config = config
+        # only drives the simulated jitter and 401s, seeded for reproducible runs, not security relevant
+        self.__random = random.Random(config.seed)  # noqa: S311
+        self.__tokens = {}
+        self.__runner = None
+        self.__address = None
+
+        self.plant = SimulatedPlant(config.components, config.channels)
+        self.stats = SimulatorStats()
+
+        self.app = web.Application(middlewares=[self.__middleware])
+        self.app.add_routes(
+            [
+                web.post(f"{API_BASE}/token", self.__handle_token),
+                web.delete(f"{API_BASE}/refreshtoken", self.__handle_refreshtoken),
+                web.get(f"{API_BASE}/navigation", self.__handle_navigation),
+                web.get(
+                    f"{API_BASE}/plants/{{plant_id}}/devices/{{device_id}}",
+                    self.__handle_device,
+                ),
+                web.get(f"{API_BASE}/widgets/deviceinfo", self.__handle_widget),
+                web.post(f"{API_BASE}/measurements/live", self.__handle_live),
+            ]
+        )
+
+    @property
+    def config(self) -> SimulatorConfig:
+        """Configuration of the simulator, changes apply to the next request."""
+        return self.__config
+
+    @property
+    def address(self) -> str | None:
+        """Host and port the simulator listens on, None if it is not started."""
+        return self.__address
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """
+        Start serving the api.
+
+        :param port: port to listen on, 0 for a free port
+        :returns: host and port the simulator listens on, e.g. "127.0.0.1:8080"
+        """
+        self.__runner = web.AppRunner(self.app)
+        await self.__runner.setup()
+        site = web.TCPSite(self.__runner, host, port)
+        await site.start()
+
+        listen_host, listen_port = self.__runner.addresses[0][:2]
+        self.__address = f"{listen_host}:{listen_port}"
+        return self.__address
+
+    async def stop(self) -> None:
+        """Stop serving the api."""
+        if self.__runner is not None:
+            await self.__runner.cleanup()
+            self.__runner = None
+            self.__address = None
+
+    def expire_tokens(self) -> None:
+        """Expire all access tokens, refresh tokens stay valid."""
+        for token in self.__tokens.values():
+            token.expires_at = 0.0
+
+    @web.middleware
+    async def __middleware(
+        self,
+        request: web.Request,
+        handler: Callable[[web.Request], Awaitable[web.StreamResponse]],
+    ) -> web.StreamResponse:
+        """Add latency and cpu cost to every request, and count it."""
+        endpoint = request.path.removeprefix(f"{API_BASE}/")
+        self.stats.requests[f"{request.method} {endpoint}"] += 1
+
+        delay = self.__config.latency
+        if self.__config.jitter > 0:
+            delay += self.__random.uniform(0, self.__config.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if self.__config.cpu_cost > 0:
+            await asyncio.get_running_loop().run_in_executor(
+                None, _burn_cpu, self.__config.cpu_cost
+            )
+
+        return await handler(request)
+
+    async def __handle_token(self, request: web.Request) -> web.Response:
+        """Issue a token, using username and password or a refresh token."""
+        form = await request.post()
+        grant_type = form.get("grant_type")
+
+        if grant_type == "password":
+            if (
+                form.get("username") != self.__config.username
+                or form.get("password") != self.__config.password
+            ):
+                return self.__unauthorized()
+
+            self.stats.logins += 1
+            session_id = secrets.token_hex(16)
+        elif grant_type == "refresh_token":
+            previous = self.__revoke(refresh_token=form.get("refresh_token"))
+            if previous is None or previous.session_id != request.cookies.get(
+                "JSESSIONID"
+            ):
+                return self.__unauthorized()
+
+            self.stats.refreshes += 1
+            session_id = previous.session_id
+        else:
+            return web.json_response({"error": "unsupported_grant_type"}, status=400)
+
+        access_token = secrets.token_hex(16)
+        refresh_token = secrets.token_hex(16)
+        self.__tokens[access_token] = _Token(
+            session_id=session_id,
+            refresh_token=refresh_token,
+            expires_at=time.monotonic() + self.__config.token_lifetime,
+        )
+
+        response = web.json_response(
+            {
+                "access_token": access_token,
+                "refresh_token": refresh_token,
+                "token_type": "bearer",
+                "expires_in": self.__config.token_lifetime,
+            }
+        )
+        response.set_cookie("JSESSIONID", session_id)
+        return response
+
+    async def __handle_refreshtoken(self, request: web.Request) -> web.Response:
+        """Revoke a refresh token and its access token, i.e. logout."""
+        self.__revoke(refresh_token=request.query.get("refreshToken"))
+        return web.Response()
+
+    async def __handle_navigation(self, request: web.Request) -> web.Response:
+        """Navigation of the plant."""
+        if (rejected := self.__authorize(request)) is not None:
+            return rejected
+
+        return web.json_response(self.plant.navigation(request.query.get("parentId")))
+
+    async def __handle_device(self, request: web.Request) -> web.Response:
+        """Device info of a component."""
+        if (rejected := self.__authorize(request)) is not None:
+            return rejected
+
+        info = None
+        if request.match_info["plant_id"] == self.plant.plant.component_id:
+            info = self.plant.device_info(request.match_info["device_id"])
+        if info is None:
+            raise web.HTTPNotFound
+
+        return web.json_response(info)
+
+    async def __handle_widget(self, request: web.Request) -> web.Response:
+        """Widget info of a component."""
+        if (rejected := self.__authorize(request)) is not None:
+            return rejected
+
+        info = self.plant.widget_info(request.query.get("deviceId", ""))
+        if info is None:
+            raise web.HTTPNotFound
+
+        return web.json_response(info)
+
+    async def __handle_live(self, request: web.Request) -> web.Response:
+        """Live measurements of the queried components and channels."""
+        if (rejected := self.__authorize(request)) is not None:
+            return rejected
+
+        query = await request.json()
+        if not isinstance(query, list):
+            raise web.HTTPBadRequest
+
+        return web.Response(
+            body=json.dumps(self.plant.live_measurements(query)).encode(),
+            content_type="application/json",
+        )
+
+    def __authorize(self, request: web.Request) -> web.Response | None:
+        """
+        Check the token and session of a request.
+
+        :returns: response rejecting the request, None if it is authorized
+        """
+        authorization = request.headers.get("Authorization", "")
+        token = self.__tokens.get(authorization.removeprefix("Bearer "))
+        if (
+            token is None
+            or token.expires_at <= time.monotonic()
+            or token.session_id != request.cookies.get("JSESSIONID")
+        ):
+            self.stats.rejected += 1
+            return self.__unauthorized()
+
+        if (
+            self.__config.unauthorized_rate > 0
+            and self.__random.random() < self.__config.unauthorized_rate
+        ):
+            # like a device restart, the client has to login again
+            self.stats.injected_unauthorized += 1
+            self.__revoke(refresh_token=token.refresh_token)
+            return self.__unauthorized()
+
+        return None
+
+    def __revoke(self, refresh_token: object) -> _Token | None:
+        """
+        Revoke a access token by its refresh token.
+
+        :returns: the revoked token, None if there is no token with the refresh token
+        """
+        for access_token, token in self.__tokens.items():
+            if token.refresh_token == refresh_token:
+                return self.__tokens.pop(access_token)
+        return None
+
+    @staticmethod
+    def __unauthorized() -> web.Response:
+        """Response rejecting a request."""
+        return web.json_response({"error": "unauthorized"}, status=401)
+
+
+def _burn_cpu(seconds: float) -> None:
+    """Keep the cpu busy for the given cpu time."""
+    end = time.thread_time() + seconds
+    while time.thread_time() < end:
+        pass
@@ -1,6 +1,7 @@
 """Helper for mocking aiohttp ClientSession requests."""
 
 import asyncio
+import json
 from collections.abc import Callable
 from typing import Any, TypeVar
 from unittest.mock import MagicMock
@@ -51,6 +52,10 @@ class ClientResponseMock:
         """Return mock data."""
         return self.data
 
+    async def read(self) -> bytes:
+        """Return mock data, encoded as json."""
+        return json.dumps(self.data).encode()
+
     @property
     def ok(self) -> bool:
         """Return True if status is less than 400."""
@@ -1,6 +1,7 @@
 """unit tests for model.AuthToken."""
 
 import time
+from datetime import datetime
 
 import pytest
 
@@ -59,3 +60,32 @@ def test_new_instances_get_fresh_granted_at():
     )
 
     assert second.granted_at > first.granted_at
+
+
+def test_to_dict_round_trip():
+    """Test that AuthToken.to_dict() can be restored using from_dict(), keeping the grant time."""
+    token = AuthToken(
+        access_token="abc",
+        refresh_token="def",
+        token_type="Bearer",
+        expires_in=3600,
+        granted_at=datetime(2024, 2, 1, 11, 25, 46),
+    )
+
+    restored = AuthToken.from_dict(token.to_dict())
+    assert restored == token
+    assert restored.is_expired is True
+
+
+def test_from_dict_invalid_granted_at():
+    """Test that AuthToken.from_dict() raises an exception if granted_at is invalid."""
+    with pytest.raises(SMAApiParsingError):
+        AuthToken.from_dict(
+            {
+                "access_token": "abc",
+                "refresh_token": "def",
+                "token_type": "Bearer",
+                "expires_in": 3600,
+                "granted_at": "not a timestamp",
+            }
+        )
@@ -90,3 +90,81 @@ def test_from_dict_invalid_dict():
     """Test that ChannelValues.from_dict() raises an exception if the dict is invalid."""
     with pytest.raises(SMAApiParsingError):
         ChannelValues.from_dict({})
+
+
+def test_from_dict_valid_dict_array_channel_multiple_values():
+    """Test that ChannelValues.from_dict() keeps all time slices of a array channel."""
+    # prepare dict
+    channel_values_dict = {
+        "channelId": "TheChannelId[]",
+        "componentId": "The:Component-Id",
+        "values": [
+            {"time": "2024-02-01T11:25:46Z", "values": [10, 20.5]},
+            {"time": "2024-02-01T11:30:00Z", "values": [11, None]},
+            {"time": "2024-02-01T11:35:00Z", "values": [12]},
+        ],
+    }
+
+    # call from_dict()
+    channel_values = ChannelValues.from_dict(channel_values_dict)
+
+    # check result
+    assert len(channel_values) == 2
+
+    assert channel_values[0].channel_id == "TheChannelId[0]"
+    assert [v.value for v in channel_values[0].values] == [10, 11, 12]
+    assert channel_values[0].latest_value.time == "2024-02-01T11:35:00Z"
+    assert channel_values[0].latest_value.value == 12
+
+    # missing values are filled with None
+    assert channel_values[1].channel_id == "TheChannelId[1]"
+    assert [v.value for v in channel_values[1].values] == [20.5, None, None]
+    assert channel_values[1].latest_value.time == "2024-02-01T11:35:00Z"
+    assert channel_values[1].latest_value.value is None
+
+
+def test_from_dict_array_channel_unexpected_values():
+    """Test that ChannelValues.from_dict() keeps array elements that are not a SMAValue as-is."""
+    channel_values = ChannelValues.from_dict(
+        {
+            "channelId": "TheChannelId[]",
+            "componentId": "The:Component-Id",
+            "values": [
+                {"time": "2024-02-01T11:25:46Z", "values": [{"a": 1}, "NaN", 7]},
+            ],
+        }
+    )
+
+    assert [cv.latest_value.value for cv in channel_values] == [{"a": 1}, None, 7]
+
+
+def test_from_dict_invalid_array_channel():
+    """Test that ChannelValues.from_dict() raises an exception if a array time slice is invalid."""
+    with pytest.raises(SMAApiParsingError):
+        ChannelValues.from_dict(
+            {
+                "channelId": "TheChannelId[]",
+                "componentId": "The:Component-Id",
+                "values": [
+                    {"time": "2024-02-01T11:25:46Z", "values": [10]},
+                    {"time": "2024-02-01T11:30:00Z"},
+                ],
+            }
+        )
+
+
+def test_to_dict():
+    """Test that ChannelValues.to_dict() matches the layout of asdict()."""
+    channel_values = ChannelValues.from_dict(
+        {
+            "channelId": "TheChannelId[]",
+            "componentId": "The:Component-Id",
+            "values": [{"time": "2024-02-01T11:25:46Z", "values": [10]}],
+        }
+    )
+
+    assert channel_values[0].to_dict() == {
+        "channel_id": "TheChannelId[0]",
+        "component_id": "The:Component-Id",
+        "values": [{"time": "2024-02-01T11:25:46Z", "value": 10}],
+    }
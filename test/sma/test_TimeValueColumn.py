@@ -0,0 +1,77 @@
+"""unit tests for model.TimeValueColumn."""
+
+import pytest
+
+from custom_components.sma_ennexos.sma.model import TimeValueColumn, TimeValuePair
+
+TIMES = ("2024-02-01T11:25:46Z", "2024-02-01T11:30:00Z", "2024-02-01T11:35:00Z")
+
+
+def test_int_column():
+    """Test that integer values are stored in a typed int array."""
+    column = TimeValueColumn(times=TIMES, values=[1, 2, 3])
+
+    assert column.raw_values.typecode == "q"
+    assert len(column) == 3
+    assert column[0] == TimeValuePair(time=TIMES[0], value=1)
+    assert column[-1] == TimeValuePair(time=TIMES[2], value=3)
+    assert isinstance(column[-1].value, int)
+
+
+def test_float_column_with_none():
+    """Test that float values with None are stored in a typed float array."""
+    column = TimeValueColumn(times=TIMES, values=[1.5, 2.5, None])
+
+    assert column.raw_values.typecode == "d"
+    assert [v.value for v in column] == [1.5, 2.5, None]
+
+
+def test_int_column_with_none():
+    """Test that integer values with gaps keep their type, and are not stored as floats."""
+    column = TimeValueColumn(times=TIMES, values=[307, None, 2**53 + 1])
+
+    assert isinstance(column.raw_values, list)
+    assert [v.value for v in column] == [307, None, 2**53 + 1]
+    assert str(column[0].value) == "307"
+
+
+def test_int_and_float_column():
+    """Test that integers mixed with floats keep their type."""
+    column = TimeValueColumn(times=TIMES, values=[1, 2.5, None])
+
+    assert isinstance(column.raw_values, list)
+    assert [type(v.value) for v in column] == [int, float, type(None)]
+
+
+def test_mixed_column():
+    """Test that non-numeric values fall back to a plain list."""
+    column = TimeValueColumn(times=TIMES, values=["a", 1, None])
+
+    assert isinstance(column.raw_values, list)
+    assert [v.value for v in column] == ["a", 1, None]
+
+
+def test_slice_and_equality():
+    """Test slicing and comparing columns to lists of TimeValuePair."""
+    column = TimeValueColumn(times=TIMES, values=[1, 2, 3])
+
+    assert column[1:] == [
+        TimeValuePair(time=TIMES[1], value=2),
+        TimeValuePair(time=TIMES[2], value=3),
+    ]
+    assert column == [TimeValuePair(time=t, value=v) for t, v in zip(TIMES, [1, 2, 3])]
+    assert column != [TimeValuePair(time=TIMES[0], value=1)]
+
+
+def test_shared_times():
+    """Test that columns share their time stamps instead of copying them."""
+    a = TimeValueColumn(times=TIMES, values=[1, 2, 3])
+    b = TimeValueColumn(times=TIMES, values=[4, 5, 6])
+
+    assert a.times is b.times
+
+
+def test_length_mismatch():
+    """Test that times and values must have the same length."""
+    with pytest.raises(ValueError):
+        TimeValueColumn(times=TIMES, values=[1, 2])
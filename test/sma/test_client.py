@@ -1,5 +1,6 @@
 """unit test for SMA client implementation."""
 
+import json
 from logging import Logger
 
 import pytest
@@ -9,13 +10,25 @@ from custom_components.sma_ennexos.sma.client import (
     SMAApiClient,
 )
 from custom_components.sma_ennexos.sma.model import LiveMeasurementQueryItem
-from custom_components.sma_ennexos.sma.model.errors import SMAApiClientError
-from test.sma.aiohttp_mock import AioHttpMock, ResponseEntry
+from custom_components.sma_ennexos.sma.model.errors import (
+    SMAApiClientError,
+    SMAApiParsingError,
+)
+from custom_components.sma_ennexos.sma.watchdog import LoopBlockWatchdog
+from test.sma.aiohttp_mock import AioHttpMock, ClientResponseMock, ResponseEntry
 
 LOGGER = Logger(__name__)
 LOGGER.setLevel("DEBUG")
 
 
+class InvalidJsonResponseMock(ClientResponseMock):
+    """Mocked response with a body that is not valid json."""
+
+    async def read(self) -> bytes:
+        """Return invalid json."""
+        return b"{invalid"
+
+
 @pytest.mark.asyncio
 async def test_client_auth():
     """Test client login / logout methods."""
@@ -134,6 +147,143 @@ async def test_client_auth():
     assert request.was_handled
 
 
+@pytest.mark.asyncio
+async def test_client_restore_session():
+    """Test client session state can be persisted and restored."""
+    mock = AioHttpMock("http://sma.local/api/v1")
+
+    def create_client() -> SMAApiClient:
+        return SMAApiClient(
+            host="sma.local",
+            username="test",
+            password="test123",
+            session=mock.session,
+            use_ssl=False,
+            logger=LOGGER,
+        )
+
+    sma = create_client()
+    assert sma.session_state is None
+
+    mock.add_response(
+        ResponseEntry(
+            method="POST",
+            endpoint="token",
+            status_code=200,
+            data={
+                "access_token": "mock-access-token",
+                "refresh_token": "mock-refresh-token",
+                "token_type": "Bearer",
+                "expires_in": 3600,
+            },
+            cookies={
+                "JSESSIONID": "mock-session-id",
+            },
+        )
+    )
+    logins: list[LoginResult] = []
+    sma.login_listener = logins.append
+    assert (await sma.login()) == LoginResult.NEW_TOKEN
+
+    # the listener is notified of the new session, so it can be persisted
+    assert logins == [LoginResult.NEW_TOKEN]
+
+    state = sma.session_state
+    assert state is not None
+    assert state["session_id"] == "mock-session-id"
+    assert state["token"]["refresh_token"] == "mock-refresh-token"
+
+    # a new client resumes the session without logging in again
+    mock.clear_requests()
+    sma = create_client()
+    logins.clear()
+    sma.login_listener = logins.append
+    sma.restore_session(state)
+    assert (await sma.login()) == LoginResult.ALREADY_LOGGED_IN
+    assert logins == []
+    assert mock.get_request(method="POST", endpoint="token") is None
+    assert sma.session_state == state
+
+    # invalid state is rejected
+    with pytest.raises(SMAApiParsingError):
+        create_client().restore_session({"session_id": "abc"})
+    with pytest.raises(SMAApiParsingError):
+        create_client().restore_session({"token": state["token"]})
+
+
+@pytest.mark.asyncio
+async def test_client_get_navigation():
+    """Test SMAApiClient.get_navigation only fetches the navigation."""
+    mock = AioHttpMock("http://sma.local/api/v1")
+
+    sma = SMAApiClient(
+        host="sma.local",
+        username="test",
+        password="test123",
+        session=mock.session,
+        use_ssl=False,
+        logger=LOGGER,
+    )
+
+    # need to login first
+    mock.add_response(
+        ResponseEntry(
+            method="POST",
+            endpoint="token",
+            status_code=200,
+            data={
+                "access_token": "mock-access-token",
+                "refresh_token": "mock-refresh-token",
+                "token_type": "Bearer",
+                "expires_in": 3600,
+            },
+            cookies={
+                "JSESSIONID": "mock-session-id",
+            },
+        )
+    )
+    assert (await sma.login()) == LoginResult.NEW_TOKEN
+
+    mock.clear_requests()
+    mock.add_responses(
+        [
+            # root component discovery
+            ResponseEntry(
+                method="GET",
+                endpoint="navigation",
+                status_code=200,
+                data=[
+                    {
+                        "componentId": "plant0",
+                        "componentType": "Plant",
+                        "name": "The Plant",
+                    },
+                ],
+            ),
+            # children of root component
+            ResponseEntry(
+                method="GET",
+                endpoint="navigation?parentId=plant0",
+                status_code=200,
+                data=[
+                    {
+                        "componentId": "inv1",
+                        "componentType": "Inverter",
+                        "name": "The 1st Inverter",
+                    },
+                ],
+            ),
+        ]
+    )
+
+    navigation = await sma.get_navigation()
+    assert [c.component_id for c in navigation] == ["plant0", "inv1"]
+    assert navigation[0].name == "The Plant"
+
+    # no per-device info is fetched
+    assert mock.request_count == 2
+
+
 @pytest.mark.asyncio
 async def test_client_get_all_components():
     """Test SMAApiClient.get_all_components."""
@@ -620,6 +770,137 @@ async def test_client_get_live_measurements():
     assert request.was_handled
 
 
+@pytest.mark.parametrize(
+    ("executor_parse_size", "parsed_on_loop"),
+    [(None, True), (1024 * 1024, True), (1, False)],
+)
+@pytest.mark.asyncio
+async def test_client_get_live_measurements_executor(
+    executor_parse_size, parsed_on_loop
+):
+    """Test large measurements responses are parsed in a executor thread, and small ones on the event loop."""
+    mock = AioHttpMock("http://sma.local/api/v1")
+
+    sma = SMAApiClient(
+        host="sma.local",
+        username="test",
+        password="test123",
+        session=mock.session,
+        use_ssl=False,
+        logger=LOGGER,
+        executor_parse_size=executor_parse_size,
+    )
+    sma.watchdog = LoopBlockWatchdog(LOGGER)
+
+    mock.add_responses(
+        [
+            ResponseEntry(
+                repeat=True,
+                method="POST",
+                endpoint="token",
+                status_code=200,
+                data={
+                    "access_token": "mock-access-token",
+                    "refresh_token": "mock-refresh-token",
+                    "token_type": "Bearer",
+                    "expires_in": 3600,
+                },
+                cookies={
+                    "JSESSIONID": "mock-session-id",
+                },
+            ),
+            ResponseEntry(
+                method="POST",
+                endpoint="measurements/live",
+                status_code=200,
+                data=[
+                    {
+                        "channelId": "chastt",
+                        "componentId": "inv0",
+                        "values": [{"time": "2024-02-01T11:30:00Z", "value": 10}],
+                    },
+                ],
+            ),
+        ]
+    )
+    assert (await sma.login()) == LoginResult.NEW_TOKEN
+
+    measurements = await sma.get_live_measurements(
+        [LiveMeasurementQueryItem(component_id="inv0", channel_id="chastt")]
+    )
+    assert len(measurements) == 1
+    assert measurements[0].values[0].value == 10
+    assert sma.metrics.parse_times["measurements"].latest is not None
+
+    # the size of the body is recorded as read, as chunked responses have no content length
+    trace = sma.metrics.latest_trace("POST measurements/live")
+    assert trace is not None
+    assert trace.response_bytes == len(
+        json.dumps(
+            [
+                {
+                    "channelId": "chastt",
+                    "componentId": "inv0",
+                    "values": [{"time": "2024-02-01T11:30:00Z", "value": 10}],
+                },
+            ]
+        ).encode()
+    )
+
+    # only parsing on the event loop is measured by the watchdog
+    sma.watchdog.finish_cycle("test")
+    assert [stage.name for stage in sma.watchdog.last_cycle] == (
+        ["parse"] if parsed_on_loop else []
+    )
+
+
+@pytest.mark.asyncio
+async def test_client_get_live_measurements_invalid_json():
+    """Test invalid json in a measurements response raises a parsing error."""
+    mock = AioHttpMock("http://sma.local/api/v1")
+
+    sma = SMAApiClient(
+        host="sma.local",
+        username="test",
+        password="test123",
+        session=mock.session,
+        use_ssl=False,
+        logger=LOGGER,
+    )
+
+    mock.add_responses(
+        [
+            ResponseEntry(
+                repeat=True,
+                method="POST",
+                endpoint="token",
+                status_code=200,
+                data={
+                    "access_token": "mock-access-token",
+                    "refresh_token": "mock-refresh-token",
+                    "token_type": "Bearer",
+                    "expires_in": 3600,
+                },
+                cookies={
+                    "JSESSIONID": "mock-session-id",
+                },
+            ),
+            ResponseEntry(
+                method="POST",
+                endpoint="measurements/live",
+                status_code=200,
+                callback=lambda: InvalidJsonResponseMock(data=None),
+            ),
+        ]
+    )
+    assert (await sma.login()) == LoginResult.NEW_TOKEN
+
+    with pytest.raises(SMAApiParsingError):
+        await sma.get_live_measurements(
+            [LiveMeasurementQueryItem(component_id="inv0", channel_id="chastt")]
+        )
+
+
 @pytest.mark.asyncio
 async def test_client_get_live_measurements_array():
     """
@@ -879,6 +1160,70 @@ async def test_client_allows_zero_retries():
     assert mock.request_count == 1
 
 
+@pytest.mark.asyncio
+async def test_client_retries_can_be_changed():
+    """Test that timeout and retries can be changed on a existing client."""
+    mock = AioHttpMock("http://sma.local/api/v1")
+
+    sma = SMAApiClient(
+        host="sma.local",
+        username="test",
+        password="test123",
+        session=mock.session,
+        use_ssl=False,
+        request_retries=0,
+        request_timeout=1,
+        logger=LOGGER,
+    )
+
+    sma.request_timeout = 5
+    sma.request_retries = 1
+    assert sma.request_timeout == 5
+    assert sma.request_retries == 1
+
+    with pytest.raises(ValueError):
+        sma.request_retries = -1
+
+    mock.add_responses(
+        [
+            # fails to login with 500 internal server error,
+            # client should retry
+            ResponseEntry(
+                method="POST",
+                endpoint="token",
+                status_code=500,
+            ),
+            # successful login
+            ResponseEntry(
+                method="POST",
+                endpoint="token",
+                status_code=200,
+                data={
+                    "access_token": "mock-access-token",
+                    "refresh_token": "mock-refresh-token",
+                    "token_type": "Bearer",
+                    "expires_in": 3600,
+                },
+                cookies={
+                    "JSESSIONID": "mock-session-id",
+                },
+            ),
+        ]
+    )
+
+    # login succeeds on the retry
+    assert (await sma.login()) == LoginResult.NEW_TOKEN
+    assert mock.request_count == 2
+
+    # the retry is recorded in the metrics
+    assert sma.metrics.retries == 1
+    assert sma.metrics.request_count == 1
+    assert len(sma.metrics.requests["POST token"]) == 1
+    assert sma.metrics.traces[-1].attempts == 2
+    assert sma.metrics.traces[-1].status == 200
+    assert sma.metrics.traces[-1].error is None
+
+
 @pytest.mark.asyncio
 async def test_client_reauth():
     """Test the client correctly re-authenticates when the token expires."""
@@ -989,3 +1334,12 @@ async def test_client_reauth():
     request = mock.get_request(method="POST", endpoint="token")
     assert request is not None
     assert request.was_handled
+
+    # re-auth is recorded in the metrics, with query removed from endpoints
+    assert sma.metrics.reauths == 1
+    assert set(sma.metrics.requests) == {
+        "POST token",
+        "POST measurements/live",
+        "DELETE refreshtoken",
+    }
+    assert len(sma.metrics.parse_times["measurements"]) == 1
@@ -1,9 +1,16 @@
 """Tests for the SMA ennexOS known_channels module."""
 
+import pytest
+
 from custom_components.sma_ennexos.sma.known_channels import (
+    KNOWN_CHANNELS,
+    SMAAggregation,
+    SMACumulativeMode,
     SMADeviceKind,
     SMAUnit,
+    get_channel_aggregation,
     get_known_channel,
+    known_channel_key,
 )
 
 
@@ -40,3 +47,43 @@ def test_known_channel_array():
     assert ch123 is not None
     assert ch123.device_kind == SMADeviceKind.PV
     assert ch123.unit == SMAUnit.VOLT
+
+
+def test_known_channel_key():
+    """Test array channels with any index resolve to the same known channel key."""
+    assert known_channel_key("Measurement.GridMs.TotW") == "Measurement.GridMs.TotW"
+    assert known_channel_key("Measurement.DcMs.Vol[0]") == "Measurement.DcMs.Vol[]"
+    assert known_channel_key("Measurement.DcMs.Vol[123]") == "Measurement.DcMs.Vol[]"
+
+    assert (
+        get_known_channel("Measurement.DcMs.Vol[7]")
+        is KNOWN_CHANNELS["Measurement.DcMs.Vol[]"]
+    )
+
+
+def test_known_channels_read_only():
+    """Test the known channels table cannot be modified."""
+    with pytest.raises(TypeError):
+        KNOWN_CHANNELS["Measurement.Test"] = KNOWN_CHANNELS["Measurement.GridMs.TotW"]  # type: ignore[index]
+
+
+def test_known_channel_aggregation():
+    """Test counters and totals are never averaged, so sampling cannot skew them."""
+    for channel_id, channel in KNOWN_CHANNELS.items():
+        if channel.cumulative_mode in (
+            SMACumulativeMode.TOTAL,
+            SMACumulativeMode.COUNTER,
+        ):
+            assert channel.aggregation == SMAAggregation.LATEST, channel_id
+
+    assert (
+        get_channel_aggregation("Measurement.Metering.GridMs.TotWhOut")
+        == SMAAggregation.LATEST
+    )
+    assert (
+        get_channel_aggregation("Measurement.ExtGridMs.HzMax") == SMAAggregation.MAXIMUM
+    )
+    assert (
+        get_channel_aggregation("Measurement.ExtGridMs.HzMin") == SMAAggregation.MINIMUM
+    )
+    assert get_channel_aggregation("Measurement.GridMs.TotW") == SMAAggregation.MEAN
@@ -0,0 +1,206 @@
+"""Tests for the SMA ennexOS localization module."""
+
+import asyncio
+
+import pytest
+
+from custom_components.sma_ennexos.sma.localization import (
+    LocalizationCache,
+    build_channel_name_index,
+    chunk_mapping_fingerprint,
+    fetch_localizations,
+    parse_chunk_mapping_table,
+    parse_lang_data,
+)
+
+WEBUI = {
+    "http://sma.local": '<script src="runtime.abc.js" type="module"></script>',
+    "http://sma.local/webui/runtime.abc.js": (
+        'return"."+{12:"aaa",34:"bbb",56:"ccc"}[e]+".js"'
+    ),
+    "http://sma.local/webui/12.aaa.js": (
+        'n.exports=JSON.parse(\'{"META":{"lang":"en"},"1":"Green"}\')'
+    ),
+    "http://sma.local/webui/34.bbb.js": "n.exports={}",
+    "http://sma.local/webui/56.ccc.js": (
+        'n.exports=JSON.parse(\'{"META":{"lang":"de"},"1":"Gr\\u00fcn"}\')'
+    ),
+}
+
+
+class WebUiResponseMock:
+    """Mocked text response of the web ui, tracking concurrent downloads."""
+
+    def __init__(self, session: "WebUiSessionMock", text: str | None):
+        """Initialize response, None for a missing file."""
+        self.__session = session
+        self.__text = text
+
+    async def __aenter__(self):
+        """Enter response context, simulating a slow download."""
+        self.__session.active += 1
+        self.__session.max_active = max(
+            self.__session.max_active, self.__session.active
+        )
+        await asyncio.sleep(0.01)
+        return self
+
+    async def __aexit__(self, *args: object):
+        """Exit response context."""
+        self.__session.active -= 1
+
+    def raise_for_status(self):
+        """Raise if the file is missing."""
+        if self.__text is None:
+            raise RuntimeError("not found")
+
+    async def text(self) -> str:
+        """Return the file content."""
+        return self.__text
+
+
+class WebUiSessionMock:
+    """Mocked session serving the web ui."""
+
+    def __init__(self, files: dict[str, str]):
+        """Initialize session serving the given files."""
+        self.files = files
+        self.requested: list[str] = []
+        self.active = 0
+        self.max_active = 0
+
+    def get(self, url: str) -> WebUiResponseMock:
+        """Get a file of the web ui."""
+        self.requested.append(url)
+        return WebUiResponseMock(self, self.files.get(url))
+
+
+def test_parse_chunk_mapping_table():
+    """Test the js literal chunk mapping table is converted to a dict."""
+    assert parse_chunk_mapping_table('12:"abc123",main:"def456"') == {
+        "12": "abc123",
+        "main": "def456",
+    }
+
+
+def test_parse_lang_data():
+    """Test localization data is extracted from a chunk, with unicode escapes."""
+    js_content = 'n.exports=JSON.parse(\'{"META":{"lang":"de"},"1":"Gr\\u00fcn"}\')'
+    assert parse_lang_data(js_content) == {"META": {"lang": "de"}, "1": "Grün"}
+
+    # chunks without localization data are skipped
+    assert parse_lang_data("n.exports={}") is None
+
+
+@pytest.mark.asyncio
+async def test_fetch_localizations_concurrently():
+    """Test chunks are downloaded concurrently, with a limit, and returned in order."""
+    session = WebUiSessionMock(WEBUI)
+
+    localizations = await fetch_localizations(
+        session, "http://sma.local", max_concurrent_downloads=2
+    )
+
+    assert localizations == [
+        ("12.aaa.js", {"META": {"lang": "en"}, "1": "Green"}),
+        ("56.ccc.js", {"META": {"lang": "de"}, "1": "Grün"}),
+    ]
+    assert session.max_active == 2
+
+
+@pytest.mark.asyncio
+async def test_fetch_localizations_cached(tmp_path):
+    """Test parsed chunks are cached on disk, so unchanged chunks are not downloaded again."""
+    cache = LocalizationCache(tmp_path / "cache")
+
+    # missing chunks are skipped, and not cached
+    files = dict(WEBUI)
+    del files["http://sma.local/webui/56.ccc.js"]
+    session = WebUiSessionMock(files)
+    localizations = await fetch_localizations(session, "http://sma.local", cache)
+    assert localizations == [("12.aaa.js", {"META": {"lang": "en"}, "1": "Green"})]
+
+    # only the previously missing chunk is downloaded again
+    session = WebUiSessionMock(WEBUI)
+    localizations = await fetch_localizations(session, "http://sma.local", cache)
+    assert [filename for filename, _ in localizations] == ["12.aaa.js", "56.ccc.js"]
+    assert session.requested == [
+        "http://sma.local",
+        "http://sma.local/webui/runtime.abc.js",
+        "http://sma.local/webui/56.ccc.js",
+    ]
+
+    # chunks of a previous firmware are pruned
+    files = dict(WEBUI)
+    files["http://sma.local/webui/runtime.abc.js"] = 'return"."+{12:"ddd"}[e]+".js"'
+    files["http://sma.local/webui/12.ddd.js"] = "n.exports={}"
+    session = WebUiSessionMock(files)
+    assert await fetch_localizations(session, "http://sma.local", cache) == []
+    assert [path.name for path in (tmp_path / "cache").iterdir()] == ["12.ddd.js.json"]
+
+
+def test_chunk_mapping_fingerprint():
+    """Test the fingerprint only depends on the chunks, not their order."""
+    fingerprint = chunk_mapping_fingerprint({"12": "aaa", "34": "bbb"})
+    assert fingerprint == chunk_mapping_fingerprint({"34": "bbb", "12": "aaa"})
+    assert fingerprint != chunk_mapping_fingerprint({"12": "aaa", "34": "ccc"})
+
+
+def test_build_channel_name_index():
+    """Test channel names are indexed from the first localization containing them, without a matching language."""
+    index = build_channel_name_index(
+        [
+            (
+                "12.aaa.js",
+                {
+                    "META": {"lang": "en"},
+                    "Measurement.GridMs.TotW": "Grid power",
+                    "Greeting": "Hello",
+                },
+            ),
+            (
+                "34.bbb.js",
+                {
+                    "Measurement.GridMs.TotW": "Netzleistung",
+                    "Measurement.DcMs.Vol": "DC-Spannung",
+                },
+            ),
+        ]
+    )
+
+    assert index == {
+        "Measurement.GridMs.TotW": "Grid power",
+        "Measurement.DcMs.Vol": "DC-Spannung",
+    }
+
+
+def test_build_channel_name_index_language():
+    """Test channel names are indexed from the localization matching the language first."""
+    localizations = [
+        ("12.aaa.js", {"META": {"lang": "fr"}, "Measurement.GridMs.TotW": "Réseau"}),
+        ("34.bbb.js", {"META": {"lang": "de"}, "Measurement.GridMs.TotW": "Netz"}),
+        (
+            "56.ccc.js",
+            {
+                "META": {"lang": "en"},
+                "Measurement.GridMs.TotW": "Grid",
+                "Measurement.DcMs.Vol": "DC voltage",
+            },
+        ),
+    ]
+
+    # matching language first, missing channels from english
+    assert build_channel_name_index(localizations, "de") == {
+        "Measurement.GridMs.TotW": "Netz",
+        "Measurement.DcMs.Vol": "DC voltage",
+    }
+
+    # matching language in another region
+    assert build_channel_name_index(localizations, "de-CH") == {
+        "Measurement.GridMs.TotW": "Netz",
+        "Measurement.DcMs.Vol": "DC voltage",
+    }
+
+    # falls back to english
+    index = build_channel_name_index(localizations, "nl")
+    assert index["Measurement.GridMs.TotW"] == "Grid"
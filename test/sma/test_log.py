@@ -0,0 +1,69 @@
+"""Tests for the SMA ennexOS logging helpers."""
+
+import logging
+
+import pytest
+
+from custom_components.sma_ennexos.sma.log import LazyFormat, LazyLogger, SampledLogger
+
+
+def test_lazy_format(caplog):
+    """Test lazy arguments are only built when the message is logged."""
+    logger = logging.getLogger("test_log.lazy_format")
+    calls = []
+
+    def build() -> str:
+        calls.append(True)
+        return "a; b"
+
+    with caplog.at_level(logging.INFO, logger=logger.name):
+        logger.debug("query: %s", LazyFormat(build))
+    assert calls == []
+
+    with caplog.at_level(logging.DEBUG, logger=logger.name):
+        logger.debug("query: %s", LazyFormat(build))
+    assert len(calls) > 0
+    assert caplog.records[-1].getMessage() == "query: a; b"
+
+
+def test_lazy_logger(caplog):
+    """Test the lazy logger only logs enabled levels, and accepts no logger."""
+    # no logger does nothing
+    LazyLogger(None).debug("message %s", 1)
+    assert not LazyLogger(None).is_enabled_for(logging.ERROR)
+
+    logger = logging.getLogger("test_log.lazy_logger")
+    lazy_logger = LazyLogger(logger)
+    assert lazy_logger.logger is logger
+
+    with caplog.at_level(logging.INFO, logger=logger.name):
+        assert not lazy_logger.is_enabled_for(logging.DEBUG)
+        lazy_logger.debug("message %s", 1)
+    assert len(caplog.records) == 0
+
+    with caplog.at_level(logging.DEBUG, logger=logger.name):
+        assert lazy_logger.is_enabled_for(logging.DEBUG)
+        lazy_logger.debug("message %s", 2)
+    assert [r.getMessage() for r in caplog.records] == ["message 2"]
+
+
+def test_sampled_logger(caplog):
+    """Test the sampled logger logs one of every n messages."""
+    logger = logging.getLogger("test_log.sampled_logger")
+    sampled_logger = SampledLogger(logger, 3)
+
+    # messages are not counted while the level is disabled
+    with caplog.at_level(logging.INFO, logger=logger.name):
+        sampled_logger.debug("message %s", -1)
+
+    with caplog.at_level(logging.DEBUG, logger=logger.name):
+        for i in range(7):
+            sampled_logger.debug("message %s", i)
+    assert [r.getMessage() for r in caplog.records] == [
+        "message 0",
+        "message 3",
+        "message 6",
+    ]
+
+    with pytest.raises(ValueError):
+        SampledLogger(logger, 0)
@@ -0,0 +1,83 @@
+"""Tests for the SMA ennexOS metrics module."""
+
+from custom_components.sma_ennexos.sma.metrics import (
+    DurationStats,
+    RequestTrace,
+    SMAClientMetrics,
+)
+
+
+def test_duration_stats():
+    """Test duration statistics and percentiles."""
+    stats = DurationStats(window=100)
+    assert stats.mean is None
+    assert stats.percentile(50) is None
+    assert stats.as_dict()["p50_ms"] is None
+
+    for i in range(1, 101):
+        stats.record(i / 1000)
+
+    assert len(stats) == 100
+    assert stats.latest == 0.1
+    assert stats.maximum == 0.1
+    assert stats.percentile(50) == 0.05
+    assert stats.percentile(90) == 0.09
+    assert stats.percentile(99) == 0.099
+    assert stats.as_dict() == {
+        "count": 100,
+        "mean_ms": 50.5,
+        "p50_ms": 50.0,
+        "p90_ms": 90.0,
+        "p99_ms": 99.0,
+        "max_ms": 100.0,
+    }
+
+
+def test_duration_stats_window():
+    """Test percentiles only cover the most recent samples, totals cover all."""
+    stats = DurationStats(window=2)
+    stats.record(10.0)
+    stats.record(1.0)
+    stats.record(2.0)
+
+    assert len(stats) == 3
+    assert stats.maximum == 10.0
+    assert stats.percentile(100) == 2.0
+
+
+def test_client_metrics():
+    """Test requests are recorded per endpoint, with traces in a ring buffer."""
+    metrics = SMAClientMetrics(trace_buffer_size=2)
+
+    endpoint = SMAClientMetrics.endpoint_key("GET", "navigation?parentId=plant")
+    assert endpoint == "GET navigation"
+
+    for i in range(3):
+        metrics.record_request(
+            RequestTrace(
+                endpoint=endpoint,
+                started_at=float(i),
+                duration=0.1,
+                attempts=2 if i == 0 else 1,
+                status=200 if i < 2 else 500,
+                response_bytes=100,
+                error="ClientError()" if i == 2 else None,
+            )
+        )
+    metrics.record_parse("measurements", 0.01)
+
+    assert metrics.request_count == 3
+    assert metrics.error_count == 1
+    assert metrics.retries == 1
+    assert metrics.bytes_received == 300
+    assert [trace.started_at for trace in metrics.traces] == [1.0, 2.0]
+    assert len(metrics.request_durations) == 3
+    assert metrics.latest_trace(endpoint).started_at == 2.0
+    assert metrics.latest_trace("POST measurements/live") is None
+
+    snapshot = metrics.as_dict()
+    assert snapshot["requests"]["GET navigation"]["count"] == 3
+    assert snapshot["requests"]["GET navigation"]["errors"] == 1
+    assert snapshot["parse_times"]["measurements"]["count"] == 1
+    assert len(snapshot["traces"]) == 2
+    assert snapshot["traces"][-1]["error"] == "ClientError()"
@@ -0,0 +1,104 @@
+"""Tests for the SMA ennexOS tracing module."""
+
+import asyncio
+import logging
+
+import pytest
+
+from custom_components.sma_ennexos.sma.tracing import (
+    LogSummarySink,
+    RingBufferSink,
+    Span,
+    add_sink,
+    span,
+    tracing_enabled,
+)
+
+
+def test_span_disabled():
+    """Test spans are no-ops without sinks."""
+    assert not tracing_enabled()
+
+    with span("update", entry_id="MOCK") as root:
+        root.set_attribute("channels", 1)
+        assert not isinstance(root, Span)
+
+    # the no-op span is shared
+    assert span("update") is span("request")
+
+
+async def test_span_nesting():
+    """Test spans nest across awaits and gathered tasks, and only root spans are emitted."""
+    sink = RingBufferSink(size=2)
+    remove = add_sink(sink)
+    try:
+        assert tracing_enabled()
+
+        async def __request(endpoint: str) -> None:
+            with span("request", endpoint=endpoint):
+                await asyncio.sleep(0)
+
+        with span("update", entry_id="MOCK") as root:
+            with span("login"):
+                await asyncio.sleep(0)
+            await asyncio.gather(__request("a"), __request("b"))
+            root.set_attribute("channels", 2)
+
+        assert sink.spans == [root]
+        assert [child.name for child in root.children] == [
+            "login",
+            "request",
+            "request",
+        ]
+        assert root.children[1].parent is root
+        assert root.duration is not None
+        assert root.duration >= root.children[0].duration
+
+        as_dict = root.as_dict()
+        assert as_dict["name"] == "update"
+        assert as_dict["attributes"] == {"entry_id": "MOCK", "channels": 2}
+        assert as_dict["error"] is None
+        assert as_dict["children"][1]["attributes"] == {"endpoint": "a"}
+
+        # ring buffer keeps the most recent root spans only
+        for name in ("first", "second", "third"):
+            with span(name):
+                pass
+        assert [s.name for s in sink.spans] == ["second", "third"]
+    finally:
+        remove()
+
+    assert not tracing_enabled()
+
+
+def test_span_error():
+    """Test errors are recorded on the span, and the exception is not swallowed."""
+    sink = RingBufferSink()
+    remove = add_sink(sink)
+    try:
+        with pytest.raises(ValueError), span("update"), span("parse"):
+            raise ValueError("invalid")
+
+        (root,) = sink.spans
+        assert root.error == "ValueError('invalid')"
+        assert root.children[0].error == "ValueError('invalid')"
+        assert "(ValueError('invalid'))" in root.summary()
+    finally:
+        remove()
+
+
+def test_log_summary_sink(caplog):
+    """Test the log sink logs a one-line summary of root spans."""
+    logger = logging.getLogger("test_tracing")
+    remove = add_sink(LogSummarySink(logger))
+    try:
+        with caplog.at_level(logging.DEBUG, logger="test_tracing"):
+            with span("update"), span("login"):
+                pass
+
+        assert len(caplog.records) == 1
+        message = caplog.records[0].getMessage()
+        assert message.startswith("trace: update ")
+        assert "[login " in message
+    finally:
+        remove()
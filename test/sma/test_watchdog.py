@@ -0,0 +1,49 @@
+"""Tests for the SMA ennexOS event loop watchdog."""
+
+import logging
+import time
+
+from custom_components.sma_ennexos.sma.watchdog import LoopBlockWatchdog
+
+
+def test_watchdog_fast_cycle(caplog):
+    """Test cycles below the threshold are measured, but not warned about."""
+    watchdog = LoopBlockWatchdog(logging.getLogger("test_watchdog"), threshold=1.0)
+
+    with watchdog.measure("parse", bytes=1024):
+        pass
+    with watchdog.measure("dispatch", listeners=10):
+        pass
+
+    assert not watchdog.finish_cycle("update of sma.local")
+    assert watchdog.blocked_cycles == 0
+    assert [stage.name for stage in watchdog.last_cycle] == ["parse", "dispatch"]
+    assert watchdog.last_cycle[0].details == {"bytes": 1024}
+    assert len(caplog.records) == 0
+
+    # stages are reset for the next cycle
+    assert not watchdog.finish_cycle("update of sma.local")
+    assert watchdog.last_cycle == []
+
+
+def test_watchdog_blocking_cycle(caplog):
+    """Test a warning with a breakdown of all stages is logged if a stage blocks for too long."""
+    watchdog = LoopBlockWatchdog(logging.getLogger("test_watchdog"), threshold=0.01)
+
+    with watchdog.measure("parse", bytes=1024):
+        time.sleep(0.02)
+    with watchdog.measure("dispatch", listeners=10):
+        pass
+
+    with caplog.at_level(logging.WARNING, logger="test_watchdog"):
+        assert watchdog.finish_cycle("update of sma.local")
+    assert watchdog.blocked_cycles == 1
+    assert watchdog.last_cycle[0].duration >= 0.02
+
+    (record,) = caplog.records
+    message = record.getMessage()
+    assert message.startswith("update of sma.local blocked the event loop for ")
+    assert "parse " in message
+    assert "bytes=1024" in message
+    assert "dispatch " in message
+    assert "listeners=10" in message
@@ -2,7 +2,11 @@
 
 from homeassistant import config_entries
 from homeassistant.data_entry_flow import FlowResultType
-from pytest_homeassistant_custom_component.common import MockConfigEntry
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
 
 from custom_components.sma_ennexos.const import (
     CONF_HOST,
@@ -10,10 +14,23 @@ from custom_components.sma_ennexos.const import (
     CONF_USE_SSL,
     CONF_USERNAME,
     CONF_VERIFY_SSL,
+    DATA_PROBED_TOPOLOGY,
     DOMAIN,
+    OPT_DEADBAND,
+    OPT_DIAGNOSTICS_LOCALIZATIONS,
+    OPT_EXECUTOR_PARSE_SIZE,
+    OPT_HISTORY_DEPTH,
+    OPT_MAX_SILENCE_INTERVAL,
+    OPT_PERFORMANCE_SENSORS,
+    OPT_PERSIST_SESSION,
+    OPT_REDISCOVERY_INTERVAL,
     OPT_REQUEST_RETIRES,
     OPT_REQUEST_TIMEOUT,
+    OPT_ROLLING_STATISTICS,
+    OPT_SAMPLE_INTERVAL,
     OPT_UPDATE_INTERVAL,
+    OPT_UPDATE_TRACING,
+    PROBED_TOPOLOGY_TIMEOUT,
 )
 from custom_components.sma_ennexos.sma.model import (
     ComponentInfo,
@@ -38,7 +55,7 @@ async def test_config_flow_user_step_ok(
 
     # ensure plant name is returned as "MOCK PLANT"
     # the plant component is the first component returned
-    # by get_all_components with type=Plant
+    # by get_navigation with type=Plant
     mock_sma_client.components = [
         ComponentInfo(
             component_id="plant",
@@ -66,8 +83,10 @@ async def test_config_flow_user_step_ok(
 
     # to check the connection and fetch the plant name, a call
     # to the api should have happened
+    # only the navigation is probed, without per-device info
     assert mock_sma_client.cnt_login == 1
-    assert mock_sma_client.cnt_get_all_components == 1
+    assert mock_sma_client.cnt_get_navigation == 1
+    assert mock_sma_client.cnt_get_all_components == 0
 
     # a new config entry should have been created
     assert result["type"] == FlowResultType.CREATE_ENTRY
@@ -82,6 +101,14 @@ async def test_config_flow_user_step_ok(
     assert result["options"] == {}  # no options yet
     assert result["result"]
 
+    # the probed navigation is handed off to the entry setup
+    assert hass.data[DATA_PROBED_TOPOLOGY]["sma.local"] == mock_sma_client.components
+
+    # and dropped if no entry setup consumes it
+    async_fire_time_changed(hass, dt_util.utcnow() + PROBED_TOPOLOGY_TIMEOUT)
+    await hass.async_block_till_done()
+    assert "sma.local" not in hass.data[DATA_PROBED_TOPOLOGY]
+
 
 async def test_config_flow_user_step_handles_invalid_auth(
     hass, bypass_integration_setup, mock_sma_client
@@ -115,9 +142,9 @@ async def test_config_flow_user_step_handles_invalid_auth(
         },
     )
 
-    # because login failed, no call to get_all_components happened
+    # because login failed, no call to get_navigation happened
     # login is irrelevant as it's hooked
-    assert mock_sma_client.cnt_get_all_components == 0
+    assert mock_sma_client.cnt_get_navigation == 0
 
     # no config entry is created
     # instead, a form is returned with a error message
@@ -201,4 +228,16 @@ async def test_options_flow_init_step_ok(hass, bypass_integration_setup):
         OPT_UPDATE_INTERVAL: 30,
         OPT_REQUEST_TIMEOUT: 10,
         OPT_REQUEST_RETIRES: 3,
+        # not set by the user, filled with defaults
+        OPT_HISTORY_DEPTH: 0,
+        OPT_ROLLING_STATISTICS: False,
+        OPT_DEADBAND: False,
+        OPT_MAX_SILENCE_INTERVAL: 15,
+        OPT_SAMPLE_INTERVAL: 0,
+        OPT_PERSIST_SESSION: False,
+        OPT_REDISCOVERY_INTERVAL: 0,
+        OPT_DIAGNOSTICS_LOCALIZATIONS: True,
+        OPT_UPDATE_TRACING: False,
+        OPT_PERFORMANCE_SENSORS: False,
+        OPT_EXECUTOR_PARSE_SIZE: 256,
     }
@@ -1,12 +1,23 @@
 """Test sma-ennexos coordinator component."""
 
+from datetime import timedelta
 from unittest.mock import MagicMock
 
-from pytest_homeassistant_custom_component.common import MockConfigEntry
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
 
 from custom_components.sma_ennexos.const import DOMAIN
 from custom_components.sma_ennexos.coordinator import SMADataCoordinator
 from custom_components.sma_ennexos.sma.client import SMAApiClient
+from custom_components.sma_ennexos.sma.model import (
+    ChannelValues,
+    ComponentInfo,
+    TimeValuePair,
+)
+from custom_components.sma_ennexos.storage import SMATopologyStore
 
 
 async def test_coordinator_basic(
@@ -31,13 +42,278 @@ async def test_coordinator_basic(
     )
 
     mock_sma_client.reset_counts()
-    mock_sma_client.measurements = MagicMock()
+    mock_sma_client.measurements = [
+        ChannelValues(
+            component_id="component1",
+            channel_id="channel1",
+            values=[TimeValuePair(time="2024-02-01T11:25:46Z", value=300.0)],
+        ),
+        ChannelValues(
+            component_id="component1",
+            channel_id="channel2",
+            values=[TimeValuePair(time="2024-02-01T11:25:46Z", value=400.0)],
+        ),
+    ]
 
-    # fetch the data for the first time
+    # fetch the data for the first time, only the channels of the listeners are queried
+    remove_listener = coordinator.async_add_listener(
+        lambda: None, ("component1", "channel1")
+    )
     data = await coordinator._async_update_data()
-    assert data
-    assert data == mock_sma_client.measurements
+    remove_listener()
+    assert data == mock_sma_client.measurements[:1]
 
     # the api client was logged in and called once to fetch the data
     assert mock_sma_client.cnt_login == 1
     assert mock_sma_client.cnt_get_live_measurements == 1
+
+
+async def test_coordinator_history(
+    hass,
+    bypass_integration_setup,
+    mock_sma_client,
+):
+    """Test the coordinator records a history of numeric values when enabled."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="test",
+        data={},
+    )
+
+    coordinator = SMADataCoordinator(
+        hass,
+        config_entry=entry,
+        client=SMAApiClient(
+            host="sma.local", username="user", password="password", session=MagicMock()
+        ),
+        history_depth=2,
+    )
+
+    # no history before the first update
+    assert coordinator.get_history("component1", "channel1") is None
+
+    remove_listeners = [
+        coordinator.async_add_listener(lambda: None, ("component1", channel_id))
+        for channel_id in ("channel1", "enum_channel")
+    ]
+    for i, time in enumerate(
+        ["2024-02-01T11:25:00Z", "2024-02-01T11:26:00Z", "2024-02-01T11:27:00Z"]
+    ):
+        mock_sma_client.measurements = [
+            ChannelValues(
+                component_id="component1",
+                channel_id="channel1",
+                values=[TimeValuePair(time=time, value=i * 100)],
+            ),
+            ChannelValues(
+                component_id="component1",
+                channel_id="enum_channel",
+                values=[TimeValuePair(time=time, value="some_string")],
+            ),
+        ]
+        await coordinator._async_update_data()
+
+    for remove_listener in remove_listeners:
+        remove_listener()
+
+    # only the last two samples are kept
+    history = coordinator.get_history("component1", "channel1")
+    assert history is not None
+    assert len(history) == 2
+    assert list(history.samples()[1]) == [100.0, 200.0]
+    assert history.mean(60) == 150.0
+
+    # non-numeric channels have no history
+    assert coordinator.get_history("component1", "enum_channel") is None
+
+
+async def test_coordinator_setup_from_cached_topology(
+    hass,
+    bypass_integration_setup,
+    mock_sma_client,
+):
+    """Test setup from a cached topology makes no requests, and the first refresh fetches the values."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="test",
+        data={},
+    )
+    entry.add_to_hass(hass)
+
+    mock_sma_client.components = [
+        ComponentInfo(
+            component_id="component1",
+            component_type="type1",
+            name="Component 1",
+        ),
+    ]
+    mock_sma_client.measurements = [
+        ChannelValues(
+            component_id="component1",
+            channel_id="channel1",
+            values=[TimeValuePair(time="2024-02-01T11:25:46Z", value=300.0)],
+        ),
+    ]
+
+    topology_store = SMATopologyStore(hass, entry.entry_id)
+    await topology_store.async_save(
+        mock_sma_client.components, [("component1", "channel1")]
+    )
+
+    coordinator = SMADataCoordinator(
+        hass,
+        config_entry=entry,
+        client=SMAApiClient(
+            host="sma.local", username="user", password="password", session=MagicMock()
+        ),
+        topology_store=topology_store,
+    )
+
+    mock_sma_client.reset_counts()
+    await coordinator._async_setup()
+
+    # channels are known from the cache, without values
+    assert coordinator.all_components == mock_sma_client.components
+    assert coordinator.all_measurements == [
+        ChannelValues(component_id="component1", channel_id="channel1", values=[])
+    ]
+    assert mock_sma_client.cnt_login == 0
+    assert mock_sma_client.cnt_get_all_components == 0
+    assert mock_sma_client.cnt_get_all_live_measurements == 0
+
+    # no entity listens yet, so the first refresh fetches all cached channels.
+    # the topology is re-validated with them, without fetching them again
+    data = await coordinator._async_update_data()
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert data == mock_sma_client.measurements
+    assert mock_sma_client.cnt_login == 1
+    assert mock_sma_client.cnt_get_all_live_measurements == 1
+    assert mock_sma_client.cnt_get_live_measurements == 0
+    assert mock_sma_client.cnt_get_all_components == 1
+
+    # later updates query the channels of the listening entities
+    remove_listener = coordinator.async_add_listener(
+        lambda: None, ("component1", "channel1")
+    )
+    data = await coordinator._async_update_data()
+    remove_listener()
+    assert data == mock_sma_client.measurements
+    assert mock_sma_client.cnt_get_all_live_measurements == 1
+    assert mock_sma_client.cnt_get_live_measurements == 1
+
+
+async def test_coordinator_data_index(
+    hass,
+    bypass_integration_setup,
+    mock_sma_client,
+):
+    """Test the data is indexed by component and channel, once per update."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="test",
+        data={},
+    )
+
+    coordinator = SMADataCoordinator(
+        hass,
+        config_entry=entry,
+        client=SMAApiClient(
+            host="sma.local", username="user", password="password", session=MagicMock()
+        ),
+    )
+    assert coordinator.data_index == {}
+
+    channel1 = ChannelValues(
+        component_id="component1",
+        channel_id="channel1",
+        values=[TimeValuePair(time="2024-02-01T11:25:00Z", value=100)],
+    )
+    channel2 = ChannelValues(
+        component_id="component2",
+        channel_id="channel1",
+        values=[TimeValuePair(time="2024-02-01T11:25:00Z", value=200)],
+    )
+    coordinator.async_set_updated_data([channel1, channel2])
+
+    index = coordinator.data_index
+    assert index == {
+        ("component1", "channel1"): channel1,
+        ("component2", "channel1"): channel2,
+    }
+    assert coordinator.data_index is index
+
+    # a new update rebuilds the index
+    coordinator.async_set_updated_data([channel2])
+    assert coordinator.data_index == {("component2", "channel1"): channel2}
+
+
+async def test_coordinator_sampling(
+    hass,
+    bypass_integration_setup,
+    mock_sma_client,
+):
+    """Test the coordinator samples in between updates and publishes aggregated values."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="test",
+        data={},
+    )
+
+    coordinator = SMADataCoordinator(
+        hass,
+        config_entry=entry,
+        client=SMAApiClient(
+            host="sma.local", username="user", password="password", session=MagicMock()
+        ),
+        update_interval_seconds=60,
+        sample_interval_seconds=2,
+    )
+
+    def set_measurement(time: str, value: float):
+        mock_sma_client.measurements = [
+            ChannelValues(
+                component_id="component1",
+                # known power channel, aggregated using the mean
+                channel_id="Measurement.GridMs.TotW",
+                values=[TimeValuePair(time=time, value=value)],
+            )
+        ]
+
+    # setup starts sampling
+    set_measurement("2024-02-01T11:25:00Z", 100.0)
+    remove_listener = coordinator.async_add_listener(
+        lambda: None, ("component1", "Measurement.GridMs.TotW")
+    )
+    await coordinator._async_setup()
+    mock_sma_client.reset_counts()
+
+    # first update re-uses the measurements fetched during setup
+    data = await coordinator._async_update_data()
+    assert data[0].latest_value == TimeValuePair(
+        time="2024-02-01T11:25:00Z", value=100.0
+    )
+    assert mock_sma_client.cnt_get_live_measurements == 0
+
+    now = dt_util.utcnow()
+    for i, value in enumerate([200.0, 300.0]):
+        set_measurement(f"2024-02-01T11:25:0{i + 1}Z", value)
+        async_fire_time_changed(hass, now + timedelta(seconds=2 * (i + 1)))
+        await hass.async_block_till_done()
+
+    assert mock_sma_client.cnt_get_live_measurements == 2
+
+    # update publishes the mean of all samples, including its own
+    set_measurement("2024-02-01T11:25:03Z", 400.0)
+    data = await coordinator._async_update_data()
+    assert len(data) == 1
+    assert data[0].latest_value == TimeValuePair(
+        time="2024-02-01T11:25:03Z", value=300.0
+    )
+
+    # sampling stops on unload
+    remove_listener()
+    await coordinator._async_unload()
+    mock_sma_client.reset_counts()
+    async_fire_time_changed(hass, now + timedelta(seconds=10))
+    await hass.async_block_till_done()
+    assert mock_sma_client.cnt_get_live_measurements == 0
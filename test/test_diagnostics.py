@@ -1,5 +1,7 @@
 """Test SMA ennexOS diagnostics."""
 
+from unittest.mock import patch
+
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.sma_ennexos.const import (
@@ -9,6 +11,8 @@ from custom_components.sma_ennexos.const import (
     CONF_USERNAME,
     CONF_VERIFY_SSL,
     DOMAIN,
+    OPT_DIAGNOSTICS_LOCALIZATIONS,
+    OPT_UPDATE_TRACING,
 )
 from custom_components.sma_ennexos.diagnostics import async_get_config_entry_diagnostics
 from custom_components.sma_ennexos.sma.known_channels import (
@@ -21,6 +25,7 @@ from custom_components.sma_ennexos.sma.model import (
     ComponentInfo,
     TimeValuePair,
 )
+from custom_components.sma_ennexos.sma.tracing import tracing_enabled
 
 
 async def test_diagnostics(
@@ -99,6 +104,9 @@ async def test_diagnostics(
     await hass.config_entries.async_setup(config_entry.entry_id)
     await hass.async_block_till_done()
 
+    # an update after the first refresh is recorded in the performance metrics
+    await hass.data[DOMAIN][config_entry.entry_id].async_refresh()
+
     diagnostics = await async_get_config_entry_diagnostics(hass, config_entry)
 
     entry = diagnostics["config_entry"]
@@ -165,3 +173,166 @@ async def test_diagnostics(
         {"filename": "en.json", "lang_data": {"greeting": "Hello"}},
         {"filename": "de.json", "lang_data": {"greeting": "Hallo"}},
     ]
+
+    performance = diagnostics["performance"]
+    assert performance["updates"]["count"] == 1
+    assert performance["updates"]["overruns"] == 0
+    assert set(performance) == {
+        "updates",
+        "requests",
+        "retries",
+        "reauths",
+        "bytes_received",
+        "parse_times",
+        "traces",
+    }
+
+
+async def test_diagnostics_localizations_cached(hass, mock_sma_client):
+    """Test localizations are re-used by later diagnostics, and can be disabled."""
+    mock_sma_client.components = [
+        ComponentInfo(
+            component_id="component1",
+            component_type="type1",
+            name="Component 1",
+        ),
+    ]
+    mock_sma_client.localizations = [("en.json", {"greeting": "Hello"})]
+
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="MOCK",
+        data={
+            CONF_HOST: "sma.local",
+            CONF_USERNAME: "user",
+            CONF_PASSWORD: "password",
+            CONF_USE_SSL: False,
+            CONF_VERIFY_SSL: True,
+        },
+    )
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    mock_sma_client.reset_counts()
+
+    # localizations are only fetched by the first diagnostics
+    for _ in range(2):
+        diagnostics = await async_get_config_entry_diagnostics(hass, config_entry)
+        assert diagnostics["raw_data"]["localizations"] == [
+            {"filename": "en.json", "lang_data": {"greeting": "Hello"}}
+        ]
+    assert mock_sma_client.cnt_get_localizations == 1
+
+    # localizations can be disabled
+    hass.config_entries.async_update_entry(
+        config_entry, options={OPT_DIAGNOSTICS_LOCALIZATIONS: False}
+    )
+    await hass.async_block_till_done()
+    diagnostics = await async_get_config_entry_diagnostics(hass, config_entry)
+    assert "localizations" not in diagnostics["raw_data"]
+    assert mock_sma_client.cnt_get_localizations == 1
+
+
+async def test_diagnostics_update_traces(hass, mock_sma_client):
+    """Test update traces are included in diagnostics while tracing is enabled."""
+    mock_sma_client.components = [
+        ComponentInfo(
+            component_id="component1",
+            component_type="type1",
+            name="Component 1",
+        ),
+    ]
+
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="MOCK",
+        data={
+            CONF_HOST: "sma.local",
+            CONF_USERNAME: "user",
+            CONF_PASSWORD: "password",
+            CONF_USE_SSL: False,
+            CONF_VERIFY_SSL: True,
+        },
+        options={OPT_UPDATE_TRACING: True},
+    )
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert tracing_enabled()
+
+    await hass.data[DOMAIN][config_entry.entry_id].async_refresh()
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, config_entry)
+    traces = diagnostics["performance"]["update_traces"]
+    assert [trace["name"] for trace in traces][-2:] == ["update", "dispatch"]
+    update = traces[-2]
+    assert update["attributes"]["entry_id"] == "MOCK"
+    assert update["attributes"]["host"] == "sma.local"
+    assert update["duration_ms"] >= 0
+    assert update["error"] is None
+
+    # tracing can be disabled without reloading
+    hass.config_entries.async_update_entry(
+        config_entry, options={OPT_UPDATE_TRACING: False}
+    )
+    await hass.async_block_till_done()
+    assert not tracing_enabled()
+    diagnostics = await async_get_config_entry_diagnostics(hass, config_entry)
+    assert "update_traces" not in diagnostics["performance"]
+
+    # unloading removes the sink
+    hass.config_entries.async_update_entry(
+        config_entry, options={OPT_UPDATE_TRACING: True}
+    )
+    await hass.async_block_till_done()
+    assert tracing_enabled()
+    await hass.config_entries.async_unload(config_entry.entry_id)
+    assert not tracing_enabled()
+
+
+async def test_diagnostics_truncated(hass, mock_sma_client):
+    """Test large plants are truncated to the size budget."""
+    mock_sma_client.components = [
+        ComponentInfo(
+            component_id=f"component{i}",
+            component_type="type1",
+            name=f"Component {i}",
+        )
+        for i in range(3)
+    ]
+    mock_sma_client.measurements = [
+        ChannelValues(
+            component_id=f"component{i}",
+            channel_id="channel1",
+            values=[TimeValuePair(time="2024-02-01T11:25:46Z", value=300.0)],
+        )
+        for i in range(3)
+    ]
+
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="MOCK",
+        data={
+            CONF_HOST: "sma.local",
+            CONF_USERNAME: "user",
+            CONF_PASSWORD: "password",
+            CONF_USE_SSL: False,
+            CONF_VERIFY_SSL: True,
+        },
+        options={OPT_DIAGNOSTICS_LOCALIZATIONS: False},
+    )
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    with patch("custom_components.sma_ennexos.diagnostics.MAX_LIST_ITEMS", 2):
+        diagnostics = await async_get_config_entry_diagnostics(hass, config_entry)
+
+    assert len(diagnostics["entities"]) == 2
+    assert len(diagnostics["raw_data"]["components"]) == 2
+    assert len(diagnostics["raw_data"]["measurements"]) == 2
+    assert diagnostics["truncated"] == {
+        "entities": 3,
+        "components": 3,
+        "measurements": 3,
+    }
@@ -0,0 +1,238 @@
+"""Test the in-memory channel history."""
+
+import math
+
+import pytest
+
+from custom_components.sma_ennexos.sma.known_channels import SMAAggregation
+from custom_components.sma_ennexos.sma.model import ChannelValues, TimeValuePair
+
+from custom_components.sma_ennexos.history import (
+    ROLLING_WINDOW_RESUM_INTERVAL,
+    ChannelHistory,
+    RollingWindow,
+    SampleAggregator,
+    sample_time_to_timestamp,
+    value_to_float,
+)
+
+
+def test_history_append_and_wrap():
+    """Test samples are appended and the oldest samples are overwritten once full."""
+    history = ChannelHistory(depth=3)
+    assert len(history) == 0
+    assert history.latest is None
+
+    for i in range(5):
+        assert history.append(timestamp=float(i), value=i * 10.0)
+
+    assert len(history) == 3
+    assert history.latest == (4.0, 40.0)
+
+    timestamps, values = history.samples()
+    assert list(timestamps) == [2.0, 3.0, 4.0]
+    assert list(values) == [20.0, 30.0, 40.0]
+
+
+def test_history_ignores_old_samples():
+    """Test samples that are not newer than the latest sample are ignored."""
+    history = ChannelHistory(depth=3)
+    assert history.append(timestamp=10.0, value=1.0)
+    assert not history.append(timestamp=10.0, value=2.0)
+    assert not history.append(timestamp=5.0, value=3.0)
+
+    assert len(history) == 1
+    assert history.latest == (10.0, 1.0)
+
+
+def test_history_window_statistics():
+    """Test statistics over a time window."""
+    history = ChannelHistory(depth=10)
+    for i in range(10):
+        history.append(timestamp=i * 10.0, value=float(i))
+
+    # window relative to latest sample (t=90): 70, 80, 90
+    assert list(history.window(20)) == [7.0, 8.0, 9.0]
+    assert history.mean(20) == 8.0
+    assert history.minimum(20) == 7.0
+    assert history.maximum(20) == 9.0
+
+    # window relative to a explicit end time
+    assert list(history.window(10, now=200.0)) == []
+    assert history.mean(10, now=200.0) is None
+
+    history.clear()
+    assert len(history) == 0
+    assert history.maximum(20) is None
+
+
+def test_history_window_wrapped():
+    """Test window statistics of a wrapped ring, spanning its end and start."""
+    history = ChannelHistory(depth=4)
+    for i in range(6):
+        history.append(timestamp=i * 10.0, value=float(i))
+
+    assert list(history.window(20)) == [3.0, 4.0, 5.0]
+    assert history.count(20) == 3
+    assert history.mean(20) == 4.0
+    assert history.minimum(20) == 3.0
+    assert history.maximum(100) == 5.0
+
+
+def test_history_invalid_depth():
+    """Test depth must be positive."""
+    with pytest.raises(ValueError):
+        ChannelHistory(depth=0)
+
+
+def test_value_to_float():
+    """Test only numeric values are converted."""
+    assert value_to_float(1) == 1.0
+    assert value_to_float(1.5) == 1.5
+    assert value_to_float(None) is None
+    assert value_to_float("1") is None
+    assert value_to_float(True) is None
+
+
+def test_sample_time_to_timestamp():
+    """Test sample times are converted to unix timestamps."""
+    assert sample_time_to_timestamp("2024-02-01T11:25:46Z") == 1706786746.0
+    assert sample_time_to_timestamp("invalid") > 0
+
+
+def test_rolling_window():
+    """Test rolling window statistics follow the samples in the window."""
+    window = RollingWindow(seconds=20, clock=lambda: 0.0)
+    assert len(window) == 0
+    assert window.mean is None
+    assert window.minimum is None
+    assert window.maximum is None
+
+    assert window.add(timestamp=0.0, value=5.0)
+    assert window.add(timestamp=10.0, value=1.0)
+    assert window.add(timestamp=20.0, value=3.0)
+    assert len(window) == 3
+    assert window.mean == 3.0
+    assert window.minimum == 1.0
+    assert window.maximum == 5.0
+
+    # t=0 leaves the window
+    assert window.add(timestamp=30.0, value=2.0)
+    assert len(window) == 3
+    assert window.mean == 2.0
+    assert window.minimum == 1.0
+    assert window.maximum == 3.0
+
+    # t=10 leaves the window, taking the minimum with it
+    assert window.add(timestamp=40.0, value=4.0)
+    assert window.minimum == 2.0
+    assert window.maximum == 4.0
+
+    # old samples are ignored
+    assert not window.add(timestamp=40.0, value=100.0)
+    assert window.maximum == 4.0
+
+
+def test_rolling_window_evicts_on_read():
+    """Test samples leave the window as time passes, even without new samples."""
+    now = 1000.0
+    window = RollingWindow(seconds=20, clock=lambda: now)
+    assert window.add(timestamp=0.0, value=5.0)
+    assert window.add(timestamp=10.0, value=1.0)
+    assert window.mean == 3.0
+
+    # the window is relative to the local clock, not the time of the samples
+    now += 15.0
+    assert len(window) == 1
+    assert window.mean == 1.0
+    assert window.minimum == 1.0
+
+    now += 10.0
+    assert len(window) == 0
+    assert window.mean is None
+    assert window.maximum is None
+
+    # a new sample restarts the window
+    assert window.add(timestamp=40.0, value=4.0)
+    assert window.mean == 4.0
+
+
+def test_rolling_window_many_samples():
+    """Test all samples within the window are kept."""
+    window = RollingWindow(seconds=1000, clock=lambda: 0.0)
+    for i in range(100):
+        window.add(timestamp=float(i), value=float(i))
+
+    assert len(window) == 100
+    assert window.minimum == 0.0
+    assert window.maximum == 99.0
+
+
+def test_rolling_window_running_sum_is_recomputed():
+    """Test the running sum does not drift from adding and evicting many samples."""
+    window = RollingWindow(seconds=10, clock=lambda: 0.0)
+    for i in range(ROLLING_WINDOW_RESUM_INTERVAL * 3):
+        # values that are not exactly representable, so every addition rounds
+        window.add(timestamp=float(i), value=0.1 if i % 2 else 1e6 + 0.3)
+
+    # the window includes samples exactly 10 seconds old
+    values = [0.1 if i % 2 else 1e6 + 0.3 for i in range(2989, 3000)]
+    assert window.mean == pytest.approx(math.fsum(values) / len(values), abs=1e-9)
+
+
+def test_rolling_window_invalid_size():
+    """Test window size must be positive."""
+    with pytest.raises(ValueError):
+        RollingWindow(seconds=0)
+
+
+def test_sample_aggregator():
+    """Test samples are aggregated per channel."""
+    aggregations = {
+        "mean": SMAAggregation.MEAN,
+        "min": SMAAggregation.MINIMUM,
+        "max": SMAAggregation.MAXIMUM,
+        "latest": SMAAggregation.LATEST,
+        "enum": SMAAggregation.MEAN,
+    }
+    aggregator = SampleAggregator(lambda channel_id: aggregations[channel_id])
+
+    def sample(time: str, value: float):
+        aggregator.add(
+            [
+                ChannelValues(
+                    component_id="c",
+                    channel_id=channel_id,
+                    values=[TimeValuePair(time=time, value=value)],
+                )
+                for channel_id in ("mean", "min", "max", "latest")
+            ]
+            + [
+                ChannelValues(
+                    component_id="c",
+                    channel_id="enum",
+                    values=[TimeValuePair(time=time, value=f"state_{value}")],
+                )
+            ]
+        )
+
+    sample("2024-02-01T11:25:00Z", 1.0)
+    sample("2024-02-01T11:25:01Z", 5.0)
+    sample("2024-02-01T11:25:01Z", 5.0)  # same sample again, ignored
+    sample("2024-02-01T11:25:02Z", 3.0)
+    assert len(aggregator) == 5
+
+    aggregated = {cv.channel_id: cv for cv in aggregator.flush()}
+    assert aggregated["mean"].latest_value == TimeValuePair(
+        time="2024-02-01T11:25:02Z", value=3.0
+    )
+    assert aggregated["min"].latest_value.value == 1.0
+    assert aggregated["max"].latest_value.value == 5.0
+    assert aggregated["latest"].latest_value.value == 3.0
+
+    # non-numeric values always use the latest value
+    assert aggregated["enum"].latest_value.value == "state_3.0"
+
+    # flush resets the aggregation
+    assert len(aggregator) == 0
+    assert aggregator.flush() == []
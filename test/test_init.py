@@ -1,6 +1,15 @@
 """Test sma_ennexos setup process."""
 
-from pytest_homeassistant_custom_component.common import MockConfigEntry
+from datetime import timedelta
+from unittest.mock import PropertyMock, patch
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.helpers import entity_registry
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
 
 from custom_components.sma_ennexos import (
     async_reload_entry,
@@ -12,9 +21,22 @@ from custom_components.sma_ennexos.const import (
     CONF_USE_SSL,
     CONF_USERNAME,
     CONF_VERIFY_SSL,
+    DATA_PROBED_TOPOLOGY,
     DOMAIN,
+    OPT_HISTORY_DEPTH,
+    OPT_PERSIST_SESSION,
+    OPT_REDISCOVERY_INTERVAL,
+    OPT_REQUEST_TIMEOUT,
+    OPT_UPDATE_INTERVAL,
 )
 from custom_components.sma_ennexos.coordinator import SMADataCoordinator
+from custom_components.sma_ennexos.sma.client import SMAApiClient
+from custom_components.sma_ennexos.sma.model import (
+    ChannelValues,
+    ComponentInfo,
+    TimeValuePair,
+)
+from custom_components.sma_ennexos.storage import SMASessionStore, SMATopologyStore
 
 
 async def test_setup_unload_and_reload_entry(hass, mock_sma_client):
@@ -48,21 +70,27 @@ async def test_setup_unload_and_reload_entry(hass, mock_sma_client):
     await hass.async_block_till_done()
     assert_entry()
 
-    # should have logged in three times (get_all_components in sensor.py and 2x coordinator refresh)
-    # and fetched all components
-    assert mock_sma_client.cnt_login == 3
+    # should have logged in once and fetched all components and measurements.
+    # the first refresh re-uses the measurements fetched during setup
+    assert mock_sma_client.cnt_login == 1
     assert mock_sma_client.cnt_get_all_components == 1
+    assert mock_sma_client.cnt_get_all_live_measurements == 1
+    assert mock_sma_client.cnt_get_live_measurements == 0
 
     mock_sma_client.reset_counts()
 
     # reload the entry and check the data is still there
     assert await async_reload_entry(hass, config_entry) is None
+    await hass.async_block_till_done(wait_background_tasks=True)
     assert_entry()
 
-    # should have logged out, then re-setup
+    # should have logged out, then re-setup from the cached topology without requests.
+    # the first refresh fetches all cached channels, and the topology is re-validated with them
     assert mock_sma_client.cnt_logout == 1
-    assert mock_sma_client.cnt_login == 3
+    assert mock_sma_client.cnt_login == 1
     assert mock_sma_client.cnt_get_all_components == 1
+    assert mock_sma_client.cnt_get_all_live_measurements == 1
+    assert mock_sma_client.cnt_get_live_measurements == 0
 
     mock_sma_client.reset_counts()
 
@@ -73,3 +101,431 @@ async def test_setup_unload_and_reload_entry(hass, mock_sma_client):
     # client should have been logged out, but not logged in again
     assert mock_sma_client.cnt_logout == 1
     assert mock_sma_client.cnt_login == 0
+
+
+async def test_setup_from_cached_topology(hass, mock_sma_client):
+    """Test setup uses the cached topology, and adds channels missing from it."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_HOST: "sma.local",
+            CONF_USERNAME: "user",
+            CONF_PASSWORD: "password",
+            CONF_USE_SSL: False,
+            CONF_VERIFY_SSL: False,
+        },
+        entry_id="MOCK",
+    )
+    config_entry.add_to_hass(hass)
+
+    mock_sma_client.components = [
+        ComponentInfo(
+            component_id="component1",
+            component_type="type1",
+            name="Component 1",
+        ),
+    ]
+    mock_sma_client.measurements = [
+        ChannelValues(
+            component_id="component1",
+            channel_id="channel1",
+            values=[TimeValuePair(time="2024-02-01T11:25:46Z", value=300.0)],
+        ),
+    ]
+
+    # first setup discovers and caches the topology
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert mock_sma_client.cnt_get_all_components == 1
+
+    cached = await SMATopologyStore(hass, config_entry.entry_id).async_load()
+    assert cached is not None
+    assert cached[0] == mock_sma_client.components
+    assert cached[1] == [("component1", "channel1")]
+
+    # second setup uses the cache, the unchanged topology does not cause a reload
+    mock_sma_client.reset_counts()
+    with patch.object(
+        hass.config_entries, "async_schedule_reload"
+    ) as mock_schedule_reload:
+        await hass.config_entries.async_reload(config_entry.entry_id)
+
+        # the entity has its value right away, not only after the next update
+        state = hass.states.get("sensor.component_1_channel1")
+        assert state is not None
+        assert state.state == "300.0"
+
+        await hass.async_block_till_done(wait_background_tasks=True)
+        assert mock_sma_client.cnt_get_all_components == 1
+        mock_schedule_reload.assert_not_called()
+
+        # re-validation re-uses the channels fetched by the first refresh
+        assert mock_sma_client.cnt_get_all_live_measurements == 1
+        assert mock_sma_client.cnt_get_live_measurements == 0
+
+        # a new channel is added after re-validation, without reloading
+        mock_sma_client.measurements = [
+            *mock_sma_client.measurements,
+            ChannelValues(
+                component_id="component1",
+                channel_id="channel2",
+                values=[TimeValuePair(time="2024-02-01T11:25:46Z", value=400.0)],
+            ),
+        ]
+        await hass.config_entries.async_reload(config_entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
+        mock_schedule_reload.assert_not_called()
+        state = hass.states.get("sensor.component_1_channel2")
+        assert state is not None
+        assert state.state == "400.0"
+
+    cached = await SMATopologyStore(hass, config_entry.entry_id).async_load()
+    assert cached is not None
+    assert cached[1] == [("component1", "channel1"), ("component1", "channel2")]
+
+    # removing the entry removes the cache
+    await hass.config_entries.async_remove(config_entry.entry_id)
+    assert await SMATopologyStore(hass, config_entry.entry_id).async_load() is None
+
+
+async def test_persisted_session(hass, mock_sma_client):
+    """Test the api session is persisted on unload instead of logging out, and resumed on setup."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_HOST: "sma.local",
+            CONF_USERNAME: "user",
+            CONF_PASSWORD: "password",
+            CONF_USE_SSL: False,
+            CONF_VERIFY_SSL: False,
+        },
+        options={OPT_PERSIST_SESSION: True},
+        entry_id="MOCK",
+    )
+    config_entry.add_to_hass(hass)
+
+    session_state = {"session_id": "mock-session-id", "token": {}}
+    with (
+        patch.object(
+            SMAApiClient,
+            "session_state",
+            new_callable=PropertyMock,
+            return_value=session_state,
+        ),
+        patch.object(SMAApiClient, "restore_session") as mock_restore_session,
+    ):
+        # nothing to resume on first setup
+        await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
+        mock_restore_session.assert_not_called()
+
+        # reload persists the session instead of logging out, then resumes it
+        mock_sma_client.reset_counts()
+        await hass.config_entries.async_reload(config_entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
+        assert mock_sma_client.cnt_logout == 0
+        mock_restore_session.assert_called_once_with(session_state)
+
+        # the persisted session is kept until a login replaces it
+        store = SMASessionStore(hass, config_entry.entry_id)
+        assert await store.async_load() == session_state
+
+        # the session is persisted on stop, as the entry is not unloaded then
+        await store.async_remove()
+        hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
+        await hass.async_block_till_done()
+        assert await store.async_load() == session_state
+
+        # removing the entry removes the persisted session, and logs it out
+        mock_sma_client.reset_counts()
+        await hass.config_entries.async_remove(config_entry.entry_id)
+        assert await SMASessionStore(hass, config_entry.entry_id).async_load() is None
+        assert mock_sma_client.cnt_logout == 1
+
+
+async def test_options_are_applied_without_reload(hass, mock_sma_client):
+    """Test changing update interval, timeout and retries does not reload the entry."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_HOST: "sma.local",
+            CONF_USERNAME: "user",
+            CONF_PASSWORD: "password",
+            CONF_USE_SSL: False,
+            CONF_VERIFY_SSL: False,
+        },
+        entry_id="MOCK",
+    )
+    config_entry.add_to_hass(hass)
+
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+
+    # hot-applied options keep the coordinator
+    mock_sma_client.reset_counts()
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options={OPT_UPDATE_INTERVAL: 10, OPT_REQUEST_TIMEOUT: 5},
+    )
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert hass.data[DOMAIN][config_entry.entry_id] is coordinator
+    assert coordinator.update_interval == timedelta(seconds=10)
+    assert mock_sma_client.cnt_logout == 0
+    assert mock_sma_client.cnt_get_all_components == 0
+
+    # saving unchanged options does nothing, e.g. not log in again
+    mock_sma_client.reset_counts()
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options={OPT_UPDATE_INTERVAL: 10, OPT_REQUEST_TIMEOUT: 5},
+        title="renamed",
+    )
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert hass.data[DOMAIN][config_entry.entry_id] is coordinator
+    assert mock_sma_client.cnt_login == 0
+    assert mock_sma_client.cnt_logout == 0
+
+    # other options reload the entry
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options={OPT_UPDATE_INTERVAL: 10, OPT_REQUEST_TIMEOUT: 5, OPT_HISTORY_DEPTH: 5},
+    )
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert hass.data[DOMAIN][config_entry.entry_id] is not coordinator
+    assert mock_sma_client.cnt_logout == 1
+
+
+async def test_setup_uses_probed_topology(hass, mock_sma_client):
+    """Test the first setup re-uses the navigation probed by the config flow."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_HOST: "sma.local",
+            CONF_USERNAME: "user",
+            CONF_PASSWORD: "password",
+            CONF_USE_SSL: False,
+            CONF_VERIFY_SSL: False,
+        },
+        entry_id="MOCK",
+    )
+    config_entry.add_to_hass(hass)
+
+    navigation = [
+        ComponentInfo(
+            component_id="component1",
+            component_type="Plant",
+            name="Component 1",
+        ),
+    ]
+    hass.data[DATA_PROBED_TOPOLOGY] = {"sma.local": navigation}
+
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    # the probed navigation is consumed
+    assert mock_sma_client.last_navigation is navigation
+    assert mock_sma_client.cnt_get_navigation == 0
+    assert "sma.local" not in hass.data[DATA_PROBED_TOPOLOGY]
+
+
+async def test_rediscovery_adds_new_channels(hass, mock_sma_client):
+    """Test components and channels added at runtime get entities without reloading."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_HOST: "sma.local",
+            CONF_USERNAME: "user",
+            CONF_PASSWORD: "password",
+            CONF_USE_SSL: False,
+            CONF_VERIFY_SSL: False,
+        },
+        options={OPT_REDISCOVERY_INTERVAL: 10},
+        entry_id="MOCK",
+    )
+    config_entry.add_to_hass(hass)
+
+    mock_sma_client.components = [
+        ComponentInfo(
+            component_id="plant",
+            component_type="Plant",
+            name="Plant",
+        ),
+        ComponentInfo(
+            component_id="component1",
+            component_type="type1",
+            name="Component 1",
+        ),
+    ]
+    mock_sma_client.measurements = [
+        ChannelValues(
+            component_id="component1",
+            channel_id="channel1",
+            values=[TimeValuePair(time="2024-02-01T11:25:46Z", value=300.0)],
+        ),
+    ]
+
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    assert hass.states.get("sensor.component_1_channel1") is not None
+
+    # a battery is added
+    mock_sma_client.components = [
+        *mock_sma_client.components,
+        ComponentInfo(
+            component_id="component2",
+            component_type="type2",
+            name="Component 2",
+        ),
+    ]
+    mock_sma_client.measurements = [
+        *mock_sma_client.measurements,
+        ChannelValues(
+            component_id="component2",
+            channel_id="channel2",
+            values=[TimeValuePair(time="2024-02-01T11:25:46Z", value=400.0)],
+        ),
+    ]
+    mock_sma_client.reset_counts()
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=11))
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    # new sensor is added to the running entry
+    assert hass.data[DOMAIN][config_entry.entry_id] is coordinator
+    assert hass.states.get("sensor.component_2_channel2") is not None
+    assert [c.component_id for c in coordinator.all_components] == [
+        "plant",
+        "component1",
+        "component2",
+    ]
+
+    # only the navigation and channel inventory are fetched, and extra info for the new component
+    assert mock_sma_client.cnt_get_navigation == 1
+    assert mock_sma_client.cnt_get_all_components == 1
+    assert mock_sma_client.last_navigation is not None
+    assert [c.component_id for c in mock_sma_client.last_navigation] == [
+        "plant",
+        "component2",
+    ]
+    assert mock_sma_client.cnt_get_all_live_measurements == 1
+    assert mock_sma_client.cnt_logout == 0
+
+
+async def test_known_channels_skip_channel_name_index(hass, mock_sma_client):
+    """Test the web ui is not requested for channel names if all channels are known."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_HOST: "sma.local",
+            CONF_USERNAME: "user",
+            CONF_PASSWORD: "password",
+            CONF_USE_SSL: False,
+            CONF_VERIFY_SSL: False,
+        },
+        entry_id="MOCK",
+    )
+    config_entry.add_to_hass(hass)
+
+    mock_sma_client.components = [
+        ComponentInfo(
+            component_id="component1",
+            component_type="type1",
+            name="Component 1",
+        ),
+    ]
+    mock_sma_client.measurements = [
+        ChannelValues(
+            component_id="component1",
+            channel_id="Measurement.GridMs.TotW",
+            values=[TimeValuePair(time="2024-02-01T11:25:46Z", value=300.0)],
+        ),
+    ]
+
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert mock_sma_client.cnt_get_localization_fingerprint == 0
+    assert mock_sma_client.cnt_get_localizations == 0
+
+
+async def test_unknown_channels_named_from_localizations(
+    hass, hass_storage, mock_sma_client
+):
+    """Test unknown channels are named using the index of localized channel names."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_HOST: "sma.local",
+            CONF_USERNAME: "user",
+            CONF_PASSWORD: "password",
+            CONF_USE_SSL: False,
+            CONF_VERIFY_SSL: False,
+        },
+        entry_id="MOCK",
+    )
+    config_entry.add_to_hass(hass)
+
+    mock_sma_client.components = [
+        ComponentInfo(
+            component_id="component1",
+            component_type="type1",
+            name="Component 1",
+        ),
+    ]
+    mock_sma_client.measurements = [
+        ChannelValues(
+            component_id="component1",
+            channel_id="Measurement.Unknown.Channel[1]",
+            values=[TimeValuePair(time="2024-02-01T11:25:46Z", value=300.0)],
+        ),
+    ]
+    mock_sma_client.localizations = [
+        ("12.aaa.js", {"Measurement.Unknown.Channel": "Unknown channel"}),
+    ]
+
+    # the index is built in the background on first setup
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert mock_sma_client.cnt_get_localizations == 1
+    assert hass_storage["sma_ennexos.channel_names.MOCK"]["data"] == {
+        "fingerprint": "en:mock-fingerprint",
+        "names": {"Measurement.Unknown.Channel": "Unknown channel"},
+    }
+
+    # after a reload, the stored index names the sensor.
+    # unchanged localizations are not fetched again
+    mock_sma_client.reset_counts()
+    await async_reload_entry(hass, config_entry)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert mock_sma_client.cnt_get_localization_fingerprint == 1
+    assert mock_sma_client.cnt_get_localizations == 0
+
+    er = entity_registry.async_get(hass)
+    entries = entity_registry.async_entries_for_config_entry(er, config_entry.entry_id)
+    assert len(entries) == 1
+    assert entries[0].original_name == "Unknown channel [1]"
+
+    # a firmware update rebuilds the index
+    mock_sma_client.localization_fingerprint = "new-fingerprint"
+    await async_reload_entry(hass, config_entry)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert mock_sma_client.cnt_get_localizations == 1
+    assert (
+        hass_storage["sma_ennexos.channel_names.MOCK"]["data"]["fingerprint"]
+        == "en:new-fingerprint"
+    )
+
+    # so does a change of the language
+    mock_sma_client.reset_counts()
+    hass.config.language = "de"
+    await async_reload_entry(hass, config_entry)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert mock_sma_client.cnt_get_localizations == 1
+    assert (
+        hass_storage["sma_ennexos.channel_names.MOCK"]["data"]["fingerprint"]
+        == "de:new-fingerprint"
+    )
@@ -0,0 +1,39 @@
+"""Test rarely used modules are only imported on first use."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+# repository root, so custom_components is importable
+REPO_ROOT = Path(__file__).parents[1]
+
+
+def imported_modules(module: str) -> set[str]:
+    """
+    Import a module in a fresh interpreter, as other tests already imported everything.
+
+    :param module: name of the module to import
+    :returns: names of all modules imported by it
+    """
+    result = subprocess.run(  # noqa: S603
+        [
+            sys.executable,
+            "-c",
+            f"import json, sys, {module}; print(json.dumps(list(sys.modules)))",
+        ],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(json.loads(result.stdout))
+
+
+def test_integration_defers_rarely_used_modules():
+    """Test importing the integration does not import localization and diagnostics."""
+    modules = imported_modules("custom_components.sma_ennexos")
+
+    assert "custom_components.sma_ennexos" in modules
+    assert "custom_components.sma_ennexos.sma.localization" not in modules
+    assert "custom_components.sma_ennexos.diagnostics" not in modules
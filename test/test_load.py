@@ -0,0 +1,135 @@
+"""End-to-end load tests against the ennexOS simulator, using real sockets."""
+
+import aiohttp
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.sma_ennexos.const import (
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_USE_SSL,
+    CONF_USERNAME,
+    CONF_VERIFY_SSL,
+    DOMAIN,
+)
+from custom_components.sma_ennexos.coordinator import SMADataCoordinator
+from custom_components.sma_ennexos.sma.client import LoginResult, SMAApiClient
+from custom_components.sma_ennexos.sma.model import LiveMeasurementQueryItem
+from test.simulator import EnnexOSSimulator, SimulatorConfig
+
+POLLS = 20
+
+
+@pytest.fixture
+def simulator_config():
+    """Return the configuration of the simulator, override by parametrizing the test."""
+    return SimulatorConfig()
+
+
+@pytest.fixture
+async def simulator(simulator_config):
+    """Start a ennexOS simulator on a free local port."""
+    simulator = EnnexOSSimulator(simulator_config)
+    await simulator.start()
+    yield simulator
+    await simulator.stop()
+
+
+@pytest.mark.enable_socket
+@pytest.mark.parametrize(
+    "simulator_config",
+    [SimulatorConfig(components=10, channels=100, latency=0.005, jitter=0.005, seed=1)],
+)
+async def test_load_client(simulator):
+    """Test the api client polling the simulator, including expired tokens."""
+    async with aiohttp.ClientSession() as session:
+        client = SMAApiClient(
+            host=simulator.address,
+            username="user",
+            password="password",
+            session=session,
+            use_ssl=False,
+        )
+
+        assert (await client.login()) == LoginResult.NEW_TOKEN
+        components = await client.get_all_components()
+        assert len(components) == 11
+        assert all(c.serial_number is not None for c in components[1:])
+
+        measurements = await client.get_all_live_measurements(
+            [c.component_id for c in components]
+        )
+        assert len(measurements) == simulator.plant.channel_count
+
+        query = [
+            LiveMeasurementQueryItem(
+                component_id=m.component_id, channel_id=m.channel_id
+            )
+            for m in measurements
+        ]
+        for _ in range(POLLS):
+            assert len(await client.get_live_measurements(query)) > 0
+
+        # a expired token is rejected, and the client logs in again
+        simulator.expire_tokens()
+        assert len(await client.get_live_measurements(query)) > 0
+        assert simulator.stats.rejected == 1
+        assert simulator.stats.logins == 2
+        assert client.metrics.reauths == 1
+
+        await client.logout()
+
+
+@pytest.mark.enable_socket
+@pytest.mark.parametrize(
+    "simulator_config",
+    [
+        SimulatorConfig(
+            components=10,
+            channels=100,
+            latency=0.005,
+            jitter=0.005,
+            # shorter than the token refresh margin of the client,
+            # so every poll refreshes the token
+            token_lifetime=60,
+            unauthorized_rate=0.1,
+            cpu_cost=0.001,
+            seed=1,
+        )
+    ],
+)
+async def test_load_integration(hass, simulator):
+    """Test the integration polling the simulator end to end, with 401s injected."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_HOST: simulator.address,
+            CONF_USERNAME: "user",
+            CONF_PASSWORD: "password",
+            CONF_USE_SSL: False,
+            CONF_VERIFY_SSL: False,
+        },
+        entry_id="LOAD",
+    )
+    config_entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator: SMADataCoordinator = hass.data[DOMAIN][config_entry.entry_id]
+    assert len(coordinator.all_components) == 11
+
+    for _ in range(POLLS):
+        await coordinator.async_refresh()
+        assert coordinator.last_update_success
+
+    # all enabled sensors are polled, and updated from the simulated values
+    assert coordinator.polled_channels > 0
+    assert len(coordinator.data) > 0
+    assert simulator.stats.requests["POST measurements/live"] >= POLLS
+    assert simulator.stats.refreshes > 0
+    assert simulator.stats.injected_unauthorized > 0
+    assert len(coordinator.update_durations) == POLLS
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
@@ -0,0 +1,165 @@
+"""Test sma-ennexos performance sensors."""
+
+import uuid
+
+from homeassistant.const import EntityCategory
+from homeassistant.helpers import device_registry, entity_registry
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.sma_ennexos.const import (
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_USE_SSL,
+    CONF_USERNAME,
+    CONF_VERIFY_SSL,
+    DOMAIN,
+    OPT_PERFORMANCE_SENSORS,
+)
+from custom_components.sma_ennexos.performance_sensor import PERFORMANCE_SENSORS
+from custom_components.sma_ennexos.sma.known_channels import (
+    KnownChannelEntry,
+    SMADeviceKind,
+    SMAUnit,
+)
+from custom_components.sma_ennexos.sma.model import (
+    ChannelValues,
+    ComponentInfo,
+    LiveMeasurementQueryItem,
+    TimeValuePair,
+)
+
+
+def performance_sensor_entity_id(hass, key: str) -> str | None:
+    """Get the entity id of a performance sensor of the MOCK config entry."""
+    unique_id = str(uuid.uuid5(uuid.NAMESPACE_X500, f"MOCKperformance.{key}"))
+    return entity_registry.async_get(hass).async_get_entity_id(
+        "sensor", DOMAIN, unique_id
+    )
+
+
+async def setup_plant(hass, mock_sma_client, mock_known_channels, options: dict):
+    """Set up a config entry for a plant with one inverter channel."""
+    _, known_channels = mock_known_channels
+
+    mock_sma_client.components = [
+        ComponentInfo(
+            component_id="plant1",
+            component_type="Plant",
+            name="My Plant",
+        ),
+        ComponentInfo(
+            component_id="component1",
+            component_type="Inverter",
+            name="Component 1",
+        ),
+    ]
+    mock_sma_client.measurements = [
+        ChannelValues(
+            component_id="component1",
+            channel_id="channel1",
+            values=[
+                TimeValuePair(
+                    time="2024-02-01T11:25:46Z",
+                    value=300.0,
+                )
+            ],
+        ),
+    ]
+    known_channels["channel1"] = KnownChannelEntry(
+        device_kind=SMADeviceKind.PV,
+        unit=SMAUnit.WATT,
+    )
+
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="MOCK",
+        data={
+            CONF_HOST: "sma.local",
+            CONF_USERNAME: "user",
+            CONF_PASSWORD: "password",
+            CONF_USE_SSL: False,
+            CONF_VERIFY_SSL: True,
+        },
+        options=options,
+    )
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    return config_entry
+
+
+async def test_performance_sensors_disabled_by_default(
+    hass,
+    mock_sma_client,
+    mock_known_channels,
+):
+    """Test performance sensors are only created if enabled in the options."""
+    await setup_plant(hass, mock_sma_client, mock_known_channels, {})
+
+    for description in PERFORMANCE_SENSORS:
+        assert performance_sensor_entity_id(hass, description.key) is None
+
+
+async def test_performance_sensors(
+    hass,
+    mock_sma_client,
+    mock_known_channels,
+):
+    """Test performance sensors are created on the plant device and updated on every poll."""
+    last_query: list[LiveMeasurementQueryItem] = []
+
+    def on_get_live_measurements(query: list[LiveMeasurementQueryItem]):
+        nonlocal last_query
+        last_query = query
+
+    mock_sma_client.on_get_live_measurements = on_get_live_measurements
+
+    config_entry = await setup_plant(
+        hass, mock_sma_client, mock_known_channels, {OPT_PERFORMANCE_SENSORS: True}
+    )
+
+    # all sensors are diagnostic entities of the plant device
+    er = entity_registry.async_get(hass)
+    dr = device_registry.async_get(hass)
+    for description in PERFORMANCE_SENSORS:
+        entity_id = performance_sensor_entity_id(hass, description.key)
+        assert entity_id is not None
+
+        entry = er.async_get(entity_id)
+        assert entry is not None
+        assert entry.entity_category == EntityCategory.DIAGNOSTIC
+
+        device = dr.async_get(entry.device_id)
+        assert device is not None
+        assert device.name == "My Plant"
+
+    # the first refresh re-uses the setup data, so nothing was polled yet
+    state = hass.states.get(performance_sensor_entity_id(hass, "polled_channels"))
+    assert state
+    assert state.state == "unknown"
+
+    await hass.data[DOMAIN][config_entry.entry_id].async_refresh()
+    await hass.async_block_till_done()
+
+    # performance sensors are not part of the query
+    assert [(q.component_id, q.channel_id) for q in last_query] == [
+        ("component1", "channel1")
+    ]
+
+    state = hass.states.get(performance_sensor_entity_id(hass, "polled_channels"))
+    assert state
+    assert state.state == "1"
+
+    state = hass.states.get(performance_sensor_entity_id(hass, "update_duration"))
+    assert state
+    assert float(state.state) >= 0
+
+    for key in ("failed_requests", "request_retries", "reauths"):
+        state = hass.states.get(performance_sensor_entity_id(hass, key))
+        assert state
+        assert state.state == "0"
+
+    # the mock client never logs in, so there is no token
+    state = hass.states.get(performance_sensor_entity_id(hass, "token_expires_in"))
+    assert state
+    assert state.state == "unknown"
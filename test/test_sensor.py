@@ -1,5 +1,7 @@
 """Test sma-ennexos sensor component."""
 
+from datetime import timedelta
+
 from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
 from homeassistant.helpers import device_registry, entity_registry
 from pytest_homeassistant_custom_component.common import MockConfigEntry
@@ -12,6 +14,13 @@ from custom_components.sma_ennexos.const import (
     CONF_VERIFY_SSL,
     DEVICE_MANUFACTURER,
     DOMAIN,
+    OPT_DEADBAND,
+    OPT_MAX_SILENCE_INTERVAL,
+    OPT_ROLLING_STATISTICS,
+)
+from custom_components.sma_ennexos.sensor import (
+    create_sensor_entities,
+    describe_channel,
 )
 from custom_components.sma_ennexos.sma.known_channels import (
     KnownChannelEntry,
@@ -559,6 +568,10 @@ async def test_sensor_disabled_entities_are_not_fetched(
     assert state
     assert state.state == "400.0"
 
+    # the first refresh re-uses the setup data, so the query is only made on the next refresh
+    assert len(last_query) == 0
+    await hass.data[DOMAIN][config_entry.entry_id].async_refresh()
+
     # should have queried for both channels
     assert len(last_query) == 2
     assert last_query[0].component_id == "component1"
@@ -718,3 +731,253 @@ async def test_sensor_unknown_channels_disabled_by_default(
     entry = er.async_get("sensor.component_1_channel1")
     assert entry
     assert entry.disabled_by is entity_registry.RegistryEntryDisabler.INTEGRATION
+
+
+async def test_sensor_rolling_statistics(
+    hass,
+    mock_sma_client,
+    mock_known_channels,
+):
+    """Test rolling statistics are exposed as attributes when enabled."""
+    _, known_channels = mock_known_channels
+
+    mock_sma_client.components = [
+        ComponentInfo(
+            component_id="mock_inverter",
+            component_type="Inverter",
+            name="Mock Inverter",
+        )
+    ]
+
+    def set_measurement(time: str, value: float):
+        mock_sma_client.measurements = [
+            ChannelValues(
+                component_id="mock_inverter",
+                channel_id="Mock.Measurement.GridMs.TotW",
+                values=[TimeValuePair(time=time, value=value)],
+            )
+        ]
+
+    set_measurement("2024-02-01T11:25:00Z", 100.0)
+
+    known_channels["Mock.Measurement.GridMs.TotW"] = KnownChannelEntry(
+        device_kind=SMADeviceKind.GRID,
+        unit=SMAUnit.WATT,
+    )
+
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="MOCK",
+        data={
+            CONF_HOST: "sma.local",
+            CONF_USERNAME: "user",
+            CONF_PASSWORD: "password",
+            CONF_USE_SSL: False,
+            CONF_VERIFY_SSL: True,
+        },
+        options={
+            OPT_ROLLING_STATISTICS: True,
+        },
+    )
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    # two minutes later, the 1 minute window only contains the latest value
+    set_measurement("2024-02-01T11:27:00Z", 300.0)
+    await hass.data[DOMAIN][config_entry.entry_id].async_refresh()
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.mock_inverter_mock_measurement_gridms_totw")
+    assert state
+    assert state.state == "300.0"
+
+    assert state.attributes["mean_1min"] == 300.0
+    assert state.attributes["min_1min"] == 300.0
+    assert state.attributes["max_1min"] == 300.0
+
+    assert state.attributes["mean_5min"] == 200.0
+    assert state.attributes["min_5min"] == 100.0
+    assert state.attributes["max_5min"] == 300.0
+
+    assert state.attributes["mean_15min"] == 200.0
+
+
+async def test_sensor_deadband(
+    hass,
+    freezer,
+    mock_sma_client,
+    mock_known_channels,
+):
+    """Test small changes are not written when deadband filtering is enabled."""
+    _, known_channels = mock_known_channels
+
+    mock_sma_client.components = [
+        ComponentInfo(
+            component_id="mock_inverter",
+            component_type="Inverter",
+            name="Mock Inverter",
+        )
+    ]
+
+    def set_measurement(value: float):
+        mock_sma_client.measurements = [
+            ChannelValues(
+                component_id="mock_inverter",
+                channel_id="Mock.Measurement.GridMs.Hz",
+                values=[TimeValuePair(time="2024-02-01T11:25:00Z", value=value)],
+            )
+        ]
+
+    set_measurement(50.0)
+
+    known_channels["Mock.Measurement.GridMs.Hz"] = KnownChannelEntry(
+        device_kind=SMADeviceKind.GRID,
+        unit=SMAUnit.HERTZ,
+    )
+
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id="MOCK",
+        data={
+            CONF_HOST: "sma.local",
+            CONF_USERNAME: "user",
+            CONF_PASSWORD: "password",
+            CONF_USE_SSL: False,
+            CONF_VERIFY_SSL: True,
+        },
+        options={
+            OPT_DEADBAND: True,
+            OPT_MAX_SILENCE_INTERVAL: 10,
+        },
+    )
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+
+    async def refresh_and_get_state() -> str:
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+        state = hass.states.get("sensor.mock_inverter_mock_measurement_gridms_hz")
+        assert state
+        return state.state
+
+    assert await refresh_and_get_state() == "50.0"
+
+    # jitter within the deadband is not written
+    set_measurement(50.01)
+    assert await refresh_and_get_state() == "50.0"
+
+    # changes larger than the deadband are written
+    set_measurement(50.1)
+    assert await refresh_and_get_state() == "50.1"
+
+    # after max_silence_interval, even small changes are written
+    set_measurement(50.11)
+    assert await refresh_and_get_state() == "50.1"
+    freezer.tick(timedelta(minutes=11))
+    assert await refresh_and_get_state() == "50.11"
+
+
+async def test_create_sensor_entities_shares_descriptors(
+    hass,
+    mock_sma_client,
+    mock_known_channels,
+):
+    """Test entities of the same channel or component share their precomputed descriptions."""
+    _, known_channels = mock_known_channels
+    known_channels["channel1"] = KnownChannelEntry(
+        device_kind=SMADeviceKind.PV,
+        unit=SMAUnit.WATT,
+    )
+
+    mock_sma_client.components = [
+        ComponentInfo(
+            component_id="component1",
+            component_type="type1",
+            name="Component 1",
+        ),
+        ComponentInfo(
+            component_id="component2",
+            component_type="type2",
+            name="Component 2",
+        ),
+    ]
+    mock_sma_client.measurements = [
+        ChannelValues(component_id=component_id, channel_id=channel_id, values=[])
+        for component_id in ("component1", "component2")
+        for channel_id in ("channel1", "channel2")
+    ]
+
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_HOST: "sma.local",
+            CONF_USERNAME: "user",
+            CONF_PASSWORD: "pass",
+            CONF_USE_SSL: False,
+            CONF_VERIFY_SSL: True,
+        },
+    )
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+
+    # unknown components are skipped
+    entities = create_sensor_entities(
+        coordinator,
+        [
+            *coordinator.all_measurements,
+            ChannelValues(component_id="unknown", channel_id="channel1", values=[]),
+        ],
+    )
+    assert len(entities) == 4
+
+    c1ch1, c1ch2, c2ch1, c2ch2 = entities
+    assert c1ch1.entity_description is c2ch1.entity_description
+    assert c1ch1.entity_description is not c1ch2.entity_description
+    assert c1ch1.entity_description.device_class == SensorDeviceClass.POWER
+    assert c1ch1.device_info is c1ch2.device_info
+    assert c1ch1.device_info is not c2ch1.device_info
+    assert c2ch2.entity_id == "sensor.component_2_channel2"
+
+
+def test_describe_channel_uses_compiled_descriptors():
+    """Test known channels are described by their precompiled descriptor."""
+    # array channels share the descriptor of their known channel
+    dc0 = describe_channel("Measurement.DcMs.Vol[0]", {})
+    dc1 = describe_channel("Measurement.DcMs.Vol[1]", {})
+    assert dc0 is dc1
+    assert dc0.entity_description.translation_key == "measurement_dcms_vol"
+    assert dc0.entity_description.device_class == SensorDeviceClass.VOLTAGE
+    assert dc0.entity_description.suggested_display_precision == 0
+
+    # special handling by channel id is part of the compiled descriptor
+    soc = describe_channel("Measurement.Bat.ChaStt", {})
+    assert soc.entity_description.device_class == SensorDeviceClass.BATTERY
+
+    # options are applied on top of the compiled descriptor
+    power = describe_channel("Measurement.GridMs.TotW", {})
+    assert power.rolling_windows == ()
+    assert power.deadband is None
+
+    power_with_options = describe_channel(
+        "Measurement.GridMs.TotW",
+        {
+            OPT_ROLLING_STATISTICS: True,
+            OPT_DEADBAND: True,
+            OPT_MAX_SILENCE_INTERVAL: 5,
+        },
+    )
+    assert power_with_options.entity_description is power.entity_description
+    assert len(power_with_options.rolling_windows) > 0
+    assert power_with_options.deadband is not None
+    assert power_with_options.max_silence_interval == timedelta(minutes=5)
+
+    # unknown channels are described on the fly
+    unknown = describe_channel("Measurement.Unknown.Channel", {})
+    assert unknown.known_channel is None
+    assert unknown.entity_description.name == "Measurement.Unknown.Channel"
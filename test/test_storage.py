@@ -0,0 +1,91 @@
+"""Test sma_ennexos persistent storage."""
+
+from custom_components.sma_ennexos.sma.model import ComponentInfo
+from custom_components.sma_ennexos.storage import (
+    SMAChannelNameStore,
+    SMASessionStore,
+    SMATopologyStore,
+)
+
+
+async def test_topology_store(hass):
+    """Test saving and loading the topology."""
+    store = SMATopologyStore(hass, "MOCK")
+    assert await store.async_load() is None
+
+    components = [
+        ComponentInfo(
+            component_id="plant",
+            component_type="Plant",
+            name="My Plant",
+        ),
+        ComponentInfo(
+            component_id="inverter",
+            component_type="Inverter",
+            name="My Inverter",
+            vendor="SMA",
+            serial_number="123456",
+            generator_power=10000,
+        ),
+    ]
+    channels = [("inverter", "Measurement.GridMs.TotW")]
+    await store.async_save(components, channels)
+
+    # a new store for the same entry loads the saved topology
+    assert await SMATopologyStore(hass, "MOCK").async_load() == (components, channels)
+
+    # other entries are not affected
+    assert await SMATopologyStore(hass, "OTHER").async_load() is None
+
+    await store.async_remove()
+    assert await store.async_load() is None
+
+
+async def test_topology_store_invalid(hass, hass_storage):
+    """Test invalid cached data is ignored."""
+    hass_storage["sma_ennexos.topology.MOCK"] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": "sma_ennexos.topology.MOCK",
+        "data": {"components": [{"unknown_field": 1}], "channels": []},
+    }
+
+    assert await SMATopologyStore(hass, "MOCK").async_load() is None
+
+
+async def test_session_store(hass):
+    """Test saving and loading the session state."""
+    store = SMASessionStore(hass, "MOCK")
+    assert await store.async_load() is None
+
+    state = {"session_id": "abc", "token": {"access_token": "def"}}
+    await store.async_save(state)
+    assert await SMASessionStore(hass, "MOCK").async_load() == state
+
+    await store.async_remove()
+    assert await store.async_load() is None
+
+
+async def test_channel_name_store(hass, hass_storage):
+    """Test saving and loading the channel name index."""
+    store = SMAChannelNameStore(hass, "MOCK")
+    assert await store.async_load() is None
+
+    names = {"Measurement.GridMs.TotW": "Grid power"}
+    await store.async_save("fingerprint", names)
+    assert await SMAChannelNameStore(hass, "MOCK").async_load() == (
+        "fingerprint",
+        names,
+    )
+
+    await store.async_remove()
+    assert await store.async_load() is None
+
+    # invalid data is ignored
+    hass_storage["sma_ennexos.channel_names.MOCK"] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": "sma_ennexos.channel_names.MOCK",
+        "data": {"names": {}},
+    }
+    assert await SMAChannelNameStore(hass, "MOCK").async_load() is None
@@ -7,10 +7,18 @@ from custom_components.sma_ennexos.sma.known_channels import __KNOWN_CHANNELS
 from custom_components.sma_ennexos.util import channel_to_translation_key
 
 
+def reject_duplicate_keys(pairs: list[tuple[str, object]]) -> dict:
+    """Build a json object, failing on duplicate keys instead of keeping the last value."""
+    keys = [key for key, _ in pairs]
+    duplicates = {key for key in keys if keys.count(key) > 1}
+    assert not duplicates, f"Duplicate translation keys {sorted(duplicates)}"
+    return dict(pairs)
+
+
 def assert_channel_translation_keys_present(file_path: str):
     """Check if all channels in known_channels have a matching translation key."""
     with open(file_path) as f:
-        translations = json.load(f)
+        translations = json.load(f, object_pairs_hook=reject_duplicate_keys)
 
     assert translations is not None and isinstance(translations, dict)
     assert translations["entity"] is not None and isinstance(
@@ -1,11 +1,53 @@
 """Test the utility functions."""
 
+import pytest
+
+from custom_components.sma_ennexos.sma.known_channels import __KNOWN_CHANNELS
 from custom_components.sma_ennexos.util import (
     channel_parts_to_entity_id,
     channel_to_translation_key,
 )
 
 
+def legacy_normalize_for_id_old(s: str) -> str:
+    """Copy of the previous, loop based implementation of the old normalization."""
+    s = s.lower()
+    for c in " -.:":
+        s = s.replace(c, "_")
+    s = "".join(c if c.isalnum() or c == "_" else "" for c in s)
+    s = s.strip("_")
+    while "__" in s:
+        s = s.replace("__", "_")
+    return s
+
+
+def legacy_normalize_for_id(s: str) -> str:
+    """Copy of the previous, loop based implementation of the default normalization."""
+    s = legacy_normalize_for_id_old(s)
+    for umlaut, replacement in {"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"}.items():
+        s = s.replace(umlaut, replacement)
+    s = "".join(
+        c if ("0" <= c <= "9") or ("a" <= c <= "z") or c == "_" else "" for c in s
+    )
+    while "__" in s:
+        s = s.replace("__", "_")
+    return s
+
+
+# component names to check normalization with, including edge cases
+COMPONENT_NAMES = [
+    "My Plant",
+    "Mein Gerät",
+    "Test äöüß!",
+    "Test ١٨زب",
+    "Test ☀️☀️",
+    "١ leading arabic numeral",
+    "__Under-Score:Name__",
+    "ÄÖÜ Upper Case",
+    "İstanbul",
+]
+
+
 def test_channel_parts_to_entity_id():
     """Test entity ids are created as expected."""
     assert (
@@ -92,3 +134,29 @@ def test_channel_id_to_translation_key():
         channel_to_translation_key("Measurement.DcMs.Watt[1]")
         == "measurement_dcms_watt"
     )
+
+
+@pytest.mark.parametrize("component_name", COMPONENT_NAMES)
+def test_normalization_matches_legacy_implementation(component_name: str):
+    """Test entity ids and translation keys are unchanged from the previous implementation for all known channels."""
+    for channel_id in [*__KNOWN_CHANNELS, "Measurement.DcMs.Watt[2]"]:
+        if channel_id.endswith("]"):
+            channel_id_for_id = channel_id.replace("[", "_").replace("]", "")
+            channel_id_for_key = channel_id[0 : channel_id.rfind("[")]
+        else:
+            channel_id_for_id = channel_id_for_key = channel_id
+
+        raw = f"{component_name}_{channel_id_for_id}"
+        assert (
+            channel_parts_to_entity_id(component_name, channel_id, "sensor")
+            == f"sensor.{legacy_normalize_for_id(raw)}"
+        )
+        assert (
+            channel_parts_to_entity_id(
+                component_name, channel_id, "sensor", normalization="old"
+            )
+            == f"sensor.{legacy_normalize_for_id_old(raw)}"
+        )
+        assert channel_to_translation_key(channel_id) == legacy_normalize_for_id(
+            channel_id_for_key
+        )